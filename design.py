@@ -28,10 +28,30 @@
 
 import numpy as np
 import math
-import sys
-import random
 import xml.etree.ElementTree as ET
 import copy
+import collections
+import enum
+import functools
+import json
+import os
+import sys
+
+# Numba is optional. When it is installed the numeric kernels below are compiled, otherwise they run as plain Python.
+try:
+    from numba import njit
+except ImportError:
+    def njit(*args, **kwargs):
+        # Supports both @njit and @njit(...) by returning the function unchanged.
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda function: function
+
+# Types accepted by the numeric attribute setters. A tuple constant avoids building a list on every assignment.
+_NUMERIC_TYPES = (int, float, np.float64)
+
+# Marks a definition attribute that has no default and must be given.
+_REQUIRED = object()
 
 
 # =========================================
@@ -50,6 +70,177 @@ class CalculationError(DesignError):
     pass
 
 
+# =========================================
+# Orientation and Stack Side Codes
+# =========================================
+# Chips store their orientation and stack side as small integer codes so the pad, TSV, and area
+# calculations compare integers instead of strings. The string forms are still used for input and output.
+# =========================================
+class Orientation(enum.IntEnum):
+    FACE_UP = 0
+    FACE_DOWN = 1
+
+class StackSide(enum.IntEnum):
+    FACE = 0
+    BACK = 1
+
+ORIENTATION_NAMES = ("face-up", "face-down")
+STACK_SIDE_NAMES = ("face", "back")
+# Lower-case name to code, so parsing a name is one dict lookup instead of a membership test and an index search.
+ORIENTATION_CODES = {name: Orientation(code) for code, name in enumerate(ORIENTATION_NAMES)}
+STACK_SIDE_CODES = {name: StackSide(code) for code, name in enumerate(STACK_SIDE_NAMES)}
+
+
+# =========================================
+# Numeric Attribute Descriptor
+# =========================================
+# A validated numeric attribute, declared once in the class body in place of a @property/@setter pair:
+#   core_area = NumericAttribute("Core area", low=0)
+# The value is kept in the owner's single-underscore slot (e.g. _core_area), which the class methods read directly.
+# Options:
+#   label: Attribute name used in the error messages.
+#   low, high: Inclusive bounds. None leaves that side unchecked.
+#   optional: None or "" clears the value instead of being rejected.
+#   locked: The owner's static flag blocks assignment. Calculated attributes are not locked.
+#   range_message: Overrides the generated out-of-range message.
+# validate(value) runs the same checks without an instance, for constructors that skip the static check.
+# The owner class provides the static error message in _static_message, and may define _invalidate_cache(),
+# which is called after a locked attribute changes.
+# =========================================
+class NumericAttribute:
+    __slots__ = ('label', 'low', 'high', 'optional', 'locked', 'type_message', 'range_message', 'static_message',
+                 'slot', 'changed')
+
+    def __init__(self, label, low=None, high=None, optional=False, locked=True, range_message=None):
+        self.label = label
+        self.low = low
+        self.high = high
+        self.optional = optional
+        self.locked = locked
+        self.type_message = label + " must be a number."
+        if range_message is not None:
+            self.range_message = range_message
+        elif high is None:
+            self.range_message = label + " must be nonnegative."
+        else:
+            self.range_message = label + " must be between " + str(low) + " and " + str(high) + "."
+        self.static_message = None
+        self.slot = None
+        self.changed = None
+
+    def __set_name__(self, owner, name):
+        # The slot member descriptor does the actual storage.
+        self.slot = owner.__dict__["_" + name]
+        self.static_message = getattr(owner, "_static_message", None)
+        # Called after a locked attribute changes, so the owner can drop results derived from it.
+        self.changed = getattr(owner, "_invalidate_cache", None)
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        return self.slot.__get__(obj, objtype)
+
+    def __set__(self, obj, value):
+        if self.locked:
+            if obj.static:
+                raise ConfigurationError(self.static_message)
+            self.slot.__set__(obj, self.validate(value))
+            if self.changed is not None:
+                self.changed(obj)
+        else:
+            self.slot.__set__(obj, self.validate(value))
+
+    def validate(self, value):
+        # Checks a value without an instance and returns the value to store.
+        # Used directly by constructors that write the private attribute themselves.
+        if self.optional and (value is None or value == ""):
+            return None
+        if type(value) not in _NUMERIC_TYPES:
+            raise ConfigurationError(self.type_message)
+        # Written as negated comparisons so that NaN, which fails every comparison, is rejected.
+        if (self.low is not None and not self.low <= value) or (self.high is not None and not value <= self.high):
+            raise ConfigurationError(self.range_message)
+        return value
+
+
+# Caches the result of a Chip method without arguments in the chip's _cache dict, keyed by the method name.
+# Only for methods that depend on nothing but the chip and the chips stacked on it. Chip._invalidate_cache()
+# clears the cache of a chip and the chips it is stacked on whenever one of its inputs changes.
+def subtree_cached(method):
+    name = method.__name__
+    @functools.wraps(method)
+    def cached_method(self):
+        cache = self._cache
+        if name in cache:
+            return cache[name]
+        result = method(self)
+        cache[name] = result
+        return result
+    return cached_method
+
+
+# =========================================
+# Validated Slots Base Class
+# =========================================
+# Base of the definition classes whose attributes are plain public slots. Reads are direct slot lookups,
+# and every write goes through __setattr__, which rejects it once the object is static and validates it otherwise.
+# The subclass describes its attributes in class-level tables:
+#   _static_message: Error message for a write to a static object.
+#   _numeric_checks: Attribute name -> NumericAttribute used only for its validate() method.
+#   _string_messages: Attribute name -> error message for attributes that must be strings. They are stored interned.
+#   _flag_messages: Attribute name -> error message for flags, stored as bool and given as a bool or a
+#       "True"/"False" string.
+# A subclass with checks across attributes extends _validate(attr, value), which returns the value to store.
+# The subclass also lists the attributes that must be set in _required_fields. from_trusted(**attributes) uses it
+# to build a static object from already validated values without running the checks.
+# =========================================
+class ValidatedSlots:
+    __slots__ = ()
+    _static_message = None
+    _numeric_checks = {}
+    _string_messages = {}
+    _flag_messages = {}
+
+    def __setattr__(self, attr, value):
+        if attr != 'static':
+            if self.static:
+                raise ConfigurationError(self._static_message)
+            value = self._validate(attr, value)
+        object.__setattr__(self, attr, value)
+
+    @classmethod
+    def from_trusted(cls, **attributes):
+        # Builds a static object from values that were validated before, e.g. taken from another static object,
+        # by writing the slots directly. Only the presence of the required attributes is checked.
+        missing = [attr for attr in cls._required_fields if attr not in attributes]
+        if missing:
+            raise ConfigurationError(f"Missing {cls.__name__} attributes: {', '.join(missing)}.")
+        obj = cls.__new__(cls)
+        for attr, value in attributes.items():
+            object.__setattr__(obj, attr, value)
+        object.__setattr__(obj, 'static', True)
+        return obj
+
+    def _validate(self, attr, value):
+        check = self._numeric_checks.get(attr)
+        if check is not None:
+            return check.validate(value)
+        message = self._string_messages.get(attr)
+        if message is not None:
+            if not isinstance(value, str):
+                raise ConfigurationError(message)
+            # The names and IO types are the keys of the definition lookups, so equal ones share one interned object.
+            if type(value) is str:
+                return sys.intern(value)
+            return value
+        message = self._flag_messages.get(attr)
+        if message is not None and type(value) is not bool:
+            if not isinstance(value, str):
+                raise ConfigurationError(message)
+            return value.lower() == "true"
+        return value
+
+
 # =========================================
 # Wafer Process Class
 # =========================================
@@ -62,7 +253,7 @@ class CalculationError(DesignError):
 #   reticle_x: Reticle dimension in the x dimension in mm.
 #   reticle_y: Reticle dimension in the y dimension in mm.
 #   wafer_fill_grid: Whether the wafer is filled in a grid pattern or in a line pattern
-#       that ignores vertical alignment in dicing.
+#       that ignores vertical alignment in dicing. Stored as a bool, set from a bool or a "True"/"False" string.
 #   nre_front_end_cost_per_mm2_memory: The NRE design cost per mm^2 of the front end of
 #       the wafer process for memory. (Front end refers to higher level design steps.)
 #   nre_back_end_cost_per_mm2_memory: The NRE design cost per mm^2 of the back end of
@@ -78,249 +269,49 @@ class CalculationError(DesignError):
 #   static: A boolean set true when the process is defined to prevent further changes.
 # =========================================
 # The class has the following methods:
+#   _validate(attr, value): Checks the limits that depend on the wafer diameter, on top of ValidatedSlots.
 #   __init__(...): Initializes the WaferProcess object.
 #   __str__(): Returns a string representation of the object.
 #   wafer_fully_defined(): Checks if all attributes are defined.
 #   set_static(): Sets the 'static' flag to True to prevent further modifications.
 # =========================================
 
-class WaferProcess:
-    @property
-    def name(self):
-        return self.__name
-    @name.setter
-    def name(self, value):
-        if (self.static):
-            raise ConfigurationError("Cannot change static wafer process.")
-        else:
-            if type(value) != str:
-                raise ConfigurationError("Wafer process name must be a string.")
-            else:
-                self.__name = value    
-                return 0
-        
-    @property
-    def wafer_diameter(self):
-        return self.__wafer_diameter
-    @wafer_diameter.setter
-    def wafer_diameter(self, value):
-        if (self.static):
-            raise ConfigurationError("Cannot change static wafer process.")
-        else:
-            if type(value) not in [int, float, np.float64]:
-                raise ConfigurationError("Wafer diameter must be a number.")
-            elif value < 0:
-                raise ConfigurationError("Wafer diameter must be nonnegative.")
-            else:
-                self.__wafer_diameter = value
-                return 0
-
-    @property
-    def edge_exclusion(self):
-        return self.__edge_exclusion
-    @edge_exclusion.setter
-    def edge_exclusion(self, value):
-        if (self.static):
-            raise ConfigurationError("Cannot change static wafer process.")
-        else:
-            if type(value) not in [int, float, np.float64]:
-                raise ConfigurationError("Edge exclusion must be a number.")
-            elif value < 0:
-                raise ConfigurationError("Edge exclusion must be nonnegative.")
-            elif value > self.wafer_diameter/2:
-                raise ConfigurationError("Edge exclusion must be less than half the wafer diameter.")
-            else:
-                self.__edge_exclusion = value
-                return 0
-        
-    @property
-    def wafer_process_yield(self):
-        return self.__wafer_process_yield
-    @wafer_process_yield.setter
-    def wafer_process_yield(self, value):
-        if (self.static):
-            raise ConfigurationError("Cannot change static wafer process.")
-        else:
-            if type(value) not in [int, float, np.float64]:
-                raise ConfigurationError("Wafer process yield must be a number.")
-            elif value < 0.0 or value > 1.0:
-                raise ConfigurationError("Wafer process yield must be between 0 and 1.")
-            else:
-                self.__wafer_process_yield = value
-                return 0
-
-    @property
-    def dicing_distance(self):
-        return self.__dicing_distance
-    @dicing_distance.setter
-    def dicing_distance(self, value):
-        if (self.static):
-            raise ConfigurationError("Cannot change static wafer process.")
-        else:
-            if type(value) not in [int, float, np.float64]:
-                raise ConfigurationError("Dicing distance must be a number.")
-            elif value < 0:
-                raise ConfigurationError("Dicing distance must be nonnegative.")
-            elif value > self.wafer_diameter/2:
-                raise ConfigurationError("Dicing distance must be less than half the wafer diameter.")
-            else:
-                self.__dicing_distance = value
-                return 0
-        
-    @property
-    def reticle_x(self):
-        return self.__reticle_x
-    @reticle_x.setter
-    def reticle_x(self, value):
-        if (self.static):
-            raise ConfigurationError("Cannot change static wafer process.")
-        else:
-            if type(value) not in [int, float, np.float64]:
-                raise ConfigurationError("Reticle x dimension must be a number.")
-            elif value < 0:
-                raise ConfigurationError("Reticle x dimension must be nonnegative.")
-            elif value > self.wafer_diameter/2:
-                raise ConfigurationError("Reticle x dimension must be less than half the wafer diameter.")
-            else:
-                self.__reticle_x = value
-                return 0
-
-    @property
-    def reticle_y(self):
-        return self.__reticle_y
-    @reticle_y.setter
-    def reticle_y(self, value):
-        if (self.static):
-            raise ConfigurationError("Cannot change static wafer process.")
-        else:
-            if type(value) not in [int, float, np.float64]:
-                raise ConfigurationError("Reticle y dimension must be a number.")
-            elif value < 0:
-                raise ConfigurationError("Reticle y dimension must be nonnegative.")
-            elif value > self.wafer_diameter/2:
-                raise ConfigurationError("Reticle y dimension must be less than half the wafer diameter.")
-            else:
-                self.__reticle_y = value
-                return 0
-        
-    @property
-    def wafer_fill_grid(self):
-        return self.__wafer_fill_grid
-    @wafer_fill_grid.setter
-    def wafer_fill_grid(self, value):
-        if (self.static):
-            raise ConfigurationError("Cannot change static wafer process.")
-        else:
-            if type(value) != str:
-                raise ConfigurationError("Wafer fill grid must be a string. (True or False)")
-            if value.lower() == "true":
-                self.__wafer_fill_grid = True
-            else:
-                self.__wafer_fill_grid = False
-            return 0
-
-    @property
-    def nre_front_end_cost_per_mm2_memory(self):
-        return self.__nre_front_end_cost_per_mm2_memory
-    @nre_front_end_cost_per_mm2_memory.setter
-    def nre_front_end_cost_per_mm2_memory(self, value):
-        if (self.static):
-            raise ConfigurationError("Cannot change static wafer process.")
-        else:
-            if type(value) not in [int, float, np.float64]:
-                raise ConfigurationError("NRE front end cost per mm^2 memory must be a number.")
-            elif value < 0:
-                raise ConfigurationError("NRE front end cost per mm^2 memory must be nonnegative.")
-            else:
-                self.__nre_front_end_cost_per_mm2_memory = value
-                return 0
-
-    @property
-    def nre_back_end_cost_per_mm2_memory(self):
-        return self.__nre_back_end_cost_per_mm2_memory
-    @nre_back_end_cost_per_mm2_memory.setter
-    def nre_back_end_cost_per_mm2_memory(self, value):
-        if (self.static):
-            raise ConfigurationError("Cannot change static wafer process.")
-        else:
-            if type(value) not in [int, float, np.float64]:
-                raise ConfigurationError("NRE back end cost per mm^2 memory must be a number.")
-            elif value < 0:
-                raise ConfigurationError("NRE back end cost per mm^2 memory must be nonnegative.")
-            else:
-                self.__nre_back_end_cost_per_mm2_memory = value
-                return 0
-        
-    @property
-    def nre_front_end_cost_per_mm2_logic(self):
-        return self.__nre_front_end_cost_per_mm2_logic
-    @nre_front_end_cost_per_mm2_logic.setter
-    def nre_front_end_cost_per_mm2_logic(self, value):
-        if (self.static):
-            raise ConfigurationError("Cannot change static wafer process.")
-        else:
-            if type(value) not in [int, float, np.float64]:
-                raise ConfigurationError("NRE front end cost per mm^2 logic must be a number.")
-            elif value < 0:
-                raise ConfigurationError("NRE front end cost per mm^2 logic must be nonnegative.")
-            else:
-                self.__nre_front_end_cost_per_mm2_logic = value
-                return 0
-        
-    @property
-    def nre_back_end_cost_per_mm2_logic(self):
-        return self.__nre_back_end_cost_per_mm2_logic
-    @nre_back_end_cost_per_mm2_logic.setter
-    def nre_back_end_cost_per_mm2_logic(self, value):
-        if (self.static):
-            raise ConfigurationError("Cannot change static wafer process.")
-        else:
-            if type(value) not in [int, float, np.float64]:
-                raise ConfigurationError("NRE back end cost per mm^2 logic must be a number.")
-            elif value < 0:
-                raise ConfigurationError("NRE back end cost per mm^2 logic must be nonnegative.")
-            else:
-                self.__nre_back_end_cost_per_mm2_logic = value
-                return 0
-        
-    @property
-    def nre_front_end_cost_per_mm2_analog(self):
-        return self.__nre_front_end_cost_per_mm2_analog
-    @nre_front_end_cost_per_mm2_analog.setter
-    def nre_front_end_cost_per_mm2_analog(self, value):
-        if (self.static):
-            raise ConfigurationError("Cannot change static wafer process.")
-        else:
-            if type(value) not in [int, float, np.float64]:
-                raise ConfigurationError("NRE front end cost per mm^2 analog must be a number.")
-            elif value < 0:
-                raise ConfigurationError("NRE front end cost per mm^2 analog must be nonnegative.")
-            else:
-                self.__nre_front_end_cost_per_mm2_analog = value
-                return 0
-        
-    @property
-    def nre_back_end_cost_per_mm2_analog(self):
-        return self.__nre_back_end_cost_per_mm2_analog
-    @nre_back_end_cost_per_mm2_analog.setter
-    def nre_back_end_cost_per_mm2_analog(self, value):
-        if (self.static):
-            raise ConfigurationError("Cannot change static wafer process.")
-        else:
-            if type(value) not in [int, float, np.float64]:
-                raise ConfigurationError("NRE back end cost per mm^2 analog must be a number.")
-            elif value < 0:
-                raise ConfigurationError("NRE back end cost per mm^2 analog must be nonnegative.")
-            else:
-                self.__nre_back_end_cost_per_mm2_analog = value
-                return 0
-        
-    @property
-    def static(self):
-        return self.__static
-    @static.setter
-    def static(self, value):
-        self.__static = value
+class WaferProcess(ValidatedSlots):
+    __slots__ = ('name', 'wafer_diameter', 'edge_exclusion', 'wafer_process_yield',
+                 'dicing_distance', 'reticle_x', 'reticle_y', 'wafer_fill_grid',
+                 'nre_front_end_cost_per_mm2_memory', 'nre_back_end_cost_per_mm2_memory',
+                 'nre_front_end_cost_per_mm2_logic', 'nre_back_end_cost_per_mm2_logic',
+                 'nre_front_end_cost_per_mm2_analog', 'nre_back_end_cost_per_mm2_analog', 'static')
+
+    _static_message = "Cannot change static wafer process."
+    _numeric_checks = {
+        'wafer_diameter': NumericAttribute("Wafer diameter", low=0),
+        'edge_exclusion': NumericAttribute("Edge exclusion", low=0),
+        'wafer_process_yield': NumericAttribute("Wafer process yield", low=0.0, high=1.0,
+                                                range_message="Wafer process yield must be between 0 and 1."),
+        'dicing_distance': NumericAttribute("Dicing distance", low=0),
+        'reticle_x': NumericAttribute("Reticle x dimension", low=0),
+        'reticle_y': NumericAttribute("Reticle y dimension", low=0),
+        'nre_front_end_cost_per_mm2_memory': NumericAttribute("NRE front end cost per mm^2 memory", low=0),
+        'nre_back_end_cost_per_mm2_memory': NumericAttribute("NRE back end cost per mm^2 memory", low=0),
+        'nre_front_end_cost_per_mm2_logic': NumericAttribute("NRE front end cost per mm^2 logic", low=0),
+        'nre_back_end_cost_per_mm2_logic': NumericAttribute("NRE back end cost per mm^2 logic", low=0),
+        'nre_front_end_cost_per_mm2_analog': NumericAttribute("NRE front end cost per mm^2 analog", low=0),
+        'nre_back_end_cost_per_mm2_analog': NumericAttribute("NRE back end cost per mm^2 analog", low=0),
+    }
+    _string_messages = {'name': "Wafer process name must be a string."}
+    # The definition reader passes a bool. A "True"/"False" string is still accepted.
+    _flag_messages = {'wafer_fill_grid': "Wafer fill grid must be a bool or a string. (True or False)"}
+    # Every attribute except the static flag has to be set before the process can be static.
+    _required_fields = __slots__[:-1]
+    # These may not be larger than half the wafer diameter.
+    _half_diameter_limited = frozenset(('edge_exclusion', 'dicing_distance', 'reticle_x', 'reticle_y'))
+
+    def _validate(self, attr, value):
+        value = ValidatedSlots._validate(self, attr, value)
+        if attr in WaferProcess._half_diameter_limited and value > self.wafer_diameter/2:
+            raise ConfigurationError(self._numeric_checks[attr].label + " must be less than half the wafer diameter.")
+        return value
 
     def __init__(self, name = None, wafer_diameter = None, edge_exclusion = None, wafer_process_yield = None,
                  dicing_distance = None, reticle_x = None, reticle_y = None, wafer_fill_grid = None,
@@ -368,15 +359,7 @@ class WaferProcess:
         return return_str
 
     def wafer_fully_defined(self) -> bool:
-        if (self.name is None or self.wafer_diameter is None or self.edge_exclusion is None or 
-                self.wafer_process_yield is None or self.dicing_distance is None or self.reticle_x is None or self.reticle_y is None or 
-                self.wafer_fill_grid is None or self.nre_front_end_cost_per_mm2_memory is None or 
-                self.nre_back_end_cost_per_mm2_memory is None or self.nre_front_end_cost_per_mm2_logic is None or 
-                self.nre_back_end_cost_per_mm2_logic is None or self.nre_front_end_cost_per_mm2_analog is None or 
-                self.nre_back_end_cost_per_mm2_analog is None):
-            return False
-        else:
-            return True
+        return not any(getattr(self, field) is None for field in WaferProcess._required_fields)
 
     def set_static(self) -> int:
         if not self.wafer_fully_defined():
@@ -395,7 +378,7 @@ class WaferProcess:
 #   shoreline: The shoreline of the IO in mm.
 #   bandwidth: The bandwidth of the IO in Gbps.
 #   wire_count: The number of wires in the IO.
-#   bidirectional: Whether the IO is bidirectional or not.
+#   bidirectional: Whether the IO is bidirectional or not. Stored as a bool.
 #   energy_per_bit: The energy per bit of the IO in pJ/bit.
 #   reach: The reach of the IO in mm.
 #   static: A boolean set true when the IO is defined to prevent further changes.
@@ -405,158 +388,28 @@ class WaferProcess:
 #   __str__(): Returns a string representation of the object.
 #   io_fully_defined(): Checks if all attributes are defined.
 #   set_static(): Sets the 'static' flag to True to prevent further modifications.
+#   validate_batch(definitions): Builds static IOs from a list of attribute dicts, checking them together.
 # =========================================
 
-class IO:
-    @property
-    def type(self):
-        return self.__type
-    @type.setter
-    def type(self, value):
-        if (self.static):
-            raise ConfigurationError("Cannot change static IO.")
-        else:
-            if type(value) != str:
-                raise ConfigurationError("IO type must be a string.")
-            else:
-                self.__type = value
-                return 0
-
-    @property
-    def rx_area(self):
-        return self.__rx_area
-    @rx_area.setter
-    def rx_area(self, value):
-        if (self.static):
-            raise ConfigurationError("Cannot change static IO.")
-        else:
-            if type(value) not in [int, float, np.float64]:
-                raise ConfigurationError("RX area must be a number.")
-            elif value < 0:
-                raise ConfigurationError("RX area must be nonnegative.")
-            else:
-                self.__rx_area = value
-                return 0
-
-    @property
-    def tx_area(self):
-        return self.__tx_area
-    @tx_area.setter
-    def tx_area(self, value):
-        if (self.static):
-            raise ConfigurationError("Cannot change static IO.")
-        else:
-            if type(value) not in [int, float, np.float64]:
-                raise ConfigurationError("TX area must be a number.")
-            elif value < 0:
-                raise ConfigurationError("TX area must be nonnegative.")
-            else:
-                self.__tx_area = value
-                return 0
-
-    @property
-    def shoreline(self):
-        return self.__shoreline
-    @shoreline.setter
-    def shoreline(self, value):
-        if (self.static):
-            raise ConfigurationError("Cannot change static IO.")
-        else:
-            if type(value) not in [int, float, np.float64]:
-                raise ConfigurationError("Shoreline must be a number.")
-            elif value < 0:
-                raise ConfigurationError("Shoreline must be nonnegative.")
-            else:
-                self.__shoreline = value
-                return 0
-
-    @property
-    def bandwidth(self):
-        return self.__bandwidth
-    @bandwidth.setter
-    def bandwidth(self, value):
-        if (self.static):
-            raise ConfigurationError("Cannot change static IO.")
-        else:
-            if type(value) not in [int, float, np.float64]:
-                raise ConfigurationError("Bandwidth must be a number.")
-            elif value < 0:
-                raise ConfigurationError("Bandwidth must be nonnegative.")
-            else:
-                self.__bandwidth = value
-                return 0
-
-    @property
-    def wire_count(self):
-        return self.__wire_count
-    @wire_count.setter
-    def wire_count(self, value):
-        if (self.static):
-            raise ConfigurationError("Cannot change static IO.")
-        else:
-            if type(value) not in [int, float, np.float64]:
-                raise ConfigurationError("Wire count must be a number.")
-            elif value < 0:
-                raise ConfigurationError("Wire count must be nonnegative.")
-            else:
-                self.__wire_count = value
-                return 0
-
-    @property
-    def bidirectional(self):
-        return self.__bidirectional
-    @bidirectional.setter
-    def bidirectional(self, value):
-        if (self.static):
-            raise ConfigurationError("Cannot change static IO.")
-        else:
-            if type(value) != str:
-                raise ConfigurationError("Bidirectional must be a string. (True or False)")
-            else:
-                if value.lower() == "true":
-                    self.__bidirectional = True
-                else:
-                    self.__bidirectional = False
-                return 0
-
-    @property
-    def energy_per_bit(self):
-        return self.__energy_per_bit
-    @energy_per_bit.setter
-    def energy_per_bit(self, value):
-        if (self.static):
-            raise ConfigurationError("Cannot change static IO.")
-        else:
-            if type(value) not in [int, float, np.float64]:
-                raise ConfigurationError("Energy per bit must be a number.")
-            elif value < 0:
-                raise ConfigurationError("Energy per bit must be nonnegative.")
-            else:
-                self.__energy_per_bit = value
-                return 0
-
-    @property
-    def reach(self):
-        return self.__reach
-    @reach.setter
-    def reach(self, value):
-        if (self.static):
-            raise ConfigurationError("Cannot change static IO.")
-        else:
-            if type(value) not in [int, float, np.float64]:
-                raise ConfigurationError("Reach must be a number.")
-            elif value < 0:
-                raise ConfigurationError("Reach must be nonnegative.")
-            else:
-                self.__reach = value
-                return 0
-
-    @property
-    def static(self):
-        return self.__static
-    @static.setter
-    def static(self, value):
-        self.__static = value
+class IO(ValidatedSlots):
+    __slots__ = ('type', 'rx_area', 'tx_area', 'shoreline', 'bandwidth', 'wire_count',
+                 'bidirectional', 'energy_per_bit', 'reach', 'static')
+
+    _static_message = "Cannot change static IO."
+    _numeric_checks = {
+        'rx_area': NumericAttribute("RX area", low=0),
+        'tx_area': NumericAttribute("TX area", low=0),
+        'shoreline': NumericAttribute("Shoreline", low=0),
+        'bandwidth': NumericAttribute("Bandwidth", low=0),
+        'wire_count': NumericAttribute("Wire count", low=0),
+        'energy_per_bit': NumericAttribute("Energy per bit", low=0),
+        'reach': NumericAttribute("Reach", low=0),
+    }
+    _string_messages = {'type': "IO type must be a string."}
+    # The definition reader passes a bool. A "True"/"False" string is still accepted.
+    _flag_messages = {'bidirectional': "Bidirectional must be a bool or a string. (True or False)"}
+    # Every attribute except the static flag has to be set before the IO can be static.
+    _required_fields = __slots__[:-1]
 
     def __init__(self, type = None, rx_area = None, tx_area = None, shoreline = None, bandwidth = None,
                  wire_count = None, bidirectional = None, energy_per_bit = None, reach = None,
@@ -578,26 +431,16 @@ class IO:
             print(self)
         return
 
+    # Filled in from the slots, in one format call.
+    _str_template = ("IO Type: {type}\n\r\tRX Area: {rx_area}\n\r\tTX Area: {tx_area}\n\r\tShoreline: {shoreline}"
+                     "\n\r\tBandwidth: {bandwidth}\n\r\tWire Count: {wire_count}\n\r\tBidirectional: {bidirectional}"
+                     "\n\r\tEnergy Per Bit: {energy_per_bit}\n\r\tReach: {reach}\n\r\tStatic: {static}")
+
     def __str__(self) -> str:
-        return_str = "IO Type: " + self.type
-        return_str += "\n\r\tRX Area: " + str(self.rx_area)
-        return_str += "\n\r\tTX Area: " + str(self.tx_area)
-        return_str += "\n\r\tShoreline: " + str(self.shoreline)
-        return_str += "\n\r\tBandwidth: " + str(self.bandwidth)
-        return_str += "\n\r\tWire Count: " + str(self.wire_count)
-        return_str += "\n\r\tBidirectional: " + str(self.bidirectional)
-        return_str += "\n\r\tEnergy Per Bit: " + str(self.energy_per_bit)
-        return_str += "\n\r\tReach: " + str(self.reach)
-        return_str += "\n\r\tStatic: " + str(self.static)
-        return return_str
-    
+        return IO._str_template.format_map({field: getattr(self, field) for field in IO.__slots__})
+
     def io_fully_defined(self) -> bool:
-        if (self.type is None or self.rx_area is None or self.tx_area is None or self.shoreline is None or 
-                self.bandwidth is None or self.wire_count is None or self.bidirectional is None or 
-                self.energy_per_bit is None or self.reach is None):
-            return False
-        else:
-            return True
+        return not any(getattr(self, field) is None for field in IO._required_fields)
 
     def set_static(self) -> int:
         if not self.io_fully_defined():
@@ -605,6 +448,39 @@ class IO:
         self.static = True
         return 0
 
+    @classmethod
+    def validate_batch(cls, definitions):
+        # Builds static IOs from a list of dicts of IO attributes, keyed like the constructor arguments.
+        # The numeric attributes of all definitions are checked in one array comparison, and only the definitions
+        # that fail it are validated again one at a time. Their errors are raised together in one ConfigurationError.
+        numeric = tuple(cls._numeric_checks)
+        values = [[definition.get(attr) for attr in numeric] for definition in definitions]
+        if {type(value) for row in values for value in row} <= set(_NUMERIC_TYPES):
+            array = np.array(values, dtype=np.float64).reshape(len(values), len(numeric))
+            # NaN passes the comparison, so it is looked for separately.
+            bad = (array < 0).any(axis=1) | np.isnan(array).any(axis=1)
+            suspect = set(np.flatnonzero(bad).tolist())
+        else:
+            suspect = set(range(len(definitions)))
+        ios = []
+        errors = []
+        for row, definition in enumerate(definitions):
+            io_type = definition.get('type')
+            bidirectional = definition.get('bidirectional')
+            if row in suspect or type(io_type) is not str or type(bidirectional) is not bool:
+                try:
+                    io = cls(**definition, static=False)
+                    io.set_static()
+                except ConfigurationError as error:
+                    errors.append(f"IO definition {row}: {error}")
+                    continue
+            else:
+                io = cls.from_trusted(**dict(definition, type=sys.intern(io_type)))
+            ios.append(io)
+        if errors:
+            raise ConfigurationError("Invalid IO definitions:\n" + "\n".join(errors))
+        return ios
+
 
 # =========================================
 # Layer Class
@@ -630,6 +506,7 @@ class IO:
 #   __init__(...): Initializes the Layer object.
 #   __str__(): Returns a string representation of the object.
 #   get_gates_per_mm2(): Calculates and returns the number of logic gates per mm^2.
+#   stackup_record(): Returns the layer's values as a record of LAYER_DTYPE.
 #   layer_fully_defined(): Checks if all attributes are defined.
 #   set_static(): Sets the 'static' flag to True to prevent further modifications.
 # == Computation ==
@@ -637,210 +514,217 @@ class IO:
 #   layer_yield(area): Computes the yield of the layer given the area of the layer.
 #   reticle_utilization(area, reticle_x, reticle_y): Computes the reticle utilization.
 #   layer_cost(area, aspect_ratio, wafer_process): Computes the manufacturing cost of the layer.
+#   row_heights(...), row_die_indices(...), mirrored_row_locations(...): Array helpers for the rows of dies on a wafer.
 #   compute_grid_dies_per_wafer(...): Calculates the number of dies that fit on a wafer with a grid alignment.
 #   compute_nogrid_dies_per_wafer(...): Calculates the number of dies that fit on a wafer without a grid alignment.
+#       Both also return the die locations if called with return_locations=True (None for the second nogrid case).
 #   compute_dies_per_wafer(...): Determines the number of dies per wafer based on the fill strategy.
 #   compute_cost_per_mm2(area, aspect_ratio, wafer_process): Computes the effective cost per mm^2 considering wafer fit.
+#   compute_wafer_areas(area, aspect_ratio, wafer_process): Computes the wafer area and the area used by the dies on it.
 # =========================================
 
 class Layer:
+    __slots__ = ('_name', '_active', '_routing_layer_count', '_routing_layer_pitch', '_cost_per_mm2',
+                 '_transistor_density', '_defect_density', '_critical_area_ratio', '_clustering_factor',
+                 '_litho_percent', '_mask_cost', '_stitching_yield', '_static')
+
     @property
     def name(self):
-        return self.__name
+        return self._name
     @name.setter
     def name(self, value):
         if (self.static):
             raise ConfigurationError("Cannot change static layer.")
         else:
-            if type(value) != str:
+            if not isinstance(value, str):
                 raise ConfigurationError("Layer name must be a string.")
             else:
-                self.__name = value
+                self._name = value
                 return 0
 
     @property
     def active(self):
-        return self.__active
+        return self._active
     @active.setter
     def active(self, value):
         if (self.static):
             raise ConfigurationError("Cannot change static layer.")
         else:
-            if type(value) != str:
+            if not isinstance(value, str):
                 raise ConfigurationError("Active must be a string. (True or False)")
             else:
                 if value.lower() == "true":
-                    self.__active = True
+                    self._active = True
                 else:
-                    self.__active = False
+                    self._active = False
                 return 0
 
     @property
     def routing_layer_count(self):
-        return self.__routing_layer_count
+        return self._routing_layer_count
     @routing_layer_count.setter
     def routing_layer_count(self, value):
         if (self.static):
             raise ConfigurationError("Cannot change static layer.")
         else:
-            if type(value) not in [int]:
+            if type(value) is not int:
                 raise ConfigurationError("Routing layer count must be an int.")
             elif value < 0:
                 raise ConfigurationError("Routing layer count must be nonnegative.")
             else:
-                self.__routing_layer_count = value
+                self._routing_layer_count = value
                 return 0
     
     @property
     def routing_layer_pitch(self):
-        return self.__routing_layer_pitch
+        return self._routing_layer_pitch
     @routing_layer_pitch.setter
     def routing_layer_pitch(self, value):
         if (self.static):
             raise ConfigurationError("Cannot change static layer.")
         else:
-            if type(value) not in [int, float, np.float64]:
+            if type(value) not in _NUMERIC_TYPES:
                 raise ConfigurationError("Routing layer pitch must be a number.")
             elif value < 0:
                 raise ConfigurationError("Routing layer pitch must be nonnegative.")
             else:
-                self.__routing_layer_pitch = value
+                self._routing_layer_pitch = value
                 return 0
 
     @property
     def cost_per_mm2(self):
-        return self.__cost_per_mm2
+        return self._cost_per_mm2
     @cost_per_mm2.setter
     def cost_per_mm2(self, value):
         if (self.static):
             raise ConfigurationError("Cannot change static layer.")
         else:
-            if type(value) not in [int, float, np.float64]:
+            if type(value) not in _NUMERIC_TYPES:
                 raise ConfigurationError("Cost per mm^2 must be a number.")
             elif value < 0:
                 raise ConfigurationError("Cost per mm^2 must be nonnegative.")
             else:
-                self.__cost_per_mm2 = value
+                self._cost_per_mm2 = value
                 return 0
 
     @property
     def transistor_density(self):
-        return self.__transistor_density
+        return self._transistor_density
     @transistor_density.setter
     def transistor_density(self, value):
         if (self.static):
             raise ConfigurationError("Cannot change static layer.")
         else:
-            if type(value) not in [int, float, np.float64]:
+            if type(value) not in _NUMERIC_TYPES:
                 raise ConfigurationError("Transistor density must be a number.")
             elif value < 0:
                 raise ConfigurationError("Transistor density must be nonnegative.")
             else:
-                self.__transistor_density = value
+                self._transistor_density = value
                 return 0
 
     @property
     def defect_density(self):
-        return self.__defect_density
+        return self._defect_density
     @defect_density.setter
     def defect_density(self, value):
         if (self.static):
             raise ConfigurationError("Cannot change static layer.")
         else:
-            if type(value) not in [int, float, np.float64]:
+            if type(value) not in _NUMERIC_TYPES:
                 raise ConfigurationError("Defect density must be a number.")
             elif value < 0:
                 raise ConfigurationError("Defect density must be nonnegative.")
             else:
-                self.__defect_density = value
+                self._defect_density = value
                 return 0
 
     @property
     def critical_area_ratio(self):
-        return self.__critical_area_ratio
+        return self._critical_area_ratio
     @critical_area_ratio.setter
     def critical_area_ratio(self, value):
         if (self.static):
             raise ConfigurationError("Cannot change static layer.")
         else:
-            if type(value) not in [int, float, np.float64]:
+            if type(value) not in _NUMERIC_TYPES:
                 raise ConfigurationError("Critical area ratio must be a number.")
             elif value < 0:
                 raise ConfigurationError("Critical area ratio must be nonnegative.")
             else:
-                self.__critical_area_ratio = value
+                self._critical_area_ratio = value
                 return 0
 
     @property
     def clustering_factor(self):
-        return self.__clustering_factor
+        return self._clustering_factor
     @clustering_factor.setter
     def clustering_factor(self, value):
         if (self.static):
             raise ConfigurationError("Cannot change static layer.")
         else:
-            if type(value) not in [int, float, np.float64]:
+            if type(value) not in _NUMERIC_TYPES:
                 raise ConfigurationError("Clustering factor must be a number.")
             elif value < 0:
                 raise ConfigurationError("Clustering factor must be nonnegative.")
             else:
-                self.__clustering_factor = value
+                self._clustering_factor = value
                 return 0
 
     @property
     def litho_percent(self):
-        return self.__litho_percent
+        return self._litho_percent
     @litho_percent.setter
     def litho_percent(self, value):
         if (self.static):
             raise ConfigurationError("Cannot change static layer.")
         else:
-            if type(value) not in [int, float, np.float64]:
+            if type(value) not in _NUMERIC_TYPES:
                 raise ConfigurationError("Litho percent must be a number.")
             elif value < 0 or value > 1:
                 raise ConfigurationError("Litho percent must be between 0 and 1.")
             else:
-                self.__litho_percent = value
+                self._litho_percent = value
                 return 0
 
     @property
     def mask_cost(self):
-        return self.__mask_cost
+        return self._mask_cost
     @mask_cost.setter
     def mask_cost(self, value):
         if (self.static):
             raise ConfigurationError("Cannot change static layer.")
         else:
-            if type(value) not in [int, float, np.float64]:
+            if type(value) not in _NUMERIC_TYPES:
                 raise ConfigurationError("Mask cost must be a number.")
             elif value < 0:
                 raise ConfigurationError("Mask cost must be nonnegative.")
             else:
-                self.__mask_cost = value
+                self._mask_cost = value
                 return 0
 
     @property
     def stitching_yield(self):
-        return self.__stitching_yield
+        return self._stitching_yield
     @stitching_yield.setter
     def stitching_yield(self, value):
         if (self.static):
             raise ConfigurationError("Cannot change static layer.")
         else:
-            if type(value) not in [int, float, np.float64]:
+            if type(value) not in _NUMERIC_TYPES:
                 raise ConfigurationError("Stitching yield must be a number.")
             elif value < 0 or value > 1:
                 raise ConfigurationError("Stitching yield must be between 0 and 1.")
             else:
-                self.__stitching_yield = value
+                self._stitching_yield = value
                 return 0
 
     @property
     def static(self):
-        return self.__static
+        return self._static
     @static.setter
     def static(self, value):
-        self.__static = value
+        self._static = value
 
     def __init__(self, name = None, active = None, cost_per_mm2 = None, transistor_density = None, defect_density = None,
                  critical_area_ratio = None, clustering_factor = None, litho_percent = None, mask_cost = None,
@@ -870,6 +754,12 @@ class Layer:
         # An assumption of 4 transistors per standard logic gate (e.g., NAND) is used.
         return self.transistor_density * 1e6 / 4
 
+    def stackup_record(self) -> tuple:
+        # The values of this layer in the field order of LAYER_DTYPE.
+        return (self.active, self.get_gates_per_mm2(), self.mask_cost, self.defect_density, self.critical_area_ratio,
+                self.clustering_factor, self.stitching_yield, self.routing_layer_count, self.routing_layer_pitch,
+                self.cost_per_mm2, self.litho_percent)
+
     def __str__(self) -> str:
         return_str = "Layer Name: " + self.name
         return_str += "\n\r\tActive: " + str(self.active)
@@ -930,7 +820,8 @@ class Layer:
         final_layer_yield = stitching_yield*defect_yield
         return final_layer_yield
 
-    def reticle_utilization(self,area,reticle_x,reticle_y) -> float:
+    @staticmethod
+    def reticle_utilization(area,reticle_x,reticle_y) -> float:
         reticle_area = reticle_x*reticle_y
         # If the chip area is larger than the reticle area, this requires stitching.
         # The model assumes multiple reticles are used, effectively increasing the "total" reticle area.
@@ -973,104 +864,137 @@ class Layer:
 
         return layer_cost
 
-    def compute_grid_dies_per_wafer(self, x_dim, y_dim, usable_wafer_diameter, dicing_distance):
+    # The dies per wafer calculations only depend on their arguments, so they are static methods.
+    @staticmethod
+    def row_heights(first_height, pitch, limit):
+        # The heights first_height, first_height + pitch, ... that are below limit, as an array.
+        # np.cumsum adds one pitch at a time, so the heights are exactly those of a loop doing height += pitch.
+        if not first_height < limit:
+            return np.empty(0)
+        count = math.ceil((limit - first_height)/pitch) + 2
+        heights = np.cumsum(np.concatenate(((first_height,), np.full(count - 1, pitch))))
+        while heights[-1] < limit:
+            heights = np.concatenate((heights, np.cumsum(np.concatenate(((heights[-1],), np.full(count, pitch))))[1:]))
+        return heights[:np.searchsorted(heights, limit)]
+
+    @staticmethod
+    def row_die_indices(counts):
+        # For rows holding counts[k] dies, the row of every die and its position in the row, row by row.
+        rows = np.repeat(np.arange(counts.shape[0]), counts)
+        row_starts = np.cumsum(counts) - counts
+        return rows, np.arange(rows.shape[0]) - row_starts[rows]
+
+    @staticmethod
+    def mirrored_row_locations(row_x_start, heights, counts, x_dim_eff, y_dim_eff):
+        # The (x, y) locations of the dies in pairs of rows mirrored about the wafer's horizontal diameter. Row k starts at
+        # row_x_start[k], holds counts[k] dies on each side, and its chord is at heights[k]. Each die is followed by its mirror.
+        rows, positions = Layer.row_die_indices(counts)
+        x = row_x_start[rows] + positions*x_dim_eff
+        y = heights[rows] - y_dim_eff
+        return np.column_stack((np.repeat(x, 2), np.column_stack((y, -1*y-y_dim_eff)).ravel()))
+
+    @staticmethod
+    def compute_grid_dies_per_wafer(x_dim, y_dim, usable_wafer_diameter, dicing_distance, return_locations=False):
         # This is a full calculator for die placement on a wafer assuming a grid layout.
         # It iterates through possible starting orientations to maximize the number of dies.
+        # The rows of each orientation are computed together as arrays.
+        # With return_locations, the (x, y) locations of the dies of the best layout are returned too, as an array.
         x_dim_eff = x_dim + dicing_distance
         y_dim_eff = y_dim + dicing_distance
         best_dies_per_wafer = 0
-        best_die_locations = []
+        best_die_locations = np.empty((0, 2))
         left_column_height = 1
         first_row_height = y_dim_eff/2
         r = usable_wafer_diameter/2
-        first_column_dist = r - math.sqrt(r**2 - (first_row_height)**2)
-        crossover_column_height = math.sqrt(r**2 - (r-first_column_dist-x_dim_eff)**2)
+        # Squares are written as products, which are cheaper than pow() and exactly rounded.
+        r_squared = r*r
+        first_column_dist = r - math.sqrt(r_squared - first_row_height*first_row_height)
+        crossover_column_offset = r - first_column_dist - x_dim_eff
+        crossover_column_height = math.sqrt(r_squared - crossover_column_offset*crossover_column_offset)
         while left_column_height*y_dim_eff/2 < crossover_column_height:
             dies_per_wafer = 0
             die_locations = []
             # Get First Row or Block of Rows
     
             row_chord_height = (left_column_height*y_dim_eff/2) - dicing_distance/2
-            chord_length = math.sqrt(r**2 - (row_chord_height)**2)*2
+            chord_length = math.sqrt(r_squared - row_chord_height*row_chord_height)*2
             num_dies_in_row = math.floor((chord_length+dicing_distance)/x_dim_eff)
-            dies_per_wafer += num_dies_in_row*left_column_height    
-            for j in range(num_dies_in_row):
-                x = j*x_dim_eff - chord_length/2
-                for i in range(left_column_height):
-                    y = y_dim_eff*i - row_chord_height
-                    die_locations.append((x, y))
+            dies_per_wafer += num_dies_in_row*left_column_height
+            if return_locations:
+                block_x = np.arange(num_dies_in_row)*x_dim_eff - chord_length/2
+                block_y = y_dim_eff*np.arange(left_column_height) - row_chord_height
+                die_locations.append(np.column_stack((np.repeat(block_x, left_column_height), np.tile(block_y, num_dies_in_row))))
             row_chord_height += y_dim_eff
     
             # Add correction for the far side of the wafer.
             end_of_rows = num_dies_in_row*x_dim_eff - chord_length/2
-            for i in range(left_column_height):
-                y = y_dim_eff*i - row_chord_height + y_dim_eff
-                if (end_of_rows + x_dim_eff)**2 + y**2 <= r**2 and (end_of_rows + x_dim_eff)**2 + (y + y_dim_eff)**2 <= r**2:
-                    dies_per_wafer += 1
-                    die_locations.append((end_of_rows, y))
+            far_x_squared = (end_of_rows + x_dim_eff)*(end_of_rows + x_dim_eff)
+            far_y = y_dim_eff*np.arange(left_column_height) - row_chord_height + y_dim_eff
+            fits = (far_x_squared + far_y*far_y <= r_squared) & (far_x_squared + (far_y + y_dim_eff)*(far_y + y_dim_eff) <= r_squared)
+            dies_per_wafer += int(np.count_nonzero(fits))
+            if return_locations:
+                die_locations.append(np.column_stack((np.full(np.count_nonzero(fits), end_of_rows), far_y[fits])))
     
+            # The remaining rows, mirrored above and below the first block.
             starting_distance_from_left = (usable_wafer_diameter - chord_length)/2
-            while row_chord_height < usable_wafer_diameter/2:
-                chord_length = math.sqrt(r**2 - row_chord_height**2)*2
-    
-                # Compute how many squares over from the first square it is possible to fit another square on top.
-                location_of_first_fit_candidate = (usable_wafer_diameter - chord_length)/2
-                starting_location = math.ceil((location_of_first_fit_candidate - starting_distance_from_left)/x_dim_eff)*x_dim_eff + starting_distance_from_left
-                effective_cord_length = chord_length - (starting_location - location_of_first_fit_candidate)
-                dies_per_wafer += 2*math.floor(effective_cord_length/x_dim_eff)
-                for j in range(math.floor(effective_cord_length/x_dim_eff)):
-                    x = starting_location + j*x_dim_eff - usable_wafer_diameter/2
-                    y = row_chord_height - y_dim_eff
-                    die_locations.append((x, y))
-                    die_locations.append((x, -1*y-y_dim_eff))
-                row_chord_height += y_dim_eff
+            heights = Layer.row_heights(row_chord_height, y_dim_eff, usable_wafer_diameter/2)
+            chord_lengths = np.sqrt(r_squared - heights*heights)*2
+            # Compute how many squares over from the first square it is possible to fit another square on top.
+            location_of_first_fit_candidate = (usable_wafer_diameter - chord_lengths)/2
+            starting_location = np.ceil((location_of_first_fit_candidate - starting_distance_from_left)/x_dim_eff)*x_dim_eff + starting_distance_from_left
+            effective_cord_length = chord_lengths - (starting_location - location_of_first_fit_candidate)
+            row_counts = np.floor(effective_cord_length/x_dim_eff).astype(np.int64)
+            # A negative count is added like the loop did, but such a row holds no dies.
+            dies_per_wafer += 2*int(row_counts.sum())
+            if return_locations:
+                die_locations.append(Layer.mirrored_row_locations(starting_location - usable_wafer_diameter/2, heights,
+                                                                  np.maximum(row_counts, 0), x_dim_eff, y_dim_eff))
     
             if dies_per_wafer > best_dies_per_wafer:
                 best_dies_per_wafer = dies_per_wafer
-                best_die_locations = die_locations
+                if return_locations:
+                    best_die_locations = np.concatenate(die_locations)
             left_column_height = left_column_height + 1
     
+        if return_locations:
+            return best_dies_per_wafer, best_die_locations
         return best_dies_per_wafer
     
-    def compute_nogrid_dies_per_wafer(self, x_dim, y_dim, usable_wafer_diameter, dicing_distance):
+    @staticmethod
+    def compute_nogrid_dies_per_wafer(x_dim, y_dim, usable_wafer_diameter, dicing_distance, return_locations=False):
         # This function calculates the number of dies that can be placed on a wafer when
         # vertical alignment (grid) is not required. It considers two primary packing cases.
+        # The rows after the first are computed together as arrays.
+        # With return_locations, the (x, y) locations of the dies are returned too, as an array. Only case 1 has a die
+        # placement, so the locations are None when case 2 is chosen.
         x_dim_eff = x_dim + dicing_distance
         y_dim_eff = y_dim + dicing_distance
+        # Squares are written as products, which are cheaper than pow() and exactly rounded.
+        r_squared = (usable_wafer_diameter/2)*(usable_wafer_diameter/2)
         
         # Case 1: The first row of dies is centered on the wafer's horizontal diameter.
         num_squares_case_1 = 0
-        die_locations_1 = []
         row_chord_height = y_dim_eff/2
-        chord_length = math.sqrt((usable_wafer_diameter/2)**2 - (row_chord_height - dicing_distance/2)**2)*2 + dicing_distance
+        chord_length = math.sqrt(r_squared - (row_chord_height - dicing_distance/2)*(row_chord_height - dicing_distance/2))*2 + dicing_distance
         num_squares_case_1 += math.floor(chord_length/x_dim_eff)
-        for j in range(math.floor(chord_length/x_dim_eff)):
-            x = j*x_dim_eff - chord_length/2
-            y = -1*y_dim_eff/2
-            die_locations_1.append((x, y))
+        first_row_x = np.arange(math.floor(chord_length/x_dim_eff))*x_dim_eff - chord_length/2
         row_chord_height += y_dim_eff
-        # Iterate through subsequent rows above and below the center.
-        while row_chord_height < usable_wafer_diameter/2:
-            chord_length = math.sqrt((usable_wafer_diameter/2)**2 - (row_chord_height - dicing_distance/2)**2)*2 + dicing_distance
-            num_squares_case_1 += 2*math.floor(chord_length/x_dim_eff)
-            for j in range(math.floor(chord_length/x_dim_eff)):
-                x = j*x_dim_eff - chord_length/2
-                y = row_chord_height - y_dim_eff
-                die_locations_1.append((x, y))
-                die_locations_1.append((x, -1*y-y_dim_eff))
-            row_chord_height += y_dim_eff
+        # Subsequent rows above and below the center.
+        heights_1 = Layer.row_heights(row_chord_height, y_dim_eff, usable_wafer_diameter/2)
+        chord_lengths_1 = np.sqrt(r_squared - (heights_1 - dicing_distance/2)*(heights_1 - dicing_distance/2))*2 + dicing_distance
+        row_counts_1 = np.floor(chord_lengths_1/x_dim_eff).astype(np.int64)
+        num_squares_case_1 += 2*int(row_counts_1.sum())
 
         # Case 2: The first two rows of dies are placed just above and below the diameter.
         num_squares_case_2 = 0
-        die_locations_2 = []
         row_chord_height = y_dim_eff
-        chord_length = math.sqrt((usable_wafer_diameter/2)**2 - (row_chord_height - dicing_distance/2)**2)*2 + dicing_distance
+        chord_length = math.sqrt(r_squared - (row_chord_height - dicing_distance/2)*(row_chord_height - dicing_distance/2))*2 + dicing_distance
         num_squares_case_2 += 2*math.floor(chord_length/x_dim_eff)
         row_chord_height += y_dim_eff
-        while row_chord_height < usable_wafer_diameter/2:
-            chord_length = math.sqrt((usable_wafer_diameter/2)**2 - (row_chord_height - dicing_distance/2)**2)*2 + dicing_distance
-            num_squares_case_2 += 2*math.floor(chord_length/x_dim_eff)
-            row_chord_height += y_dim_eff
+        heights_2 = Layer.row_heights(row_chord_height, y_dim_eff, usable_wafer_diameter/2)
+        chord_lengths_2 = np.sqrt(r_squared - (heights_2 - dicing_distance/2)*(heights_2 - dicing_distance/2))*2 + dicing_distance
+        row_counts_2 = np.floor(chord_lengths_2/x_dim_eff).astype(np.int64)
+        num_squares_case_2 += 2*int(row_counts_2.sum())
 
         # Return the maximum number of dies from the two cases considered.
         if num_squares_case_2 > num_squares_case_1:
@@ -1078,9 +1002,20 @@ class Layer:
         else:
             num_squares = num_squares_case_1
         
-        return num_squares
-
-    def compute_dies_per_wafer(self, x_dim, y_dim, usable_wafer_diameter, dicing_distance, grid_fill):
+        if not return_locations:
+            return num_squares
+        if num_squares_case_2 > num_squares_case_1:
+            return num_squares, None
+        first_row = np.column_stack((first_row_x, np.full(first_row_x.shape[0], -1*y_dim_eff/2)))
+        die_locations = np.concatenate((first_row, Layer.mirrored_row_locations(-chord_lengths_1/2, heights_1, row_counts_1,
+                                                                                x_dim_eff, y_dim_eff)))
+        return num_squares, die_locations
+
+    # The same die geometry is placed on the same wafer for every layer of a stackup and for every copy of a chip,
+    # so the result is cached on the geometry instead of repeating the placement search.
+    @staticmethod
+    @functools.lru_cache(maxsize=4096)
+    def compute_dies_per_wafer(x_dim, y_dim, usable_wafer_diameter, dicing_distance, grid_fill):
         # This function computes the number of dies that can fit on a wafer.
         # It can use a simple approximation or a more detailed calculation based on the grid_fill flag.
         simple_equation_flag = False
@@ -1091,13 +1026,20 @@ class Layer:
         else:
             # Use more detailed geometric calculations based on the fill strategy.
             if grid_fill:
-                num_squares = self.compute_grid_dies_per_wafer(x_dim, y_dim, usable_wafer_diameter, dicing_distance)
+                num_squares = Layer.compute_grid_dies_per_wafer(x_dim, y_dim, usable_wafer_diameter, dicing_distance)
             else:
-                num_squares = self.compute_nogrid_dies_per_wafer(x_dim, y_dim, usable_wafer_diameter, dicing_distance)
+                num_squares = Layer.compute_nogrid_dies_per_wafer(x_dim, y_dim, usable_wafer_diameter, dicing_distance)
 
         return num_squares
 
     def compute_cost_per_mm2(self, area, aspect_ratio, wafer_process) -> float:
+        circle_area, used_area = Layer.compute_wafer_areas(area, aspect_ratio, wafer_process)
+        cost_per_mm2 = self.cost_per_mm2*circle_area/used_area
+        return cost_per_mm2
+
+    @staticmethod
+    def compute_wafer_areas(area, aspect_ratio, wafer_process):
+        # The area of the wafer and the area taken by the dies placed on it, which are the same for every layer.
         # Access parameters that will be used multiple times.
         wafer_diameter = wafer_process.wafer_diameter
         grid_fill = wafer_process.wafer_fill_grid
@@ -1110,7 +1052,7 @@ class Layer:
         usable_wafer_diameter = wafer_diameter - 2*wafer_process.edge_exclusion
 
         # Check if the die is too large to fit on the wafer.
-        if (math.sqrt(x_dim**2 + y_dim**2) > usable_wafer_diameter/2):
+        if (math.sqrt(x_dim*x_dim + y_dim*y_dim) > usable_wafer_diameter/2):
             raise CalculationError("Die size is too large for accurate calculation of fit for wafer.")
 
         # Check for zero-sized die dimensions.
@@ -1118,7 +1060,7 @@ class Layer:
             raise CalculationError("Die size is zero.")
 
         # Calculate the number of dies that can be fabricated on a single wafer.
-        dies_per_wafer = self.compute_dies_per_wafer(x_dim, y_dim, usable_wafer_diameter, wafer_process.dicing_distance, grid_fill)
+        dies_per_wafer = Layer.compute_dies_per_wafer(x_dim, y_dim, usable_wafer_diameter, wafer_process.dicing_distance, grid_fill)
 
         if (dies_per_wafer == 0):
             raise CalculationError("Dies per wafer is zero.")
@@ -1126,8 +1068,47 @@ class Layer:
         # Compute the effective cost per mm^2 by distributing the total wafer cost over the area of the good dies.
         used_area = dies_per_wafer*area
         circle_area = math.pi*(wafer_diameter/2)**2
-        cost_per_mm2 = self.cost_per_mm2*circle_area/used_area
-        return cost_per_mm2
+        return circle_area, used_area
+
+@njit(cache=True)
+def stackup_defect_yield(defect_density, critical_area_ratio, clustering_factor, run_lengths, area):
+    # Product of the negative binomial defect yields of all layers in a stackup, taking the per-layer
+    # columns of a LAYER_DTYPE array. Matches multiplying Layer.layer_yield(area) over the layers,
+    # since stitching is not counted there either.
+    # Each record stands for run_lengths[i] consecutive copies of a layer. Its yield is computed once
+    # and multiplied in once per copy, so the product is the same as over the full stackup.
+    stackup_yield = 1.0
+    for i in range(defect_density.shape[0]):
+        layer_yield = (1 + (defect_density[i]*area*critical_area_ratio[i])/clustering_factor[i])**(-1*clustering_factor[i])
+        for _ in range(run_lengths[i]):
+            stackup_yield *= layer_yield
+    return stackup_yield
+
+# Record layout of a stackup array. Each entry of a chip's stackup becomes one record,
+# so per-chip stackup sums run over numpy columns instead of looping over Layer objects.
+LAYER_DTYPE = np.dtype([("active", np.bool_), ("gates_per_mm2", np.float64), ("mask_cost", np.float64),
+                        ("defect_density", np.float64), ("critical_area_ratio", np.float64),
+                        ("clustering_factor", np.float64), ("stitching_yield", np.float64),
+                        ("routing_layer_count", np.float64), ("routing_layer_pitch", np.float64),
+                        ("cost_per_mm2", np.float64), ("litho_percent", np.float64)])
+
+@njit(cache=True)
+def stackup_layer_cost(cost_per_mm2, litho_percent, run_lengths, area, circle_area, used_area, reticle_utilization):
+    # Sum of the layer costs of a stackup, taking the per-layer columns of a LAYER_DTYPE array of runs of identical
+    # layers. Matches adding Layer.layer_cost over every layer for a positive area. The wafer and reticle terms only
+    # depend on the die and the wafer process, so they are computed once by the caller: circle_area and used_area
+    # as in Layer.compute_cost_per_mm2, and the reticle utilization used by the layers with a nonzero litho percent.
+    stackup_cost = 0.0
+    for i in range(cost_per_mm2.shape[0]):
+        layer_cost = area*(cost_per_mm2[i]*circle_area/used_area)
+        if litho_percent[i] == 0.0:
+            layer_reticle_utilization = 1.0
+        else:
+            layer_reticle_utilization = reticle_utilization
+        layer_cost = layer_cost*(1-litho_percent[i]) + (layer_cost*litho_percent[i])/layer_reticle_utilization
+        for _ in range(run_lengths[i]):
+            stackup_cost += layer_cost
+    return stackup_cost
 
 # =========================================
 # Assembly Definition Class
@@ -1173,454 +1154,462 @@ class Layer:
 # =========================================
 
 class Assembly:
+    __slots__ = ('_name', '_materials_cost_per_mm2', '_bb_cost_per_second', '_picknplace_machine_cost',
+                 '_picknplace_machine_lifetime', '_picknplace_machine_uptime',
+                 '_picknplace_technician_yearly_cost', '_picknplace_time', '_picknplace_group',
+                 '_bonding_machine_cost', '_bonding_machine_lifetime', '_bonding_machine_uptime',
+                 '_bonding_technician_yearly_cost', '_bonding_time', '_bonding_group', '_die_separation',
+                 '_edge_exclusion', '_max_pad_current_density', '_bonding_pitch', '_alignment_yield',
+                 '_bonding_yield', '_dielectric_bond_defect_density', '_picknplace_cost_per_second',
+                 '_bonding_cost_per_second', '_tsv_area', '_tsv_yield', '_tsv_pitch', '_static')
+
     @property
     def name(self):
-        return self.__name
+        return self._name
     @name.setter
     def name(self, value):
         if (self.static):
             raise ConfigurationError("Cannot change static assembly process.")
         else:
-            if type(value) != str:
+            if not isinstance(value, str):
                 raise ConfigurationError("Assembly process name must be a string.")
             else:
-                self.__name = value
+                self._name = value
                 return 0
 
     @property
     def materials_cost_per_mm2(self):
-        return self.__materials_cost_per_mm2
+        return self._materials_cost_per_mm2
     @materials_cost_per_mm2.setter
     def materials_cost_per_mm2(self, value):
         if (self.static):
             raise ConfigurationError("Cannot change static assembly process.")
         else:
-            if type(value) not in [int, float, np.float64]:
+            if type(value) not in _NUMERIC_TYPES:
                 raise ConfigurationError("Materials cost per mm^2 must be a number.")
             elif value < 0:
                 raise ConfigurationError("Materials cost per mm^2 must be nonnegative.")
             else:
-                self.__materials_cost_per_mm2 = value
+                self._materials_cost_per_mm2 = value
                 return 0
     
     @property
     def bb_cost_per_second(self):
-        return self.__bb_cost_per_second
+        return self._bb_cost_per_second
     @bb_cost_per_second.setter
     def bb_cost_per_second(self, value):
         if (self.static):
             raise ConfigurationError("Cannot change static assembly process.")
         else:
             if value == None:
-                self.__bb_cost_per_second = value
+                self._bb_cost_per_second = value
                 return 0
-            elif type(value) not in [int, float, np.float64]:
+            elif type(value) not in _NUMERIC_TYPES:
                 raise ConfigurationError("Black-box cost per second must be a number.")
             elif value < 0:
                 raise ConfigurationError("Black-box cost per second must be nonnegative.")
             else:
-                self.__bb_cost_per_second = value
+                self._bb_cost_per_second = value
                 return 0
 
     @property
     def picknplace_machine_cost(self):
-        return self.__picknplace_machine_cost
+        return self._picknplace_machine_cost
     @picknplace_machine_cost.setter
     def picknplace_machine_cost(self, value):
         if (self.static):
             raise ConfigurationError("Cannot change static assembly process.")
         else:
-            if type(value) not in [int, float, np.float64]:
+            if type(value) not in _NUMERIC_TYPES:
                 raise ConfigurationError("Pick and place machine cost must be a number.")
             elif value < 0:
                 raise ConfigurationError("Pick and place machine cost must be nonnegative.")
             else:
-                self.__picknplace_machine_cost = value
+                self._picknplace_machine_cost = value
                 return 0
         
     @property
     def picknplace_machine_lifetime(self):
-        return self.__picknplace_machine_lifetime
+        return self._picknplace_machine_lifetime
     @picknplace_machine_lifetime.setter
     def picknplace_machine_lifetime(self, value):
         if (self.static):
             raise ConfigurationError("Cannot change static assembly process.")
         else:
-            if type(value) not in [int, float, np.float64]:
+            if type(value) not in _NUMERIC_TYPES:
                 raise ConfigurationError("Pick and place machine lifetime must be a number.")
             elif value < 0:
                 raise ConfigurationError("Pick and place machine lifetime must be nonnegative.")
             else:
-                self.__picknplace_machine_lifetime = value
+                self._picknplace_machine_lifetime = value
                 return 0
         
     @property
     def picknplace_machine_uptime(self):
-        return self.__picknplace_machine_uptime
+        return self._picknplace_machine_uptime
     @picknplace_machine_uptime.setter
     def picknplace_machine_uptime(self, value):
         if (self.static):
             raise ConfigurationError("Cannot change static assembly process.")
         else:
-            if type(value) not in [int, float, np.float64]:
+            if type(value) not in _NUMERIC_TYPES:
                 raise ConfigurationError("Pick and place machine uptime must be a number.")
             elif value < 0 or value > 1:
                 raise ConfigurationError("Pick and place machine uptime must be between 0 and 1.")
             else:
-                self.__picknplace_machine_uptime = value
+                self._picknplace_machine_uptime = value
                 return 0
         
     @property
     def picknplace_technician_yearly_cost(self):
-        return self.__picknplace_technician_yearly_cost
+        return self._picknplace_technician_yearly_cost
     @picknplace_technician_yearly_cost.setter
     def picknplace_technician_yearly_cost(self, value):
         if (self.static):
             raise ConfigurationError("Cannot change static assembly process.")
         else:
-            if type(value) not in [int, float, np.float64]:
+            if type(value) not in _NUMERIC_TYPES:
                 raise ConfigurationError("Pick and place technician yearly cost must be a number.")
             elif value < 0:
                 raise ConfigurationError("Pick and place technician yearly cost must be nonnegative.")
             else:
-                self.__picknplace_technician_yearly_cost = value
+                self._picknplace_technician_yearly_cost = value
                 return 0
         
     @property
     def picknplace_time(self):
-        return self.__picknplace_time
+        return self._picknplace_time
     @picknplace_time.setter
     def picknplace_time(self, value):
         if (self.static):
             raise ConfigurationError("Cannot change static assembly process.")
         else:
-            if type(value) not in [int, float, np.float64]:
+            if type(value) not in _NUMERIC_TYPES:
                 raise ConfigurationError("Pick and place time must be a number.")
             elif value < 0:
                 raise ConfigurationError("Pick and place time must be nonnegative.")
             else:
-                self.__picknplace_time = value
+                self._picknplace_time = value
                 return 0
         
     @property
     def picknplace_group(self):
-        return self.__picknplace_group
+        return self._picknplace_group
     @picknplace_group.setter
     def picknplace_group(self, value):
         if (self.static):
             raise ConfigurationError("Cannot change static assembly process.")
         else:
-            if type(value) != int:
+            if type(value) is not int:
                 raise ConfigurationError("Pick and place group must be an integer.")
             elif value <= 0:
-                print(value)
                 raise ConfigurationError("Pick and place group must be positive.")
             else:
-                self.__picknplace_group = value
+                self._picknplace_group = value
                 return 0
         
     @property
     def bonding_machine_cost(self):
-        return self.__bonding_machine_cost
+        return self._bonding_machine_cost
     @bonding_machine_cost.setter
     def bonding_machine_cost(self, value):
         if (self.static):
             raise ConfigurationError("Cannot change static assembly process.")
         else:
-            if type(value) not in [int, float, np.float64]:
+            if type(value) not in _NUMERIC_TYPES:
                 raise ConfigurationError("Bonding machine cost must be a number.")
             elif value < 0:
                 raise ConfigurationError("Bonding machine cost must be nonnegative.")
             else:
-                self.__bonding_machine_cost = value
+                self._bonding_machine_cost = value
                 return 0
         
     @property
     def bonding_machine_lifetime(self):
-        return self.__bonding_machine_lifetime
+        return self._bonding_machine_lifetime
     @bonding_machine_lifetime.setter
     def bonding_machine_lifetime(self, value):
         if (self.static):
             raise ConfigurationError("Cannot change static assembly process.")
         else:
-            if type(value) not in [int, float, np.float64]:
+            if type(value) not in _NUMERIC_TYPES:
                 raise ConfigurationError("Bonding machine lifetime must be a number.")
             elif value < 0:
                 raise ConfigurationError("Bonding machine lifetime must be nonnegative.")
             else:
-                self.__bonding_machine_lifetime = value
+                self._bonding_machine_lifetime = value
                 return 0
         
     @property
     def bonding_machine_uptime(self):
-        return self.__bonding_machine_uptime
+        return self._bonding_machine_uptime
     @bonding_machine_uptime.setter
     def bonding_machine_uptime(self, value):
         if (self.static):
             raise ConfigurationError("Cannot change static assembly process.")
         else:
-            if type(value) not in [int, float, np.float64]:
+            if type(value) not in _NUMERIC_TYPES:
                 raise ConfigurationError("Bonding machine uptime must be a number.")
             elif value < 0 or value > 1:
                 raise ConfigurationError("Bonding machine uptime must be between 0 and 1.")
             else:
-                self.__bonding_machine_uptime = value
+                self._bonding_machine_uptime = value
                 return 0
 
     @property
     def bonding_technician_yearly_cost(self):
-        return self.__bonding_technician_yearly_cost
+        return self._bonding_technician_yearly_cost
     @bonding_technician_yearly_cost.setter
     def bonding_technician_yearly_cost(self, value):
         if (self.static):
             raise ConfigurationError("Cannot change static assembly process.")
         else:
-            if type(value) not in [int, float, np.float64]:
+            if type(value) not in _NUMERIC_TYPES:
                 raise ConfigurationError("Bonding technician yearly cost must be a number.")
             elif value < 0:
                 raise ConfigurationError("Bonding technician yearly cost must be nonnegative.")
             else:
-                self.__bonding_technician_yearly_cost = value
+                self._bonding_technician_yearly_cost = value
                 return 0
 
     @property
     def bonding_time(self):
-        return self.__bonding_time
+        return self._bonding_time
     @bonding_time.setter
     def bonding_time(self, value):
         if (self.static):
             raise ConfigurationError("Cannot change static assembly process.")
         else:
-            if type(value) not in [int, float, np.float64]:
+            if type(value) not in _NUMERIC_TYPES:
                 raise ConfigurationError("Bonding time must be a number.")
             elif value < 0:
                 raise ConfigurationError("Bonding time must be nonnegative.")
             else:
-                self.__bonding_time = value
+                self._bonding_time = value
                 return 0
 
     @property
     def bonding_group(self):
-        return self.__bonding_group
+        return self._bonding_group
     @bonding_group.setter
     def bonding_group(self, value):
         if (self.static):
             raise ConfigurationError("Cannot change static assembly process.")
         else:
-            if type(value) != int:
+            if type(value) is not int:
                 raise ConfigurationError("Bonding group must be an integer.")
             elif value <= 0:
                 raise ConfigurationError("Bonding group must be positive.")
             else:
-                self.__bonding_group = value
+                self._bonding_group = value
                 return 0
 
     @property
     def die_separation(self):
-        return self.__die_separation
+        return self._die_separation
     @die_separation.setter
     def die_separation(self, value):
         if (self.static):
             raise ConfigurationError("Cannot change static assembly process.")
         else:
-            if type(value) not in [int, float, np.float64]:
+            if type(value) not in _NUMERIC_TYPES:
                 raise ConfigurationError("Die separation must be a number.")
             elif value < 0:
                 raise ConfigurationError("Die separation must be nonnegative.")
             else:
-                self.__die_separation = value
+                self._die_separation = value
                 return 0
 
     @property
     def edge_exclusion(self):
-        return self.__edge_exclusion
+        return self._edge_exclusion
     @edge_exclusion.setter
     def edge_exclusion(self, value):
         if (self.static):
             raise ConfigurationError("Cannot change static assembly process.")
         else:
-            if type(value) not in [int, float, np.float64]:
+            if type(value) not in _NUMERIC_TYPES:
                 raise ConfigurationError("Edge exclusion must be a number.")
             elif value < 0:
                 raise ConfigurationError("Edge exclusion must be nonnegative.")
             else:
-                self.__edge_exclusion = value
+                self._edge_exclusion = value
                 return 0
 
     @property
     def max_pad_current_density(self):
-        return self.__max_pad_current_density
+        return self._max_pad_current_density
     @max_pad_current_density.setter
     def max_pad_current_density(self, value):
         if (self.static):
             raise ConfigurationError("Cannot change static assembly process.")
         else:
-            if type(value) not in [int, float, np.float64]:
+            if type(value) not in _NUMERIC_TYPES:
                 raise ConfigurationError("Max pad current density must be a number.")
             elif value < 0:
                 raise ConfigurationError("Max pad current density must be nonnegative.")
             else:
-                self.__max_pad_current_density = value
+                self._max_pad_current_density = value
                 return 0
 
     @property
     def bonding_pitch(self):
-        return self.__bonding_pitch
+        return self._bonding_pitch
     @bonding_pitch.setter
     def bonding_pitch(self, value):
         if (self.static):
             raise ConfigurationError("Cannot change static assembly process.")
         else:
-            if type(value) not in [int, float, np.float64]:
+            if type(value) not in _NUMERIC_TYPES:
                 raise ConfigurationError("Bonding pitch must be a number.")
             elif value < 0:
                 raise ConfigurationError("Bonding pitch must be nonnegative.")
             else:
-                self.__bonding_pitch = value
+                self._bonding_pitch = value
                 return 0
 
     @property
     def alignment_yield(self):
-        return self.__alignment_yield
+        return self._alignment_yield
     @alignment_yield.setter
     def alignment_yield(self, value):
         if (self.static):
             raise ConfigurationError("Cannot change static assembly process.")
         else:
-            if type(value) not in [int, float, np.float64]:
+            if type(value) not in _NUMERIC_TYPES:
                 raise ConfigurationError("Alignment yield must be a number.")
             elif value < 0 or value > 1:
                 raise ConfigurationError("Alignment yield must be between 0 and 1.")
             else:
-                self.__alignment_yield = value
+                self._alignment_yield = value
                 return 0
 
     @property
     def bonding_yield(self):
-        return self.__bonding_yield
+        return self._bonding_yield
     @bonding_yield.setter
     def bonding_yield(self, value):
         if (self.static):
             raise ConfigurationError("Cannot change static assembly process.")
         else:
-            if type(value) not in [int, float, np.float64]:
+            if type(value) not in _NUMERIC_TYPES:
                 raise ConfigurationError("Bonding yield must be a number.")
             elif value < 0 or value > 1:
                 raise ConfigurationError("Bonding yield must be between 0 and 1.")
             else:
-                self.__bonding_yield = value
+                self._bonding_yield = value
                 return 0
 
     @property
     def dielectric_bond_defect_density(self):
-        return self.__dielectric_bond_defect_density
+        return self._dielectric_bond_defect_density
     @dielectric_bond_defect_density.setter
     def dielectric_bond_defect_density(self, value):
         if (self.static):
             raise ConfigurationError("Cannot change static assembly process.")
         else:
-            if type(value) not in [int, float, np.float64]:
+            if type(value) not in _NUMERIC_TYPES:
                 raise ConfigurationError("Dielectric bond defect density must be a number.")
             elif value < 0:
                 raise ConfigurationError("Dielectric bond defect density must be nonnegative.")
             else:
-                self.__dielectric_bond_defect_density = value
+                self._dielectric_bond_defect_density = value
                 return 0
 
     @property
     def static(self):
-        return self.__static
+        return self._static
     @static.setter
     def static(self, value):
-        self.__static = value
+        self._static = value
 
     @property
     def picknplace_cost_per_second(self):
-        return self.__picknplace_cost_per_second
+        return self._picknplace_cost_per_second
     @picknplace_cost_per_second.setter
     def picknplace_cost_per_second(self, value):
         if (self.static):
             raise ConfigurationError("Cannot change static assembly process.")
         else:
             if value is None:
-                self.__picknplace_cost_per_second = None
+                self._picknplace_cost_per_second = None
                 return 0
-            elif type(value) not in [int, float, np.float64]:
+            elif type(value) not in _NUMERIC_TYPES:
                 raise ConfigurationError("Pick and place cost per second must be a number.")
             elif value < 0:
                 raise ConfigurationError("Pick and place cost per second must be nonnegative.")
             else:
-                self.__picknplace_cost_per_second = value
+                self._picknplace_cost_per_second = value
                 return 0
             
     @property
     def bonding_cost_per_second(self):
-        return self.__bonding_cost_per_second
+        return self._bonding_cost_per_second
     @bonding_cost_per_second.setter
     def bonding_cost_per_second(self, value):
         if (self.static):
             raise ConfigurationError("Cannot change static assembly process.")
         else:
             if value is None:
-                self.__bonding_cost_per_second = None
+                self._bonding_cost_per_second = None
                 return 0
-            elif type(value) not in [int, float, np.float64]:
+            elif type(value) not in _NUMERIC_TYPES:
                 raise ConfigurationError("Bonding cost per second must be a number.")
             elif value < 0:
                 raise ConfigurationError("Bonding cost per second must be nonnegative.")
             else:
-                self.__bonding_cost_per_second = value
+                self._bonding_cost_per_second = value
                 return 0
 
     @property
     def tsv_area(self):
-        return self.__tsv_area
+        return self._tsv_area
 
     @tsv_area.setter
     def tsv_area(self, value):
         if self.static:
             raise ConfigurationError("Cannot change static assembly process.")
         else:
-            if value is not None and type(value) not in [int, float]:
+            if value is not None and type(value) not in _NUMERIC_TYPES:
                 raise ConfigurationError("TSV area must be a number or None.")
             elif value is not None and value < 0:
                 raise ConfigurationError("TSV area must be nonnegative.")
             else:
-                self.__tsv_area = value
+                self._tsv_area = value
                 return 0
 
     @property
     def tsv_yield(self):
-        return self.__tsv_yield
+        return self._tsv_yield
 
     @tsv_yield.setter
     def tsv_yield(self, value):
         if self.static:
             raise ConfigurationError("Cannot change static assembly process.")
         else:
-            if value is not None and type(value) not in [int, float]:
+            if value is not None and type(value) not in _NUMERIC_TYPES:
                 raise ConfigurationError("TSV yield must be a number or None.")
             elif value is not None and (value < 0 or value > 1):
                 raise ConfigurationError("TSV yield must be between 0 and 1.")
             else:
-                self.__tsv_yield = value
+                self._tsv_yield = value
                 return 0
 
     @property
     def tsv_pitch(self):
-        return self.__tsv_pitch
+        return self._tsv_pitch
 
     @tsv_pitch.setter
     def tsv_pitch(self, value):
         if self.static:
             raise ConfigurationError("Cannot change static assembly process.")
         else:
-            if value is not None and type(value) not in [int, float]:
+            if value is not None and type(value) not in _NUMERIC_TYPES:
                 raise ConfigurationError("TSV pitch must be a number or None.")
             elif value is not None and value < 0:
                 raise ConfigurationError("TSV pitch must be nonnegative.")
             else:
-                self.__tsv_pitch = value
+                self._tsv_pitch = value
                 return 0
     
     def __init__(self, name = "", materials_cost_per_mm2 = None, bb_cost_per_second = None, picknplace_machine_cost = None,
@@ -1857,372 +1846,381 @@ class Assembly:
 #   get_atpg_cost(chip): Calculates the Automatic Test Pattern Generation (ATPG) cost.
 # =========================================
 class Test:
+    __slots__ = ('_name', '_time_per_test_cycle', '_cost_per_second', '_samples_per_input',
+                 '_test_self', '_bb_self_pattern_count', '_bb_self_scan_chain_length',
+                 '_self_defect_coverage', '_self_test_reuse', '_self_num_scan_chains',
+                 '_self_num_io_per_scan_chain', '_self_num_test_io_offset', '_self_test_failure_dist',
+                 '_test_assembly', '_bb_assembly_pattern_count', '_bb_assembly_scan_chain_length',
+                 '_assembly_defect_coverage', '_assembly_test_reuse', '_assembly_num_scan_chains',
+                 '_assembly_num_io_per_scan_chain', '_assembly_num_test_io_offset',
+                 '_assembly_test_failure_dist', '_static')
+
     @property
     def name(self):
-        return self.__name
+        return self._name
     @name.setter
     def name(self, value):
         if (self.static):
             raise ConfigurationError("Cannot change static testing.")
         else:
-            if type(value) != str:
+            if not isinstance(value, str):
                 raise ConfigurationError("Test name must be a string.")
             else:
-                self.__name = value
+                self._name = value
                 return 0
 
     @property
     def time_per_test_cycle(self):
-        return self.__time_per_test_cycle
+        return self._time_per_test_cycle
     @time_per_test_cycle.setter
     def time_per_test_cycle(self, value):
         if (self.static):
             raise ConfigurationError("Cannot change static testing.")
         else:
-            if type(value) not in [int, float, np.float64]:
+            if type(value) not in _NUMERIC_TYPES:
                 raise ConfigurationError("Time per test cycle must be a number.")
             elif value < 0:
                 raise ConfigurationError("Time per test cycle must be nonnegative.")
             else:
-                self.__time_per_test_cycle = value
+                self._time_per_test_cycle = value
                 return 0
 
     @property
     def cost_per_second(self):
-        return self.__cost_per_second
+        return self._cost_per_second
     @cost_per_second.setter
     def cost_per_second(self, value):
         if (self.static):
             raise ConfigurationError("Cannot change static testing.")
         else:
-            if type(value) not in [int, float, np.float64]:
+            if type(value) not in _NUMERIC_TYPES:
                 raise ConfigurationError("Cost per second must be a number.")
             elif value < 0:
                 raise ConfigurationError("Cost per second must be nonnegative.")
             else:
-                self.__cost_per_second = value
+                self._cost_per_second = value
                 return 0
 
     @property
     def samples_per_input(self):
-        return self.__samples_per_input
+        return self._samples_per_input
     @samples_per_input.setter
     def samples_per_input(self, value):
         if (self.static):
             raise ConfigurationError("Cannot change static testing.")
         else:
-            if type(value) != int:
+            if type(value) is not int:
                 raise ConfigurationError("Samples per input must be an integer.")
             elif value < 0:
                 raise ConfigurationError("Samples per input must be nonnegative.")
             else:
-                self.__samples_per_input = value
+                self._samples_per_input = value
                 return 0
 
     @property
     def test_self(self):
-        return self.__test_self
+        return self._test_self
     @test_self.setter
     def test_self(self, value):
         if (self.static):
             raise ConfigurationError("Cannot change static testing.")
         else:
-            if type(value) != str:
+            if not isinstance(value, str):
                 raise ConfigurationError("Test self must be a string either \"True\" or \"true\".")
             else:
                 if value.lower() == "true":
-                    self.__test_self = True
+                    self._test_self = True
                 else:
-                    self.__test_self = False
+                    self._test_self = False
                 return 0
         
     @property
     def bb_self_pattern_count(self):
-        return self.__bb_self_pattern_count
+        return self._bb_self_pattern_count
     @bb_self_pattern_count.setter
     def bb_self_pattern_count(self, value):
         if (self.static):
             raise ConfigurationError("Cannot change static testing.")
         else:
             if value is None or value == "":
-                self.__bb_self_pattern_count = None
+                self._bb_self_pattern_count = None
                 return 0
-            elif type(value) not in [int, float, np.float64]:
+            elif type(value) not in _NUMERIC_TYPES:
                 raise ConfigurationError("BB self pattern count must be a number.")
             elif value < 0:
                 raise ConfigurationError("BB self pattern count must be nonnegative.")
             else:
-                self.__bb_self_pattern_count = value
+                self._bb_self_pattern_count = value
                 return 0
         
     @property
     def bb_self_scan_chain_length(self):
-        return self.__bb_self_scan_chain_length
+        return self._bb_self_scan_chain_length
     @bb_self_scan_chain_length.setter
     def bb_self_scan_chain_length(self, value):
         if (self.static):
             raise ConfigurationError("Cannot change static testing.")
         else:
             if value is None or value == "":
-                self.__bb_self_scan_chain_length = None
+                self._bb_self_scan_chain_length = None
                 return 0
-            elif type(value) not in [int, float, np.float64]:
+            elif type(value) not in _NUMERIC_TYPES:
                 raise ConfigurationError("BB self scan chain length must be a number.")
             elif value < 0:
                 raise ConfigurationError("BB self scan chain length must be nonnegative.")
             else:
-                self.__bb_self_scan_chain_length = value
+                self._bb_self_scan_chain_length = value
                 return 0
         
     @property
     def self_defect_coverage(self):
-        return self.__self_defect_coverage
+        return self._self_defect_coverage
     @self_defect_coverage.setter
     def self_defect_coverage(self, value):
         if (self.static):
             raise ConfigurationError("Cannot change static testing.")
         else:
-            if type(value) not in [int, float, np.float64]:
+            if type(value) not in _NUMERIC_TYPES:
                 raise ConfigurationError("Self defect coverage must be a number.")
             elif value < 0 or value > 1:
                 raise ConfigurationError("Self defect coverage must be between 0 and 1.")
             else:
-                self.__self_defect_coverage = value
+                self._self_defect_coverage = value
                 return 0
 
     @property
     def self_test_reuse(self):
-        return self.__self_test_reuse
+        return self._self_test_reuse
     @self_test_reuse.setter
     def self_test_reuse(self, value):
         if (self.static):
             raise ConfigurationError("Cannot change static testing.")
         else:
-            if type(value) not in [int, float, np.float64]:
+            if type(value) not in _NUMERIC_TYPES:
                 raise ConfigurationError("Self test reuse must be a number.")
             elif value < 0:
                 raise ConfigurationError("Self test reuse must be nonnegative.")
             else:
-                self.__self_test_reuse = value
+                self._self_test_reuse = value
                 return 0
 
     @property
     def self_num_scan_chains(self):
-        return self.__self_num_scan_chains
+        return self._self_num_scan_chains
     @self_num_scan_chains.setter
     def self_num_scan_chains(self, value):
         if (self.static):
             raise ConfigurationError("Cannot change static testing.")
         else:
-            if type(value) != int:
+            if type(value) is not int:
                 raise ConfigurationError("Self num scan chains must be an integer.")
             elif value < 0:
                 raise ConfigurationError("Self num scan chains must be nonnegative.")
             else:
-                self.__self_num_scan_chains = value
+                self._self_num_scan_chains = value
                 return 0
 
     @property
     def self_num_io_per_scan_chain(self):
-        return self.__self_num_io_per_scan_chain
+        return self._self_num_io_per_scan_chain
     @self_num_io_per_scan_chain.setter
     def self_num_io_per_scan_chain(self, value):
         if (self.static):
             raise ConfigurationError("Cannot change static testing.")
         else:
-            if type(value) != int:
+            if type(value) is not int:
                 raise ConfigurationError("Self num IO per scan chain must be an integer.")
             elif value < 0:
                 raise ConfigurationError("Self num IO per scan chain must be nonnegative.")
             else:
-                self.__self_num_io_per_scan_chain = value
+                self._self_num_io_per_scan_chain = value
                 return 0
 
     @property
     def self_num_test_io_offset(self):
-        return self.__self_num_test_io_offset
+        return self._self_num_test_io_offset
     @self_num_test_io_offset.setter
     def self_num_test_io_offset(self, value):
         if (self.static):
             raise ConfigurationError("Cannot change static testing.")
         else:
-            if type(value) != int:
+            if type(value) is not int:
                 raise ConfigurationError("Self num test IO offset must be an integer.")
             elif value < 0:
                 raise ConfigurationError("Self num test IO offset must be nonnegative.")
             else:
-                self.__self_num_test_io_offset = value
+                self._self_num_test_io_offset = value
                 return 0
 
     @property
     def self_test_failure_dist(self):
-        return self.__self_test_failure_dist
+        return self._self_test_failure_dist
     @self_test_failure_dist.setter
     def self_test_failure_dist(self, value):
         if (self.static):
             raise ConfigurationError("Cannot change static testing.")
         else:
-            if type(value) != str:
+            if not isinstance(value, str):
                 raise ConfigurationError("Self test failure dist must be a string.")
             else:
-                self.__self_test_failure_dist = value
+                self._self_test_failure_dist = value
                 return 0
         
     @property
     def test_assembly(self):
-        return self.__test_assembly
+        return self._test_assembly
     @test_assembly.setter
     def test_assembly(self, value):
         if (self.static):
             raise ConfigurationError("Cannot change static testing.")
         else:
-            if type(value) != str:
+            if not isinstance(value, str):
                 raise ConfigurationError("Test assembly must be a string either \"True\" or \"true\".")
             else:
                 if value.lower() == "true":
-                    self.__test_assembly = True
+                    self._test_assembly = True
                 else:
-                    self.__test_assembly = False
+                    self._test_assembly = False
                 return 0
         
     @property
     def bb_assembly_pattern_count(self):
-        return self.__bb_assembly_pattern_count
+        return self._bb_assembly_pattern_count
     @bb_assembly_pattern_count.setter
     def bb_assembly_pattern_count(self, value):
         if (self.static):
             raise ConfigurationError("Cannot change static testing.")
         else:
             if value is None or value == "":
-                self.__bb_assembly_pattern_count = None
+                self._bb_assembly_pattern_count = None
                 return 0
-            elif type(value) not in [int, float, np.float64]:
+            elif type(value) not in _NUMERIC_TYPES:
                 raise ConfigurationError("BB assembly pattern count must be a number.")
             elif value < 0:
                 raise ConfigurationError("BB assembly pattern count must be nonnegative.")
             else:
-                self.__bb_assembly_pattern_count = value
+                self._bb_assembly_pattern_count = value
                 return 0
         
     @property
     def bb_assembly_scan_chain_length(self):
-        return self.__bb_assembly_scan_chain_length
+        return self._bb_assembly_scan_chain_length
     @bb_assembly_scan_chain_length.setter
     def bb_assembly_scan_chain_length(self, value):
         if (self.static):
             raise ConfigurationError("Cannot change static testing.")
         else:
             if value is None or value == "":
-                self.__bb_assembly_scan_chain_length = None
+                self._bb_assembly_scan_chain_length = None
                 return 0
-            elif type(value) not in [int, float, np.float64]:
+            elif type(value) not in _NUMERIC_TYPES:
                 raise ConfigurationError("BB assembly scan chain length must be a number.")
             elif value < 0:
                 raise ConfigurationError("BB assembly scan chain length must be nonnegative.")
             else:
-                self.__bb_assembly_scan_chain_length = value
+                self._bb_assembly_scan_chain_length = value
                 return 0
         
     @property
     def assembly_defect_coverage(self):
-        return self.__assembly_defect_coverage
+        return self._assembly_defect_coverage
     @assembly_defect_coverage.setter
     def assembly_defect_coverage(self, value):
         if (self.static):
             raise ConfigurationError("Cannot change static testing.")
         else:
-            if type(value) not in [int, float, np.float64]:
+            if type(value) not in _NUMERIC_TYPES:
                 raise ConfigurationError("Assembly defect coverage must be a number.")
             elif value < 0 or value > 1:
                 raise ConfigurationError("Assembly defect coverage must be between 0 and 1.")
             else:
-                self.__assembly_defect_coverage = value
+                self._assembly_defect_coverage = value
                 return 0
         
     @property
     def assembly_test_reuse(self):
-        return self.__assembly_test_reuse
+        return self._assembly_test_reuse
     @assembly_test_reuse.setter
     def assembly_test_reuse(self, value):
         if (self.static):
             raise ConfigurationError("Cannot change static testing.")
         else:
-            if type(value) not in [int, float, np.float64]:
+            if type(value) not in _NUMERIC_TYPES:
                 raise ConfigurationError("Assembly test reuse must be a number.")
             elif value < 0:
                 raise ConfigurationError("Assembly test reuse must be nonnegative.")
             else:
-                self.__assembly_test_reuse = value
+                self._assembly_test_reuse = value
                 return 0
         
     @property
     def assembly_num_scan_chains(self):
-        return self.__assembly_num_scan_chains
+        return self._assembly_num_scan_chains
     @assembly_num_scan_chains.setter
     def assembly_num_scan_chains(self, value):
         if (self.static):
             raise ConfigurationError("Cannot change static testing.")
         else:
-            if type(value) != int:
+            if type(value) is not int:
                 raise ConfigurationError("Assembly num scan chains must be an integer.")
             elif value < 0:
                 raise ConfigurationError("Assembly num scan chains must be nonnegative.")
             else:
-                self.__assembly_num_scan_chains = value
+                self._assembly_num_scan_chains = value
                 return 0
         
     @property
     def assembly_num_io_per_scan_chain(self):
-        return self.__assembly_num_io_per_scan_chain
+        return self._assembly_num_io_per_scan_chain
     @assembly_num_io_per_scan_chain.setter
     def assembly_num_io_per_scan_chain(self, value):
         if (self.static):
             raise ConfigurationError("Cannot change static testing.")
         else:
-            if type(value) != int:
+            if type(value) is not int:
                 raise ConfigurationError("Assembly num IO per scan chain must be an integer.")
             elif value < 0:
                 raise ConfigurationError("Assembly num IO per scan chain must be nonnegative.")
             else:
-                self.__assembly_num_io_per_scan_chain = value
+                self._assembly_num_io_per_scan_chain = value
                 return 0
         
     @property
     def assembly_num_test_io_offset(self):
-        return self.__assembly_num_test_io_offset
+        return self._assembly_num_test_io_offset
     @assembly_num_test_io_offset.setter
     def assembly_num_test_io_offset(self, value):
         if (self.static):
             raise ConfigurationError("Cannot change static testing.")
         else:
-            if type(value) != int:
+            if type(value) is not int:
                 raise ConfigurationError("Assembly num test IO offset must be an integer.")
             elif value < 0:
                 raise ConfigurationError("Assembly num test IO offset must be nonnegative.")
             else:
-                self.__assembly_num_test_io_offset = value
+                self._assembly_num_test_io_offset = value
                 return 0
 
     @property
     def assembly_test_failure_dist(self):
-        return self.__assembly_test_failure_dist
+        return self._assembly_test_failure_dist
     @assembly_test_failure_dist.setter
     def assembly_test_failure_dist(self, value):
         if (self.static):
             raise ConfigurationError("Cannot change static testing.")
         else:
-            if type(value) != str:
+            if not isinstance(value, str):
                 raise ConfigurationError("Assembly test failure dist must be a string.")
             else:
-                self.__assembly_test_failure_dist = value
+                self._assembly_test_failure_dist = value
                 return 0
 
     @property
     def static(self):
-        return self.__static
+        return self._static
     @static.setter
     def static(self, value):
-        self.__static = value
+        self._static = value
         return 0
     
     def __init__(self, name = None,
@@ -2430,8 +2428,7 @@ class Test:
         else:
             # Estimate based on the average gate-to-flop ratio of the entire assembly.
             # TODO: Evaluate this model and determine accuracy. This is a heuristic.
-            gate_flop_ratio = self.assembly_gate_flop_ratio(chip)
-            wires_per_flop = 3*gate_flop_ratio/2
+            wires_per_flop = 3*chip.assembly_gate_flop_ratio/2
             assembly_pattern_count = 2**wires_per_flop
             return assembly_pattern_count
 
@@ -2441,7 +2438,7 @@ class Test:
             return self.bb_assembly_scan_chain_length
         else:
             # Estimate based on the flops in the entire assembly.
-            assembly_scan_chain_length = chip.get_assembly_gates_per_mm2()/self.assembly_gate_flop_ratio(chip)
+            assembly_scan_chain_length = chip.get_assembly_gates_per_mm2()/chip.assembly_gate_flop_ratio
             assembly_scan_chain_length = assembly_scan_chain_length/self.assembly_num_scan_chains
             return assembly_scan_chain_length
 
@@ -2497,365 +2494,467 @@ class Test:
         return 0.0
 
 # =========================================
-# Chip Class
+# Chip Definition Parsing
 # =========================================
-# The class has attributes:
-#   name: The name of the chip.
-#   core_area: The area of the core in mm^2.
-#   aspect_ratio: The aspect ratio (x/y) of the chip.
-#   x_location, y_location: The coordinates of the chip in a larger assembly.
-#   orientation: Orientation has two valid values: "face-up" and "face-down".
-#                These are relative orientations to the parent Chip.
-#                "face-down" means the Chip has the metal layer side facing the parent Chip.
-#                "face-up" means the Chip has the silicon side facing the parent Chip.
-#                orientation of the root Chip will determine the orientation of the entire assembly for display purposes.
-#   stack_side: Stack side has two valid values: "face" and "back".
-#                This indicates which side of the parent Chip the Chip is stacked on.
-#   bb_area, bb_cost, bb_quality, bb_power: Black-box override values.
-#   fraction_memory, fraction_logic, fraction_analog: The proportions of different circuit types.
-#   gate_flop_ratio: The ratio of logic gates to flip-flops.
-#   reticle_share: The fraction of the reticle cost this chip is responsible for.
-#   buried: Boolean indicating if the chip is buried (e.g., a bridge die).
-#   chips: A list of Chip objects that are stacked on this chip.
-#   assembly_process: The Assembly object used to assemble this chip.
-#   test_process: The Test object used for testing.
-#   stackup: A list of Layer objects defining the chip's vertical structure.
-#   wafer_process: The WaferProcess object for this chip's fabrication.
-#   core_voltage: The operating voltage of the chip core.
-#   power: The intrinsic power consumption of the chip core in Watts.
-#   quantity: The number of chips to be produced.
-#   static: A boolean to lock the object from further changes.
-#   parent_chip: A reference to the parent Chip object in a hierarchy.
-#   (and many more calculated attributes like cost, yield, quality, etc.)
+# chip_definition_from_etree(etree) walks a chip element of the system definition once and returns nested dictionaries:
+#   attributes: A plain dict of the chip's XML attributes.
+#   face_chips, back_chips: The definitions of the chips stacked on the face and back of this chip.
+# Chip.__init__ reads these dictionaries, so every attribute lookup is a single dict access and the
+# element tree is not scanned again while the hierarchy is built.
+# The dictionaries hold only strings and lists, so they can be stored as JSON and loaded without parsing XML:
+#   compile_chip_definition(xml_filename): Writes the definition to xml_filename + ".json" with the XML modification time.
+#   chip_definition_from_file(filename): Loads a compiled ".json" file directly. For an XML file it uses the compiled
+#       file next to it when that file was compiled from the current version of the XML, and parses the XML otherwise.
+#   current_compiled_chip_definition(filename): The compiled definition used for the XML file filename, or None.
 # =========================================
-# The class has the following methods:
-#   __init__(...): Initializes the Chip object from file or etree, recursively building sub-chips.
-#   (Numerous @property and @setter methods for all attributes)
-#   set_static(): Locks the chip object.
+def chip_definition_from_etree(etree):
+    definition = {"attributes": dict(etree.attrib), "face_chips": [], "back_chips": []}
+    for child in etree:
+        if "chip" in child.tag:
+            stack_side = child.attrib.get("stack_side")
+            # Chips without a valid stack side are not part of the stack.
+            if stack_side == "face":
+                definition["face_chips"].append(chip_definition_from_etree(child))
+            elif stack_side == "back":
+                definition["back_chips"].append(chip_definition_from_etree(child))
+    return definition
+
+def compile_chip_definition(xml_filename, json_filename = None):
+    if json_filename is None:
+        json_filename = xml_filename + ".json"
+    definition = chip_definition_from_etree(ET.parse(xml_filename).getroot())
+    compiled = {"source_mtime_ns": os.stat(xml_filename).st_mtime_ns, "definition": definition}
+    with open(json_filename, "w") as f:
+        json.dump(compiled, f)
+    return json_filename
+
+def current_compiled_chip_definition(filename):
+    # The compiled definition chip_definition_from_file uses for the XML file filename, or None if there is none
+    # or it is older than an edit of the XML.
+    compiled_filename = filename + ".json"
+    if os.path.exists(compiled_filename):
+        with open(compiled_filename) as f:
+            compiled = json.load(f)
+        if compiled.get("source_mtime_ns") == os.stat(filename).st_mtime_ns:
+            return compiled["definition"]
+    return None
+
+def chip_definition_from_file(filename):
+    if filename.endswith(".json"):
+        with open(filename) as f:
+            return json.load(f)["definition"]
+    compiled = current_compiled_chip_definition(filename)
+    if compiled is not None:
+        return compiled
+    return chip_definition_from_etree(ET.parse(filename).getroot())
+
+@njit(cache=True)
+def pad_grid(reaches, counts, area_per_pad, bonding_pitch, die_separation, aspect_ratio, under_stacked_chip_area, num_pads):
+    # The pad grid (pads along x, pads along y) of a chip for Chip.get_pad_area. reaches holds the distinct signal reaches
+    # in increasing order and counts the number of signals with each reach. The bounds of the chip grow reach by reach
+    # until the signals of that reach fit in the band within the reach from the edge, then grow to fit all num_pads pads.
+    # Every reach must be at least die_separation.
+    #current_side = 0.0
+    current_x = 0.0
+    current_y = 0.0
+    current_count = 0.0
+    # Loop invariant part of the bound formula below.
+    y_denominator = 2*aspect_ratio + 2
+    for i in range(reaches.shape[0]):
+        # Note that half of the reach with separation value is the valid placement band.
+        reach_with_separation = reaches[i] - die_separation
+        current_count += counts[i]
+        # Find the minimum boundary that would contain all the pads with the current reach.
+        required_area = current_count*area_per_pad + under_stacked_chip_area
+        if reach_with_separation < current_x and reach_with_separation < current_y: 
+            #usable_area = 2*reach_with_separation*current_side - reach_with_separation**2
+            # x*(reach_with_separation/2) is the placement band along a single edge.
+            usable_area = reach_with_separation*(current_x+current_y) - reach_with_separation*reach_with_separation
+        else:
+            #usable_area = current_side**2
+            usable_area = current_x*current_y
+        if usable_area <= required_area:
+            # Note that required_x and required_y are minimum. The real values are likely larger.
+            required_x = math.sqrt(required_area*aspect_ratio)
+            required_y = math.sqrt(required_area/aspect_ratio)
+            if required_x > reach_with_separation and required_y > reach_with_separation:
+                # Work for computing the formulas below:
+                # required_area = 2*(new_req_x - (reach_with_separation/2)) * (reach_with_separation/2) + 2*(new_req_y - (reach_with_separation/2)) * (reach_with_separation/2)
+                # required_area = (2*new_req_x - reach_with_separation) * (reach_with_separation/2) + (2*new_req_y - reach_with_separation) * (reach_with_separation/2)
+                # required_area = (2*new_req_x + 2*new_req_y - 2*reach_with_separation) * (reach_with_separation/2)
+                # new_req_x = aspect_ratio*new_req_y
+                # 2*aspect_ratio*new_req_y + 2*new_req_y = (2*required_area/reach_with_separation) + 2*reach_with_separation
+                # new_req_y*(2*aspect_ratio + 2) = (2*required_area/reach_with_separation) + 2*reach_with_separation
+                # new_req_y = ((2*required_area/reach_with_separation) + 2*reach_with_separation)/(2*aspect_ratio + 2)
+                new_req_y = ((2*required_area/reach_with_separation) + 2*reach_with_separation)/y_denominator
+                new_req_x = aspect_ratio*new_req_y
+            else:
+                new_req_x = required_x
+                new_req_y = required_y
+            # Round up to the nearest multiple of bonding pitch.
+            new_req_x = math.ceil(new_req_x/bonding_pitch)*bonding_pitch
+            new_req_y = math.ceil(new_req_y/bonding_pitch)*bonding_pitch
+            if new_req_x > current_x:
+                current_x = new_req_x
+            if new_req_y > current_y:
+                current_y = new_req_y
+
+    # TODO: This is not strictly accurate. The aspect ratio requirement may break down when the chip becomes pad limited.
+    #       Consider updating this if the connected placement tool does not account for pad area.
+    required_area = area_per_pad * num_pads #current_x * current_y #current_side**2
+    if required_area <= current_x*current_y:
+        grid_x = math.ceil(current_x / bonding_pitch)
+        grid_y = math.ceil(current_y / bonding_pitch)
+    else:
+        # Expand shorter side until sides are the same length, then expand both.
+        if current_x < current_y:
+            # Y is larger
+            if current_y*current_y <= required_area:
+                grid_y = math.ceil(current_y / bonding_pitch)
+                grid_x = math.ceil((required_area/current_y) / bonding_pitch)
+            else:
+                required_side = math.sqrt(required_area)
+                grid_x = math.ceil(required_side / bonding_pitch)
+                grid_y = grid_x
+        elif current_y < current_x:
+            # X is larger
+            if current_x*current_x <= required_area:
+                grid_x = math.ceil(current_x / bonding_pitch)
+                grid_y = math.ceil((required_area/current_x) / bonding_pitch)
+            else:
+                required_side = math.sqrt(required_area)
+                grid_x = math.ceil(required_side / bonding_pitch)
+                grid_y = grid_x
+        else:
+            # Both are the same size
+            required_side = math.sqrt(required_area)
+            grid_x = math.ceil(required_side / bonding_pitch)
+            grid_y = grid_x
+
+    return grid_x, grid_y
+
+# =========================================
+# IO Table Class
+# =========================================
+# The parameters of a list of IO definitions as one array per parameter, so the IO area and signal power of a chip
+# are computed for all IO types at once instead of reading the attributes of each IO object.
+# The class has attributes:
+#   ios: The IO objects, in the order of the rows.
+#   rx_area, tx_area, shoreline, bandwidth, wire_count, energy_per_bit, reach: float64 arrays of the IO parameters.
+#   bidirectional: bool array, True for the bidirectional IOs.
+# =========================================
+class IOTable:
+    __slots__ = ('ios', 'rx_area', 'tx_area', 'shoreline', 'bandwidth', 'wire_count', 'energy_per_bit', 'reach',
+                 'bidirectional')
+
+    def __init__(self, ios) -> None:
+        self.ios = ios
+        count = len(ios)
+        for column in IOTable.__slots__[1:-1]:
+            setattr(self, column, np.fromiter((getattr(io, column) for io in ios), dtype=np.float64, count=count))
+        self.bidirectional = np.fromiter((io.bidirectional for io in ios), dtype=np.bool_, count=count)
+
+# =========================================
+# Netlist Arrays Class
+# =========================================
+# The global adjacency matrix and the average bandwidth utilization are dicts of (blocks x blocks) matrices keyed by IO type.
+# NetlistArrays stacks them into (IO types x blocks x blocks) arrays, so a chip reads the row and column of its block
+# for every IO type in one indexing operation instead of one per IO type.
+# The class has attributes:
+#   io_types: The IO types in the order of the global adjacency matrix dict.
+#   adjacency: The stacked adjacency matrices. adjacency[t, i, j] is the number of IOs of type t from block i to block j.
+#   adjacency_transposed: The same matrices transposed, so the column of a block is a contiguous row.
+#   symmetric: True for the IO types whose adjacency matrix equals its transpose, so a row sum is also the column sum.
+#   utilized_bandwidth, utilized_bandwidth_transposed: The adjacency weighted element-wise by the average bandwidth
+#       utilization, so utilized_bandwidth[t, i, j] is the number of fully used IOs of type t from block i to block j.
+# The arrays are built once per netlist and shared by every chip of a hierarchy.
+# =========================================
+# The class has the following methods:
+#   signal_weights(io_list): Returns the wire count weight and the reach of every IO type for the given IO definitions.
+#   io_table(io_list): Returns the indices of the IO types found in the given IO definitions and an IOTable of them.
+# =========================================
+class NetlistArrays:
+    __slots__ = ('io_types', 'adjacency', 'adjacency_transposed', 'symmetric', 'utilized_bandwidth',
+                 'utilized_bandwidth_transposed', '_signal_weights', '_io_tables')
+
+    def __init__(self, adjacency_matrix_definitions, average_bandwidth_utilization, block_count) -> None:
+        self.io_types = list(adjacency_matrix_definitions)
+        if self.io_types:
+            adjacency = np.stack([adjacency_matrix_definitions[io_type] for io_type in self.io_types])
+            utilization = np.stack([average_bandwidth_utilization[io_type] for io_type in self.io_types])
+        else:
+            adjacency = np.zeros((0, block_count, block_count))
+            utilization = np.zeros((0, block_count, block_count))
+        self.adjacency = adjacency
+        self.adjacency_transposed = np.ascontiguousarray(adjacency.transpose(0, 2, 1))
+        # Bidirectional links are entered in both directions, so their matrices are usually symmetric.
+        self.symmetric = (adjacency == self.adjacency_transposed).all(axis=(1, 2))
+        # Only the product of the two is used, so it is formed once here instead of in every signal power query.
+        utilized_bandwidth = adjacency * utilization
+        self.utilized_bandwidth = utilized_bandwidth
+        self.utilized_bandwidth_transposed = np.ascontiguousarray(utilized_bandwidth.transpose(0, 2, 1))
+        self._signal_weights = {}
+        self._io_tables = {}
+
+    def signal_weights(self, io_list):
+        # The signal wires per connection (wire count, halved for bidirectional IOs) and the reach of each IO type,
+        # taken from the IO definitions in io_list. Kept per IO list, since every chip of a hierarchy shares one.
+        cached = self._signal_weights.get(id(io_list))
+        if cached is not None and cached[0] is io_list:
+            return cached[1], cached[2]
+        io_by_type = Chip.definition_index(io_list, "type")
+        wire_weights = []
+        reaches = []
+        for io_type in self.io_types:
+            io = io_by_type.get(io_type)
+            if io is None:
+                raise ConfigurationError(f"IO type '{io_type}' in the netlist is not in the IO definitions.")
+            if io.bidirectional:
+                bidirectional_factor = 0.5
+            else:
+                bidirectional_factor = 1.0
+            wire_weights.append(io.wire_count * bidirectional_factor)
+            reaches.append(float(io.reach))
+        wire_weights = np.array(wire_weights)
+        self._signal_weights[id(io_list)] = (io_list, wire_weights, reaches)
+        return wire_weights, reaches
+
+    def io_table(self, io_list):
+        # The indices of the IO types of the netlist that are defined in io_list, and an IOTable of their definitions
+        # in the same order. Missing IO types are skipped and reported once. Kept per IO list, like signal_weights.
+        cached = self._io_tables.get(id(io_list))
+        if cached is not None and cached[0] is io_list:
+            return cached[1], cached[2]
+        io_by_type = Chip.definition_index(io_list, "type")
+        found = []
+        ios = []
+        for t, io_type in enumerate(self.io_types):
+            io = io_by_type.get(io_type)
+            if io is None:
+                print(f"Error: IO type '{io_type}' not found in the provided list.")
+            else:
+                found.append(t)
+                ios.append(io)
+        found = np.array(found, dtype=np.intp)
+        table = IOTable(ios)
+        self._io_tables[id(io_list)] = (io_list, found, table)
+        return found, table
+
+# =========================================
+# Chip Class
+# =========================================
+# The class has attributes:
+#   name: The name of the chip.
+#   core_area: The area of the core in mm^2.
+#   aspect_ratio: The aspect ratio (x/y) of the chip.
+#   x_location, y_location: The coordinates of the chip in a larger assembly.
+#   orientation: Orientation has two valid values: "face-up" and "face-down".
+#                These are relative orientations to the parent Chip.
+#                "face-down" means the Chip has the metal layer side facing the parent Chip.
+#                "face-up" means the Chip has the silicon side facing the parent Chip.
+#                orientation of the root Chip will determine the orientation of the entire assembly for display purposes.
+#   stack_side: Stack side has two valid values: "face" and "back".
+#                This indicates which side of the parent Chip the Chip is stacked on.
+#   bb_area, bb_cost, bb_quality, bb_power: Black-box override values.
+#   fraction_memory, fraction_logic, fraction_analog: The proportions of different circuit types.
+#   gate_flop_ratio: The ratio of logic gates to flip-flops.
+#   reticle_share: The fraction of the reticle cost this chip is responsible for.
+#   buried: Boolean indicating if the chip is buried (e.g., a bridge die).
+#   chips: A list of Chip objects that are stacked on this chip.
+#   face_chips, back_chips: The chips stacked on the face and back of this chip, kept as tuples. They are only changed by
+#                assigning a new sequence, so the cached results of the chip are always cleared when they change.
+#   assembly_process: The Assembly object used to assemble this chip.
+#   test_process: The Test object used for testing.
+#   stackup: A list of Layer objects defining the chip's vertical structure.
+#                set_static() turns the stackup into a tuple.
+#   wafer_process: The WaferProcess object for this chip's fabrication.
+#                The process, test, layer, and IO objects are never copied. Every chip that names the same definition
+#                holds a reference to the single object loaded from the definition file, so they can be compared with 'is'.
+#   core_voltage: The operating voltage of the chip core.
+#   power: The intrinsic power consumption of the chip core in Watts.
+#   quantity: The number of chips to be produced.
+#   global_adjacency_matrix, average_bandwidth_utilization, block_names, io_list: The netlist and IO definitions.
+#                The netlist matrices are also kept stacked in a NetlistArrays object shared by the hierarchy.
+#   static: A boolean to lock the object from further changes.
+#   parent_chip: A reference to the parent Chip object in a hierarchy.
+#   root, depth: The top Chip of the hierarchy and the number of levels below it (read-only, found from parent_chip).
+#   (and many more calculated attributes like cost, yield, quality, etc.)
+# =========================================
+# The class has the following methods:
+#   __init__(...): Initializes the Chip object from file or etree, recursively building sub-chips.
+#   (NumericAttribute fields for the numeric attributes, @property and @setter methods for the rest)
+#   set_static(): Locks the chip object.
 #   compute_stack_power(): Calculates the power consumed by all chips stacked on this one.
 #   find_process(...), find_wafer_process(...), etc.: Helper methods to find definition objects.
+#                They look names up in a dict built once per definition list by definition_index(...).
 #   build_stackup(...): Constructs the layer stackup from a string definition.
+#                While a hierarchy is built, the find_* and build_stackup results are cached in _lookup_cache.
+#   iter_subtree(), get_subtree(): Iterate over, or return a cached list of, this chip and all chips stacked on it
+#                without recursion.
+#   get_chip_list(), compute_stack_power(), quality_yield(), etc.: Subtree aggregations cached in _cache until
+#                an input of this chip or a chip stacked on it changes (see subtree_cached and _invalidate_cache()).
+#                get_io_area(), compute_pad_counts(), get_pad_area(), and compute_area() are cached the same way. The pad area
+#                also depends on the parent's assembly process, so changing it clears the caches of the chips stacked on it.
+#                compute_self_nre_cost(), compute_nre_cost(), compute_self_perfect_yield_cost(), and
+#                compute_perfect_yield_cost() are cached too, as are get_layer_aware_cost() and
+#                compute_assembly_step_costs(), which both cost walks share.
+#                The assembly yield inputs get_chips_signal_count(), get_tsv_count(), and get_stacked_die_area() are
+#                cached as well (get_tsv_count() through compute_pad_counts()).
+#                compute_self_cost() and compute_cost() read this chip's own computed yields, so their results are
+#                kept in self_cost and cost instead.
+#   check_routing_congestion(): Warns about stacked chips that need more escape routing tracks than this chip provides.
+#   build_arena(): Returns a ChipArena, a flat array snapshot of this chip and all chips stacked on it.
 #   print_description(): Dumps values of all parameters for inspection.
 #   (and many more get/set/compute methods for area, cost, yield, power, etc.)
 # =========================================
 class Chip:
+    __slots__ = ('_name', '_core_area', '_aspect_ratio', '_x_location', '_y_location', '_orientation',
+                 '_stack_side', '_bb_area', '_bb_cost', '_bb_quality', '_bb_power', '_fraction_memory',
+                 '_fraction_logic', '_fraction_analog', '_gate_flop_ratio', '_reticle_share', '_buried',
+                 '_face_chips', '_back_chips', '_assembly_process', '_test_process', '_stackup',
+                 '_stackup_array', '_stackup_runs', '_stackup_run_lengths', '_mask_set_cost', '_self_gates_per_mm2', '_cache', '_child_index', '_wafer_process', '_core_voltage', '_power', '_quantity', '_parent_chip',
+                 '_self_cost', '_cost', '_self_true_yield', '_chip_true_yield', '_self_test_yield',
+                 '_chip_test_yield', '_self_quality', '_quality', '_stack_power', '_io_power',
+                 '_total_power', '_area', '_nre_design_cost', '_assembly_gate_flop_ratio', '_static',
+                 'global_adjacency_matrix', 'average_bandwidth_utilization', 'block_names', 'io_list', '_netlist')
+
+    # Message raised by the NumericAttribute fields when the chip is static.
+    _static_message = "Cannot change static chip."
+
     @property
     def name(self):
-        return self.__name
+        return self._name
     @name.setter
     def name(self, value):
         if (self.static):
             raise ConfigurationError("Cannot change static chip.")
         else:
-            if type(value) != str:
-                raise ConfigurationError("Chip name must be a string.")
-            else:
-                self.__name = value
-                return 0
-        
-    @property
-    def core_area(self):
-        return self.__core_area
-    @core_area.setter
-    def core_area(self, value):
-        if (self.static):
-            raise ConfigurationError("Cannot change static chip.")
-        else:
-            if type(value) not in [int, float, np.float64]:
-                raise ConfigurationError("Core area must be a number.")
-            elif value < 0:
-                raise ConfigurationError("Core area must be nonnegative.")
-            else:
-                self.__core_area = value
-                return 0
-
-    @property
-    def aspect_ratio(self):
-        return self.__aspect_ratio
-    @aspect_ratio.setter
-    def aspect_ratio(self, value):
-        if (self.static):
-            raise ConfigurationError("Cannot change static chip.")
-        else:
-            if type(value) not in [int, float, np.float64]:
-                raise ConfigurationError("Aspect ratio must be a number.")
-            elif value < 0:
-                raise ConfigurationError("Aspect ratio must be nonnegative.")
-            else:
-                self.__aspect_ratio = value
-                return 0
+            self._name = self.__check_name(value)
+            self._invalidate_cache()
+            return 0
 
-    @property
-    def x_location(self):
-        return self.__x_location
-    @x_location.setter
-    def x_location(self, value):
-        if (self.static):
-            raise ConfigurationError("Cannot change static chip.")
-        else:
-            if value is None or value == "":
-                self.__x_location = None
-                return 0
-            elif type(value) not in [int, float, np.float64]:
-                raise ConfigurationError("X location must be a number.")
-            else:
-                self.__x_location = value
-                return 0
+    @staticmethod
+    def __check_name(value):
+        if not isinstance(value, str):
+            raise ConfigurationError("Chip name must be a string.")
+        return value
         
-    @property
-    def y_location(self):
-        return self.__y_location
-    @y_location.setter
-    def y_location(self, value):
-        if (self.static):
-            raise ConfigurationError("Cannot change static chip.")
-        else:
-            if value is None or value == "":
-                self.__y_location = None
-                return 0
-            elif type(value) not in [int, float, np.float64]:
-                raise ConfigurationError("Y location must be a number.")
-            else:
-                self.__y_location = value
-                return 0
-    
+    core_area = NumericAttribute("Core area", low=0)
+    aspect_ratio = NumericAttribute("Aspect ratio", low=0)
+    x_location = NumericAttribute("X location", optional=True)
+    y_location = NumericAttribute("Y location", optional=True)
+
+    # Stored as an Orientation code, read and written as "face-up" or "face-down".
     @property
     def orientation(self):
-        return self.__orientation
+        return ORIENTATION_NAMES[self._orientation]
     @orientation.setter
     def orientation(self, value):
         if (self.static):
             raise ConfigurationError("Cannot change static chip.")
         else:
-            if type(value) != str:
-                raise ConfigurationError("Orientation must be a string.")
-            value_lower = value.lower()
-            if value_lower not in ["face-up", "face-down"]:
+            self._orientation = self.__parse_orientation(value)
+            self._invalidate_cache()
+            return 0
+
+    @staticmethod
+    def __parse_orientation(value):
+        if not isinstance(value, str):
+            raise ConfigurationError("Orientation must be a string.")
+        # Definitions normally use the lower-case names already, so only other spellings are lowered.
+        code = ORIENTATION_CODES.get(value)
+        if code is None:
+            code = ORIENTATION_CODES.get(value.lower())
+            if code is None:
                 raise ConfigurationError("Orientation must be either 'face-up' or 'face-down'.")
-            else:
-                self.__orientation = value_lower
-                return 0
+        return code
 
+    # Stored as a StackSide code, read and written as "face" or "back".
     @property
     def stack_side(self):
-        return self.__stack_side
+        return STACK_SIDE_NAMES[self._stack_side]
     @stack_side.setter
     def stack_side(self, value):
         if (self.static):
             raise ConfigurationError("Cannot change static chip.")
         else:
-            if type(value) != str:
-                raise ConfigurationError("Stack side must be a string.")
-            value_lower = value.lower()
-            if value_lower not in ["face", "back"]:
-                raise ConfigurationError("Stack side must be either 'face' or 'back'.")
-            else:
-                self.__stack_side = value_lower
-                return 0
+            self._stack_side = self.__parse_stack_side(value)
+            self._invalidate_cache()
+            return 0
 
-    @property
-    def bb_area(self):
-        return self.__bb_area
-    @bb_area.setter
-    def bb_area(self, value):
-        if (self.static):
-            raise ConfigurationError("Cannot change static chip.")
-        else:
-            if value is None or value == "":
-                self.__bb_area = None
-                return 0
-            elif type(value) not in [int, float, np.float64]:
-                raise ConfigurationError("BB area must be a number.")
-            elif value < 0:
-                raise ConfigurationError("BB area must be nonnegative.")
-            else:
-                self.__bb_area = value
-                return 0
+    @staticmethod
+    def __parse_stack_side(value):
+        if not isinstance(value, str):
+            raise ConfigurationError("Stack side must be a string.")
+        code = STACK_SIDE_CODES.get(value)
+        if code is None:
+            code = STACK_SIDE_CODES.get(value.lower())
+            if code is None:
+                raise ConfigurationError("Stack side must be either 'face' or 'back'.")
+        return code
 
-    @property
-    def bb_cost(self):
-        return self.__bb_cost
-    @bb_cost.setter
-    def bb_cost(self, value):
-        if (self.static):
-            raise ConfigurationError("Cannot change static chip.")
-        else:
-            if value is None or value == "":
-                self.__bb_cost = None
-                return 0
-            elif type(value) not in [int, float, np.float64]:
-                raise ConfigurationError("BB cost must be a number.")
-            elif value < 0:
-                raise ConfigurationError("BB cost must be nonnegative.")
-            else:
-                self.__bb_cost = value
-                return 0
+    bb_area = NumericAttribute("BB area", low=0, optional=True)
+    bb_cost = NumericAttribute("BB cost", low=0, optional=True)
+    bb_quality = NumericAttribute("BB quality", low=0, high=1, optional=True)
+    bb_power = NumericAttribute("BB power", low=0, optional=True)
+    fraction_memory = NumericAttribute("Fraction memory", low=0, high=1)
+    fraction_logic = NumericAttribute("Fraction logic", low=0, high=1)
+    fraction_analog = NumericAttribute("Fraction analog", low=0, high=1)
+    gate_flop_ratio = NumericAttribute("Gate flop ratio", low=0)
+    reticle_share = NumericAttribute("Reticle share", low=0)
 
-    @property
-    def bb_quality(self):
-        return self.__bb_quality
-    @bb_quality.setter
-    def bb_quality(self, value):
-        if (self.static):
-            raise ConfigurationError("Cannot change static chip.")
-        else:
-            if value is None or value == "":
-                self.__bb_quality = None
-                return 0
-            elif type(value) not in [int, float, np.float64]:
-                raise ConfigurationError("BB quality must be a number.")
-            elif value < 0 or value > 1:
-                raise ConfigurationError("BB quality must be between 0 and 1.")
-            else:
-                self.__bb_quality = value
-                return 0
-        
-    @property
-    def bb_power(self):
-        return self.__bb_power
-    @bb_power.setter
-    def bb_power(self, value):
-        if (self.static):
-            raise ConfigurationError("Cannot change static chip.")
-        else:
-            if value is None or value == "":
-                self.__bb_power = None
-                return 0
-            elif type(value) not in [int, float, np.float64]:
-                raise ConfigurationError("BB power must be a number.")
-            elif value < 0:
-                raise ConfigurationError("BB power must be nonnegative.")
-            else:
-                self.__bb_power = value
-                return 0
-        
-    @property
-    def fraction_memory(self):
-        return self.__fraction_memory
-    @fraction_memory.setter
-    def fraction_memory(self, value):
-        if (self.static):
-            raise ConfigurationError("Cannot change static chip.")
-        else:
-            if type(value) not in [int, float, np.float64]:
-                raise ConfigurationError("Fraction memory must be a number.")
-            elif value < 0 or value > 1:
-                raise ConfigurationError("Fraction memory must be between 0 and 1.")
-            else:
-                self.__fraction_memory = value
-                return 0
-        
-    @property
-    def fraction_logic(self):
-        return self.__fraction_logic
-    @fraction_logic.setter
-    def fraction_logic(self, value):
-        if (self.static):
-            raise ConfigurationError("Cannot change static chip.")
-        else:
-            if type(value) not in [int, float, np.float64]:
-                raise ConfigurationError("Fraction logic must be a number.")
-            elif value < 0 or value > 1:
-                raise ConfigurationError("Fraction logic must be between 0 and 1.")
-            else:
-                self.__fraction_logic = value
-                return 0
-        
-    @property
-    def fraction_analog(self):
-        return self.__fraction_analog
-    @fraction_analog.setter
-    def fraction_analog(self, value):
-        if (self.static):
-            raise ConfigurationError("Cannot change static chip.")
-        else:
-            if type(value) not in [int, float, np.float64]:
-                raise ConfigurationError("Fraction analog must be a number.")
-            elif value < 0 or value > 1:
-                raise ConfigurationError("Fraction analog must be between 0 and 1.")
-            else:
-                self.__fraction_analog = value
-                return 0
-        
-    @property
-    def gate_flop_ratio(self):
-        return self.__gate_flop_ratio
-    @gate_flop_ratio.setter
-    def gate_flop_ratio(self, value):
-        if (self.static):
-            raise ConfigurationError("Cannot change static chip.")
-        else:
-            if type(value) not in [int, float, np.float64]:
-                raise ConfigurationError("Gate flop ratio must be a number.")
-            elif value < 0:
-                raise ConfigurationError("Gate flop ratio must be nonnegative.")
-            else:
-                self.__gate_flop_ratio = value
-                return 0
-        
-    @property
-    def reticle_share(self):
-        return self.__reticle_share
-    @reticle_share.setter
-    def reticle_share(self, value):
-        if (self.static):
-            raise ConfigurationError("Cannot change static chip.")
-        else:
-            if type(value) not in [int, float, np.float64]:
-                raise ConfigurationError("Reticle share must be a number.")
-            elif value < 0:
-                raise ConfigurationError("Reticle share must be nonnegative.")
-            else:
-                self.__reticle_share = value
-                return 0
-        
     @property
     def buried(self):
-        return self.__buried
+        return self._buried
     @buried.setter
     def buried(self, value):
         if (self.static):
             raise ConfigurationError("Cannot change static chip.")
         else:
-            if type(value) != str:
-                raise ConfigurationError("Buried must be a string with value \"True\" or \"true\".")
-            elif value.lower() == "true":
-                self.__buried = True
-                return 0
-            else:
-                self.__buried = False
-                return 0
+            self._buried = self.__parse_buried(value)
+            self._invalidate_cache()
+            return 0
+
+    @staticmethod
+    def __parse_buried(value):
+        if not isinstance(value, str):
+            raise ConfigurationError("Buried must be a string with value \"True\" or \"true\".")
+        return value.lower() == "true"
 
     @property
     def face_chips(self):
-        return self.__face_chips
+        return self._face_chips
     @face_chips.setter
     def face_chips(self, value):
         if (self.static):
             raise ConfigurationError("Cannot change static chip.")
         else:
-            if not isinstance(value, list):
+            if not isinstance(value, (list, tuple)):
                 raise ConfigurationError("Face chips must be a list of Chip objects.")
             for c in value:
                 if not isinstance(c, Chip):
                     raise ConfigurationError("All face chips must be Chip objects.")
-            self.__face_chips = value
+            self._face_chips = tuple(value)
+            self.__index_children()
+            self._invalidate_cache()
             return 0
     
     @property
     def back_chips(self):
-        return self.__back_chips
+        return self._back_chips
     @back_chips.setter
     def back_chips(self, value):
         if (self.static):
             raise ConfigurationError("Cannot change static chip.")
         else:
-            if not isinstance(value, list):
+            if not isinstance(value, (list, tuple)):
                 raise ConfigurationError("Back chips must be a list of Chip objects.")
             for c in value:
                 if not isinstance(c, Chip):
                     raise ConfigurationError("All back chips must be Chip objects.")
-            self.__back_chips = value
+            self._back_chips = tuple(value)
+            self.__index_children()
+            self._invalidate_cache()
             return 0
         
     # @property
@@ -2871,247 +2970,220 @@ class Chip:
         
     @property
     def assembly_process(self):
-        return self.__assembly_process
+        return self._assembly_process
     @assembly_process.setter
     def assembly_process(self, value):
         if (self.static):
             raise ConfigurationError("Cannot change static chip.")
         else:
-            self.__assembly_process = value
+            self._assembly_process = value
+            self._invalidate_cache()
+            # The pad area of the chips stacked on this one depends on the bonding pitch of this chip.
+            for chip in self.get_stacked_chips():
+                chip._cache.clear()
             return 0
         
     @property
     def test_process(self):
-        return self.__test_process
+        return self._test_process
     @test_process.setter
     def test_process(self, value):
         if (self.static):
             raise ConfigurationError("Cannot change static chip.")
         else:
-            self.__test_process = value
+            self._test_process = value
+            self._invalidate_cache()
             return 0
 
     @property
     def stackup(self):
-        return self.__stackup
+        return self._stackup
     @stackup.setter
     def stackup(self, value):
         if (self.static):
             raise ConfigurationError("Cannot change static chip.")
         else:
-            self.__stackup = value
+            self._stackup = value
+            self._stackup_array = np.array([layer.stackup_record() for layer in value], dtype=LAYER_DTYPE)
+            # The unshared mask set cost only changes with the stackup.
+            self._mask_set_cost = float(self._stackup_array["mask_cost"].sum())
+            # The gate density of the active layers does not depend on the chip area either.
+            self._self_gates_per_mm2 = float(self._stackup_array["gates_per_mm2"][self._stackup_array["active"]].sum())
+            # build_stackup repeats each layer of a "count:name" part, so the defect yield is computed once per run.
+            run_starts = [i for i in range(len(value)) if i == 0 or value[i] is not value[i-1]]
+            self._stackup_runs = self._stackup_array[run_starts]
+            self._stackup_run_lengths = np.diff(np.array(run_starts + [len(value)], dtype=np.int64))
+            self._invalidate_cache()
             return 0
         
     @property
     def wafer_process(self):
-        return self.__wafer_process
+        return self._wafer_process
     @wafer_process.setter
     def wafer_process(self, value):
         if (self.static):
             raise ConfigurationError("Cannot change static chip.")
         else:
-            self.__wafer_process = value
+            self._wafer_process = value
+            self._invalidate_cache()
             return 0
 
-    @property
-    def core_voltage(self):
-        return self.__core_voltage
-    @core_voltage.setter
-    def core_voltage(self, value):
-        if (self.static):
-            raise ConfigurationError("Cannot change static chip.")
-        else:
-            if type(value) not in [int, float, np.float64]:
-                raise ConfigurationError("Core voltage must be a number.")
-            elif value < 0:
-                raise ConfigurationError("Core voltage must be nonnegative.")
-            else:
-                self.__core_voltage = value
-                return 0
-        
-    @property
-    def power(self):
-        return self.__power
-    @power.setter
-    def power(self, value):
-        if (self.static):
-            raise ConfigurationError("Cannot change static chip.")
-        else:
-            if type(value) not in [int, float, np.float64]:
-                raise ConfigurationError("Power must be a number.")
-            elif value < 0:
-                raise ConfigurationError("Power must be nonnegative.")
-            else:
-                self.__power = value
-                return 0
-        
+    core_voltage = NumericAttribute("Core voltage", low=0)
+    power = NumericAttribute("Power", low=0)
+
     @property
     def quantity(self):
-        return self.__quantity
+        return self._quantity
     @quantity.setter
     def quantity(self, value):
         if (self.static):
             raise ConfigurationError("Cannot change static chip.")
         else:
-            if type(value) != int:
-                raise ConfigurationError("Quantity must be an integer.")
-            elif value < 0:
-                raise ConfigurationError("Quantity must be nonnegative.")
-            else:
-                self.__quantity = value
-                return 0
+            self._quantity = self.__check_quantity(value)
+            self._invalidate_cache()
+            return 0
+
+    @staticmethod
+    def __check_quantity(value):
+        if type(value) is not int:
+            raise ConfigurationError("Quantity must be an integer.")
+        elif value < 0:
+            raise ConfigurationError("Quantity must be nonnegative.")
+        return value
     
     @property
     def static(self):
-        return self.__static
+        return self._static
     @static.setter
     def static(self, value):
-        self.__static = value
+        self._static = value
         return 0
     
     @property
-    def parent_chip(self): return self.__parent_chip
+    def parent_chip(self): return self._parent_chip
     @parent_chip.setter
     def parent_chip(self, value):
         if not isinstance(value, Chip) and value is not None:
             raise ConfigurationError("parent_chip must be a Chip object or None.")
-        self.__parent_chip = value
-    
-    @property
-    def self_cost(self): return self.__self_cost
-    @self_cost.setter
-    def self_cost(self, value):
-        if type(value) not in [int, float, np.float64]:
-            raise ConfigurationError("Self cost must be a number.")
-        if value < 0:
-            raise ConfigurationError("Self cost must be non-negative.")
-        self.__self_cost = value
-
-    @property
-    def cost(self): return self.__cost
-    @cost.setter
-    def cost(self, value):
-        if type(value) not in [int, float, np.float64]:
-            raise ConfigurationError("Cost must be a number.")
-        if value < 0:
-            raise ConfigurationError("Cost must be non-negative.")
-        self.__cost = value
-
-    @property
-    def self_true_yield(self): return self.__self_true_yield
-    @self_true_yield.setter
-    def self_true_yield(self, value):
-        if type(value) not in [int, float, np.float64]:
-            raise ConfigurationError("Yield must be a number.")
-        if not (0.0 <= value <= 1.0):
-            raise ConfigurationError("Yield must be between 0.0 and 1.0.")
-        self.__self_true_yield = value
-
-    @property
-    def chip_true_yield(self): return self.__chip_true_yield
-    @chip_true_yield.setter
-    def chip_true_yield(self, value):
-        if type(value) not in [int, float, np.float64]:
-            raise ConfigurationError("Yield must be a number.")
-        if not (0.0 <= value <= 1.0):
-            raise ConfigurationError("Yield must be between 0.0 and 1.0.")
-        self.__chip_true_yield = value
-
-    @property
-    def self_test_yield(self): return self.__self_test_yield
-    @self_test_yield.setter
-    def self_test_yield(self, value):
-        if type(value) not in [int, float, np.float64]:
-            raise ConfigurationError("Yield must be a number.")
-        if not (0.0 <= value <= 1.0):
-            raise ConfigurationError("Yield must be between 0.0 and 1.0.")
-        self.__self_test_yield = value
-
-    @property
-    def chip_test_yield(self): return self.__chip_test_yield
-    @chip_test_yield.setter
-    def chip_test_yield(self, value):
-        if type(value) not in [int, float, np.float64]:
-            raise ConfigurationError("Yield must be a number.")
-        if not (0.0 <= value <= 1.0):
-            raise ConfigurationError("Yield must be between 0.0 and 1.0.")
-        self.__chip_test_yield = value
-
-    @property
-    def self_quality(self): return self.__self_quality
-    @self_quality.setter
-    def self_quality(self, value):
-        if type(value) not in [int, float, np.float64]:
-            raise ConfigurationError("Quality must be a number.")
-        if value < 0:
-            raise ConfigurationError("Quality must be non-negative.")
-        self.__self_quality = value
-
-    @property
-    def quality(self): return self.__quality
-    @quality.setter
-    def quality(self, value):
-        if type(value) not in [int, float, np.float64]:
-            raise ConfigurationError("Quality must be a number.")
-        if value < 0:
-            raise ConfigurationError("Quality must be non-negative.")
-        self.__quality = value
-    
-    @property
-    def stack_power(self): return self.__stack_power
-    @stack_power.setter
-    def stack_power(self, value):
-        if type(value) not in [int, float, np.float64]:
-            raise ConfigurationError("Power must be a number.")
-        if value < 0:
-            raise ConfigurationError("Power must be non-negative.")
-        self.__stack_power = value
-        
-    @property
-    def io_power(self): return self.__io_power
-    @io_power.setter
-    def io_power(self, value):
-        if type(value) not in [int, float, np.float64]:
-            print(type(value))
-            raise ConfigurationError("Power must be a number.")
-        if value < 0:
-            raise ConfigurationError("Power must be non-negative.")
-        self.__io_power = value
-
-    @property
-    def total_power(self): return self.__total_power
-    @total_power.setter
-    def total_power(self, value):
-        if type(value) not in [int, float, np.float64]:
-            raise ConfigurationError("Power must be a number.")
-        if value < 0:
-            raise ConfigurationError("Power must be non-negative.")
-        self.__total_power = value
-
-    @property
-    def area(self): return self.__area
-    @area.setter
-    def area(self, value):
-        if type(value) not in [int, float, np.float64]:
-            raise ConfigurationError("Area must be a number.")
-        if value < 0:
-            raise ConfigurationError("Area must be non-negative.")
-        self.__area = value
-        
-    @property
-    def nre_design_cost(self): return self.__nre_design_cost
-    @nre_design_cost.setter
-    def nre_design_cost(self, value):
-        if type(value) not in [int, float, np.float64]:
-            raise ConfigurationError("NRE cost must be a number.")
-        if value < 0:
-            raise ConfigurationError("NRE cost must be non-negative.")
-        self.__nre_design_cost = value
+        self._parent_chip = value
+
+    # The root and depth are found by walking up the parent chain, so they stay correct when any chip above is moved.
+    @property
+    def root(self):
+        chip = self
+        while chip._parent_chip is not None:
+            chip = chip._parent_chip
+        return chip
+
+    @property
+    def depth(self):
+        depth = 0
+        chip = self._parent_chip
+        while chip is not None:
+            depth += 1
+            chip = chip._parent_chip
+        return depth
+
+    # Calculated attributes. These are written while the chip is being computed, so they are not blocked by static.
+    self_cost = NumericAttribute("Self cost", low=0, locked=False, range_message="Self cost must be non-negative.")
+    cost = NumericAttribute("Cost", low=0, locked=False, range_message="Cost must be non-negative.")
+    self_true_yield = NumericAttribute("Yield", low=0.0, high=1.0, locked=False)
+    chip_true_yield = NumericAttribute("Yield", low=0.0, high=1.0, locked=False)
+    self_test_yield = NumericAttribute("Yield", low=0.0, high=1.0, locked=False)
+    chip_test_yield = NumericAttribute("Yield", low=0.0, high=1.0, locked=False)
+    self_quality = NumericAttribute("Quality", low=0, locked=False, range_message="Quality must be non-negative.")
+    quality = NumericAttribute("Quality", low=0, locked=False, range_message="Quality must be non-negative.")
+    stack_power = NumericAttribute("Power", low=0, locked=False, range_message="Power must be non-negative.")
+    io_power = NumericAttribute("Power", low=0, locked=False, range_message="Power must be non-negative.")
+    total_power = NumericAttribute("Power", low=0, locked=False, range_message="Power must be non-negative.")
+    area = NumericAttribute("Area", low=0, locked=False, range_message="Area must be non-negative.")
+    nre_design_cost = NumericAttribute("NRE cost", low=0, locked=False, range_message="NRE cost must be non-negative.")
+    assembly_gate_flop_ratio = NumericAttribute("Assembly gate flop ratio", low=0, locked=False, range_message="Assembly gate flop ratio must be non-negative.")
+
+    # Fields read from the chip definition, in the order they are set:
+    #   (XML attribute, private attribute, conversion, default, check)
+    # A missing or empty attribute takes the default. A default of _REQUIRED means the attribute must be given.
+    # The check validates the converted value and returns what is stored, like the matching setter.
+    _DEFINITION_SCHEMA = (
+        ("bb_area", "_bb_area", float, None, bb_area.validate),
+        ("bb_cost", "_bb_cost", float, None, bb_cost.validate),
+        ("bb_quality", "_bb_quality", float, None, bb_quality.validate),
+        ("bb_power", "_bb_power", float, None, bb_power.validate),
+        ("aspect_ratio", "_aspect_ratio", float, 1.0, aspect_ratio.validate),
+        ("x_location", "_x_location", float, None, x_location.validate),
+        ("y_location", "_y_location", float, None, y_location.validate),
+        ("orientation", "_orientation", str, "face-up", __parse_orientation),
+        ("stack_side", "_stack_side", str, "face", __parse_stack_side),
+        # Chip name should match the name in the netlist file.
+        ("name", "_name", str, _REQUIRED, __check_name),
+        ("core_area", "_core_area", float, _REQUIRED, core_area.validate),
+        ("fraction_memory", "_fraction_memory", float, _REQUIRED, fraction_memory.validate),
+        ("fraction_logic", "_fraction_logic", float, _REQUIRED, fraction_logic.validate),
+        ("fraction_analog", "_fraction_analog", float, _REQUIRED, fraction_analog.validate),
+        ("gate_flop_ratio", "_gate_flop_ratio", float, _REQUIRED, gate_flop_ratio.validate),
+        ("reticle_share", "_reticle_share", float, 1.0, reticle_share.validate),
+        ("quantity", "_quantity", int, _REQUIRED, __check_quantity),
+        ("buried", "_buried", str, False, __parse_buried),
+        ("power", "_power", float, _REQUIRED, power.validate),
+        ("core_voltage", "_core_voltage", float, _REQUIRED, core_voltage.validate),
+    )
+    # Converted definition values of one chip, named by XML attribute in _DEFINITION_SCHEMA order.
+    _DefinitionFields = collections.namedtuple("ChipDefinitionFields", [field[0] for field in _DEFINITION_SCHEMA])
+    _DEFINITION_ATTRIBUTES = tuple(field[1] for field in _DEFINITION_SCHEMA)
+    # The float fields are range checked for the whole definition tree at once by __parse_definition_tree.
+    _NUMERIC_DEFINITION_COLUMNS = tuple(i for i, field in enumerate(_DEFINITION_SCHEMA) if field[2] is float)
+    _NUMERIC_DEFINITION_LOW = np.array([-np.inf if field[4].__self__.low is None else field[4].__self__.low
+                                        for field in _DEFINITION_SCHEMA if field[2] is float])
+    _NUMERIC_DEFINITION_HIGH = np.array([np.inf if field[4].__self__.high is None else field[4].__self__.high
+                                         for field in _DEFINITION_SCHEMA if field[2] is float])
+
+    @staticmethod
+    def __parse_definition_tree(definition):
+        # Converts and checks the fields of every chip in the definition tree once, before any chip is built.
+        # The float fields of all chips are bounds checked in one NumPy comparison instead of one Python branch
+        # per field per chip. Each chip definition gets its values as a ChipDefinitionFields tuple under "fields".
+        schema = Chip._DEFINITION_SCHEMA
+        numeric_columns = Chip._NUMERIC_DEFINITION_COLUMNS
+        chip_definitions = []
+        stack = [definition]
+        while stack:
+            chip_definition = stack.pop()
+            # Chips using the experimental copy_from feature do not read their own fields or children.
+            if chip_definition["attributes"].get("copy_from") is not None:
+                chip_definition["fields"] = None
+                continue
+            chip_definitions.append(chip_definition)
+            stack.extend(chip_definition["face_chips"])
+            stack.extend(chip_definition["back_chips"])
+        rows = []
+        for chip_definition in chip_definitions:
+            attributes = chip_definition["attributes"]
+            row = []
+            for key, attribute, convert, default, check in schema:
+                raw = attributes.get(key)
+                if raw is None or raw == "":
+                    if default is _REQUIRED:
+                        raise ConfigurationError(f"Chip definition is missing the '{key}' attribute.")
+                    value = default
+                else:
+                    value = convert(raw)
+                # The float fields are checked below together with the rest of the tree.
+                row.append(value if convert is float else check(value))
+            rows.append(row)
+        # Unset optional fields become NaN, which passes both comparisons.
+        values = np.array([[row[i] for i in numeric_columns] for row in rows], dtype=np.float64).reshape(len(rows), len(numeric_columns))
+        out_of_range = (values < Chip._NUMERIC_DEFINITION_LOW) | (values > Chip._NUMERIC_DEFINITION_HIGH)
+        if out_of_range.any():
+            field_index = numeric_columns[np.argwhere(out_of_range)[0][1]]
+            raise ConfigurationError(schema[field_index][4].__self__.range_message)
+        for chip_definition, row in zip(chip_definitions, rows):
+            chip_definition["fields"] = Chip._DefinitionFields._make(row)
 
     # ===== Initialization Functions =====
     # "etree" is an element tree built from the system definition xml file.
-    def __init__(self, filename = None, etree = None, parent_chip = None, wafer_process_list = None, assembly_process_list = None, test_process_list = None, layers = None, ios = None, adjacency_matrix_definitions = None, average_bandwidth_utilization = None, block_names = None, static = False) -> None:
+    def __init__(self, filename = None, etree = None, parent_chip = None, wafer_process_list = None, assembly_process_list = None, test_process_list = None, layers = None, ios = None, adjacency_matrix_definitions = None, average_bandwidth_utilization = None, block_names = None, static = False, definition = None) -> None:
         self.static = False
+        self._cache = {}
         # If the critical definition lists are not provided, throw an error and exit.
         if wafer_process_list is None:
             raise ConfigurationError("wafer_process_list is None.")
@@ -3130,132 +3202,170 @@ class Chip:
         if block_names is None:
             raise ConfigurationError("block_names is None.")
 
-        root = {}
-        # If the filename is given and the etree is not, read the file and build the etree.
+        # If the filename is given and the etree is not, read the definition from the XML file or its compiled JSON form.
         if filename is not None and filename != "" and etree is None:
-            tree = ET.parse(filename)
-            root = tree.getroot()
+            definition = chip_definition_from_file(filename)
         # If the etree is given, use it.
         elif etree is not None:
-            root = etree
-        else:
+            definition = chip_definition_from_etree(etree)
+        # Sub-chips are built from the definition already parsed by their parent.
+        elif definition is None:
             raise ConfigurationError("Invalid chip definition. A filename or etree must be provided.")
 
         self.parent_chip = parent_chip
-        attributes = root.attrib
+        attributes = definition["attributes"]
+        # Sub-chips built from their parent's definition find it already checked.
+        if "fields" not in definition:
+            self.__parse_definition_tree(definition)
+        # The definition lists do not change while a hierarchy is built, so lookups are shared by the whole tree.
+        # Start from an empty cache for each new root so lists from an earlier build are never matched by id.
+        if parent_chip is None:
+            Chip._lookup_cache.clear()
 
         # The copy_from feature is not fully implemented and should be used with caution.
+        # Sub-chips with copy_from are made by the parent with from_prototype. This branch only sees a chip built directly.
         copy_from = attributes.get("copy_from")
         if copy_from is not None:
             print("Warning: The 'copy_from' feature is experimental.")
             # Need to search the Chip list using the parent_chip pointer.
             if parent_chip:
-                for chip_object in parent_chip.face_chips:
-                    if chip_object.name == copy_from:
-                        # Deep copy the found chip and re-assign self. This is tricky in Python.
-                        # A better implementation might be a factory function.
-                        self = copy.deepcopy(chip_object)
-                        break
-                for chip_object in parent_chip.back_chips:
-                    if chip_object.name == copy_from:
-                        # Deep copy the found chip and re-assign self. This is tricky in Python.
-                        # A better implementation might be a factory function.
-                        self = copy.deepcopy(chip_object)
-                        break
-                # for chip_object in parent_chip.chips:
-                #     if chip_object.name == copy_from:
-                #         # Deep copy the found chip and re-assign self. This is tricky in Python.
-                #         # A better implementation might be a factory function.
-                #         self = copy.deepcopy(chip_object)
-                #         break
+                chip_object = parent_chip._child_index.get(copy_from)
+                if chip_object is not None:
+                    # Copy the found chip into this instance. Rebinding self would leave this chip empty.
+                    self.__copy_state_from(chip_object)
         else:
+            # The chip is still being built and cannot be static yet, so the fields below are written to the
+            # private attributes directly instead of paying for the static check in every setter.
             # The following are the class parameter objects. The find_* functions match the correct object with the name given in the chip definition.
-            self.wafer_process = self.find_wafer_process(attributes["wafer_process"], wafer_process_list)
-            self.assembly_process = self.find_assembly_process(attributes["assembly_process"], assembly_process_list)
-            self.test_process = self.find_test_process(attributes["test_process"], test_process_list)
-            self.stackup = self.build_stackup(attributes["stackup"], layers)
+            self._wafer_process = self.__memoized_lookup(self.find_wafer_process, attributes["wafer_process"], wafer_process_list)
+            self._assembly_process = self.__memoized_lookup(self.find_assembly_process, attributes["assembly_process"], assembly_process_list)
+            self._test_process = self.__memoized_lookup(self.find_test_process, attributes["test_process"], test_process_list)
+            # Chips with the same stackup string get their own list holding the same Layer objects.
+            self.stackup = list(self.__memoized_lookup(self.build_stackup, attributes["stackup"], layers))
 
             # Recursively handle the chips that are stacked on this chip.
+            # Children are built one after another. Each child holds a reference to this partly built chip and to the shared
+            # definition objects, so building them in worker processes would pickle the whole tree both ways, which costs more
+            # than building a chip. Independent designs are run in parallel instead (see sensitivity_analysis.py).
             # self.chips = []
-            self.face_chips = []
-            self.back_chips = []
-            for chip_def in root:
-                if "chip" in chip_def.tag:
-                    if chip_def.attrib.get("stack_side") == "face":
-                        self.face_chips.append(Chip(filename=None, etree=chip_def, parent_chip=self, wafer_process_list=wafer_process_list, assembly_process_list=assembly_process_list, test_process_list=test_process_list, layers=layers, ios=ios, adjacency_matrix_definitions=adjacency_matrix_definitions, average_bandwidth_utilization=average_bandwidth_utilization, block_names=block_names, static=static))
-                    elif chip_def.attrib.get("stack_side") == "back":
-                        self.back_chips.append(Chip(filename=None, etree=chip_def, parent_chip=self, wafer_process_list=wafer_process_list, assembly_process_list=assembly_process_list, test_process_list=test_process_list, layers=layers, ios=ios, adjacency_matrix_definitions=adjacency_matrix_definitions, average_bandwidth_utilization=average_bandwidth_utilization, block_names=block_names, static=static))
-                    # self.chips.append(Chip(filename=None, etree=chip_def, parent_chip=self, wafer_process_list=wafer_process_list, assembly_process_list=assembly_process_list, test_process_list=test_process_list, layers=layers, ios=ios, adjacency_matrix_definitions=adjacency_matrix_definitions, average_bandwidth_utilization=average_bandwidth_utilization, block_names=block_names, static=static))
-
-            # Set Black-Box Parameters
-            self.bb_area = float(attributes["bb_area"]) if attributes.get("bb_area") else None
-            self.bb_cost = float(attributes["bb_cost"]) if attributes.get("bb_cost") else None
-            self.bb_quality = float(attributes["bb_quality"]) if attributes.get("bb_quality") else None
-            self.bb_power = float(attributes["bb_power"]) if attributes.get("bb_power") else None
-            self.aspect_ratio = float(attributes.get("aspect_ratio", 1.0)) if attributes.get("aspect_ratio", 1.0) else 1.0
-            self.x_location = float(attributes["x_location"]) if attributes.get("x_location") else None
-            self.y_location = float(attributes["y_location"]) if attributes.get("y_location") else None
-            self.orientation = attributes["orientation"] if attributes.get("orientation") else "face-up"
-            self.stack_side = attributes["stack_side"] if attributes.get("stack_side") else "face"
-
-            # Chip name should match the name in the netlist file.
-            self.name = attributes["name"]
-            self.core_area = float(attributes["core_area"])
-            self.fraction_memory = float(attributes["fraction_memory"])
-            self.fraction_logic = float(attributes["fraction_logic"])
-            self.fraction_analog = float(attributes["fraction_analog"])
-            self.gate_flop_ratio = float(attributes["gate_flop_ratio"])
-            self.reticle_share = float(attributes.get("reticle_share", 1.0))
-            self.quantity = int(attributes["quantity"])
-            self.buried = attributes["buried"] if attributes.get("buried") else False
-            self.power = float(attributes["power"])
-            self.core_voltage = float(attributes["core_voltage"])
+            # Chips are indexed by name as they are added, so a copy_from sibling finds its prototype without a search.
+            self._face_chips = []
+            self._back_chips = []
+            self._child_index = {}
+            for chip_list, chip_defs in ((self._face_chips, definition["face_chips"]), (self._back_chips, definition["back_chips"])):
+                for chip_def in chip_defs:
+                    prototype_name = chip_def["attributes"].get("copy_from")
+                    if prototype_name is not None:
+                        chip = Chip.from_prototype(self, prototype_name)
+                    else:
+                        chip = Chip(filename=None, etree=None, parent_chip=self, wafer_process_list=wafer_process_list, assembly_process_list=assembly_process_list, test_process_list=test_process_list, layers=layers, ios=ios, adjacency_matrix_definitions=adjacency_matrix_definitions, average_bandwidth_utilization=average_bandwidth_utilization, block_names=block_names, static=static, definition=chip_def)
+                    chip_list.append(chip)
+                    self._child_index.setdefault(chip.name, chip)
+            self._face_chips = tuple(self._face_chips)
+            self._back_chips = tuple(self._back_chips)
+
+            # Set the definition fields, already converted and checked with the rest of the tree.
+            for attribute, value in zip(Chip._DEFINITION_ATTRIBUTES, definition["fields"]):
+                setattr(self, attribute, value)
             
             # Store references to global definition lists
             self.global_adjacency_matrix = adjacency_matrix_definitions
             self.average_bandwidth_utilization = average_bandwidth_utilization
             self.block_names = block_names
             self.io_list = ios
+            netlist_key = ("NetlistArrays", id(adjacency_matrix_definitions), id(average_bandwidth_utilization))
+            self._netlist = Chip._lookup_cache.get(netlist_key)
+            if self._netlist is None:
+                self._netlist = NetlistArrays(adjacency_matrix_definitions, average_bandwidth_utilization, len(block_names))
+                Chip._lookup_cache[netlist_key] = self._netlist
 
             # Perform all calculations after initial parameters are set
             self.__perform_calculations()
 
-            # Check routing congestion below the chip by checking the routing tracks available on the parent chip.
-            if self.parent_chip is not None:
-                num_tracks = 0
-                for layer in self.parent_chip.stackup:
-                    num_tracks += layer.compute_number_of_routing_tracks(self.area, self.aspect_ratio)
-
-                signal_pads, signal_with_reach_count = self.get_signal_count(self.get_chip_list())
-                escape_wires = signal_pads + self.test_process.num_test_ios()
-                if num_tracks < escape_wires:
-                    print("Warning: The number of excape routing tracks available on the parent chip is less than the number of routing tracks required by " + str(self.name) + ".")
-                # else:
-                #     print("Passed routing congestion check for " + str(self.name) + ".")
-            
+            # Check routing congestion below the chips stacked on this chip by checking the routing tracks available here.
+            self.check_routing_congestion()
+
             # If the chip is defined as static, it should not be changed.
             if static:
                 self.set_static()
 
         return
 
+    @classmethod
+    def from_prototype(cls, parent_chip, name):
+        # Builds a chip for the experimental copy_from feature as a copy of the chip called name that is already
+        # stacked on parent_chip.
+        print("Warning: The 'copy_from' feature is experimental.")
+        prototype = parent_chip._child_index.get(name)
+        if prototype is None:
+            raise ConfigurationError(f"copy_from chip '{name}' is not stacked on '{parent_chip.name}' before the copy.")
+        chip = cls.__new__(cls)
+        chip.__copy_state_from(prototype)
+        return chip
+
+    def __copy_state_from(self, prototype):
+        # Makes this chip a copy of prototype in place, slot by slot. Numbers, strings, and the process, layer, IO, and
+        # netlist definitions are shared. The chip lists and the stackup are new, and the chips stacked on the prototype
+        # are deep copied and stacked on this chip. The chips above the prototype are shared, not copied.
+        for name in Chip.__slots__:
+            try:
+                setattr(self, name, getattr(prototype, name))
+            except AttributeError:
+                pass
+        self._stackup = list(prototype._stackup)
+        self._cache = {}
+        memo = {id(prototype): self}
+        ancestor = prototype.parent_chip
+        while ancestor is not None:
+            memo[id(ancestor)] = ancestor
+            ancestor = ancestor.parent_chip
+        for chip in prototype.iter_subtree():
+            for shared in (chip.wafer_process, chip.assembly_process, chip.test_process, chip.io_list,
+                           chip.global_adjacency_matrix, chip.average_bandwidth_utilization, chip.block_names, chip._netlist,
+                           *chip.stackup):
+                memo[id(shared)] = shared
+        # Mapping the prototype to this chip makes the copied children point back to this chip as their parent.
+        self._face_chips = tuple(copy.deepcopy(chip, memo) for chip in prototype._face_chips)
+        self._back_chips = tuple(copy.deepcopy(chip, memo) for chip in prototype._back_chips)
+        self.__index_children()
+
+    def __index_children(self):
+        # Name to chip map of the chips stacked directly on this one. The first chip with a name is kept.
+        child_index = {}
+        for chip in self._face_chips:
+            child_index.setdefault(chip.name, chip)
+        for chip in self._back_chips:
+            child_index.setdefault(chip.name, chip)
+        self._child_index = child_index
+
     def set_static(self):
-        self.__static = True
+        self._static = True
+        # The stackup cannot change any more either, so keep it as a tuple.
+        self._stackup = tuple(self._stackup)
+        # A static chip cannot change, so build its chip list now.
+        self.get_chip_list()
         return 0    
 
     def __perform_calculations(self):
         """Helper function to run all cost, yield, power, and area calculations."""
         # This function centralizes the calculation calls that happen after initialization.
         #self.set_stack_power(self.compute_stack_power())
-        self.stack_power = self.compute_stack_power()
-        self.io_power = self.get_signal_power(self.get_chip_list())
-
-        if self.bb_power is None:
-            self.total_power = self.power + self.io_power + self.stack_power
-        else:
-            self.total_power = self.bb_power + self.stack_power
+        # The power values are computed here from already validated inputs, so they are added as local floats
+        # and written to the private attributes without going through the setters.
+        stack_power = self.compute_stack_power()
+        io_power = self.get_signal_power(self.get_chip_list())
+        if self._bb_power is None:
+            total_power = self._power + io_power + stack_power
+        else:
+            total_power = self._bb_power + stack_power
+        self._stack_power = stack_power
+        self._io_power = io_power
+        self._total_power = total_power
 
         self.nre_design_cost = self.compute_nre_design_cost()
+        # The area weighted gate flop ratio of the assembly only depends on the chips in it,
+        # so derive it once here instead of in every assembly test cost estimate.
+        self.assembly_gate_flop_ratio = self.test_process.assembly_gate_flop_ratio(self)
         self.area = self.compute_area()
         self.self_true_yield = self.compute_layer_aware_yield()
         self.self_test_yield = self.test_process.compute_self_test_yield(self)
@@ -3271,43 +3381,90 @@ class Chip:
         self.self_cost = self.compute_self_cost()
         self.cost = self.compute_cost()
     
+    @subtree_cached
     def face_stack_power(self) -> float:
         """Calculates the power consumed by all chips stacked on the face of this chip."""
-        face_stack_power = 0.0
-        for chip in self.face_chips:
-            face_stack_power += chip.total_power
-        return face_stack_power
+        return float(self.stacked_values(StackSide.FACE, "total_power").sum())
 
+    @subtree_cached
     def back_stack_power(self) -> float:
         """Calculates the power consumed by all chips stacked on the back of this chip."""
-        back_stack_power = 0.0
-        for chip in self.back_chips:
-            back_stack_power += chip.total_power
-        return back_stack_power
+        return float(self.stacked_values(StackSide.BACK, "total_power").sum())
 
+    @subtree_cached
     def compute_stack_power(self) -> float:
+        # Most chips are leaves with nothing stacked on them, so skip both sums for those.
+        if not self.face_chips and not self.back_chips:
+            return 0.0
         stack_power = self.face_stack_power() + self.back_stack_power()
         # stack_power = 0.0
         # for chip in self.face_chips:
             # stack_power += chip.total_power
         return stack_power
 
+    def stacked_values(self, stack_side, attribute):
+        # The values of an attribute of the chips stacked on the given side, as a float array in stacking order.
+        # The array is cached in _cache with the subtree results, since it is cleared whenever the stacked chips change.
+        key = (stack_side, attribute)
+        values = self._cache.get(key)
+        if values is None:
+            chips = self._face_chips if stack_side == StackSide.FACE else self._back_chips
+            values = np.fromiter((getattr(chip, attribute) for chip in chips), dtype=np.float64, count=len(chips))
+            self._cache[key] = values
+        return values
+
+    # Above this many stacked chips, add_stacked_values() is faster than adding the values in a Python loop.
+    _ARRAY_SUM_FANOUT = 16
+
+    def add_stacked_values(self, total, attribute):
+        # Adds the values of an attribute of all stacked chips, face chips first, to total.
+        # np.cumsum adds one value at a time, so the result is the same as that of a loop over get_stacked_chips().
+        values = np.concatenate(((total,), self.stacked_values(StackSide.FACE, attribute),
+                                 self.stacked_values(StackSide.BACK, attribute)))
+        return float(np.cumsum(values)[-1])
+
+    # Results of the find_* and build_stackup calls made while building a hierarchy, keyed by
+    # (lookup function name, definition name, id of the definition list). Cleared when a root chip is built.
+    _lookup_cache = {}
+
+    def __memoized_lookup(self, lookup, name, definition_list):
+        key = (lookup.__name__, name, id(definition_list))
+        cache = Chip._lookup_cache
+        result = cache.get(key)
+        if result is None:
+            # The lookups raise if nothing is found, so a stored result is never None.
+            result = lookup(name, definition_list)
+            cache[key] = result
+        return result
+
+    @staticmethod
+    def definition_index(definition_list, key):
+        # Maps the key attribute ("name" or "type") of each definition object in the list to the first object with that value.
+        # The map is built once per list and kept in _lookup_cache. It is rebuilt if the length of the list changes.
+        cache_key = ("definition_index", key, id(definition_list))
+        cached = Chip._lookup_cache.get(cache_key)
+        if cached is not None and cached[0] == len(definition_list):
+            return cached[1]
+        index = {}
+        for p in definition_list:
+            index.setdefault(getattr(p, key), p)
+        Chip._lookup_cache[cache_key] = (len(definition_list), index)
+        return index
+
     def find_process(self, process_name, process_list):
         # Generic helper to find a process object in a list by its name.
-        for p in process_list:
-            if p.name == process_name:
-                return p
-        print(f"Error: Process '{process_name}' not found in the provided list.")
-        return None
+        # The object from the list is returned as is, so all chips using a process share one instance.
+        # None is returned if there is no such process. Every caller raises a ConfigurationError naming it then.
+        return Chip.definition_index(process_list, "name").get(process_name)
 
     def find_io_type(self, io_type, io_list):
         # Function to find IO type since IO does not have a name field.
         # In the future, this should probably be standardized to include a name field.
-        for p in io_list:
-            if p.type == io_type:
-                return p
-        print(f"Error: Process '{io_type}' not found in the provided list.")
-        return None
+        # The IO area and signal power get the IO definitions from NetlistArrays.io_table(), which reports a missing IO type the same way.
+        p = Chip.definition_index(io_list, "type").get(io_type)
+        if p is None:
+            print(f"Error: IO type '{io_type}' not found in the provided list.")
+        return p
 
     def find_wafer_process(self, wafer_process_name, wafer_process_list):
         wafer_process = self.find_process(wafer_process_name, wafer_process_list)
@@ -3349,58 +3506,99 @@ class Chip:
 
     # ===== Other Getters (Directly computed or from sub-objects) =====
 
+    def iter_subtree(self):
+        # Walks this chip and every chip stacked on it in pre-order (self, face chips, back chips)
+        # using an explicit stack, so deep stacks do not pay for one Python frame per level.
+        stack = collections.deque([self])
+        while stack:
+            chip = stack.pop()
+            yield chip
+            stack.extend(reversed(chip.back_chips))
+            stack.extend(reversed(chip.face_chips))
+
+    @subtree_cached
+    def get_subtree(self):
+        # The chips of iter_subtree() as a list, built once and cached, so repeated walks are a plain loop over a list.
+        # Callers must not modify it. The list is filled by the same explicit stack walk without going through the generator.
+        subtree = []
+        stack = [self]
+        while stack:
+            chip = stack.pop()
+            subtree.append(chip)
+            stack.extend(reversed(chip._back_chips))
+            stack.extend(reversed(chip._face_chips))
+        return subtree
+
+    @subtree_cached
     def get_assembly_core_area(self) -> float:
-        assembly_core_area = self.core_area
-        for chip in self.face_chips:
-            assembly_core_area += chip.get_assembly_core_area()
-        for chip in self.back_chips:
-            assembly_core_area += chip.get_assembly_core_area()
-        # for chip in self.chips:
-            # assembly_core_area += chip.get_assembly_core_area()
+        assembly_core_area = 0.0
+        for chip in self.get_subtree():
+            assembly_core_area += chip.core_area
         return assembly_core_area
 
+    def compute_number_of_routing_tracks(self, areas, aspect_ratios):
+        # Total routing tracks of this chip's stackup that can escape from under each die of the given areas and aspect ratios.
+        # Same as adding Layer.compute_number_of_routing_tracks over the stackup, for all dies and layers in one (dies x layers) pass.
+        areas = np.asarray(areas, dtype=np.float64)
+        widths = np.sqrt(areas * aspect_ratios)
+        heights = areas / widths
+        stackup_array = self._stackup_array
+        routing_tracks = np.multiply.outer(2 * (widths + heights), stackup_array["routing_layer_count"]) / stackup_array["routing_layer_pitch"]
+        return routing_tracks.sum(axis=-1)
+
+    def check_routing_congestion(self):
+        # Warns about each chip stacked on this one that needs more escape routing tracks than this chip's stackup provides.
+        chips = self.get_stacked_chips()
+        if not chips:
+            return
+        num_tracks = self.compute_number_of_routing_tracks([chip.area for chip in chips], [chip.aspect_ratio for chip in chips])
+        escape_wires = np.array([chip.get_signal_count(chip.get_chip_list())[0] + chip.test_process.num_test_ios() for chip in chips])
+        for i in np.flatnonzero(np.less(num_tracks, escape_wires)):
+            print("Warning: The number of excape routing tracks available on the parent chip is less than the number of routing tracks required by " + str(chips[i].name) + ".")
+
     def get_self_gates_per_mm2(self) -> float:
-        self_gates_per_mm2 = 0.0
-        for layer in self.stackup:
-            if layer.active:
-                self_gates_per_mm2 += layer.get_gates_per_mm2()
-        return self_gates_per_mm2
+        # Set with the stackup.
+        return self._self_gates_per_mm2
 
+    @subtree_cached
     def get_assembly_gates_per_mm2(self) -> float:
         total_core_area = self.get_assembly_core_area()
         if total_core_area == 0:
             return 0.0
         
         weighted_gates_sum = self.get_self_gates_per_mm2() * self.core_area
-        for chip in self.face_chips:
-            weighted_gates_sum += chip.get_assembly_gates_per_mm2() * chip.get_assembly_core_area()
-        for chip in self.back_chips:
+        for chip in self.get_stacked_chips():
             weighted_gates_sum += chip.get_assembly_gates_per_mm2() * chip.get_assembly_core_area()
         # for chip in self.chips:
             # weighted_gates_sum += chip.get_assembly_gates_per_mm2() * chip.get_assembly_core_area()
 
         return weighted_gates_sum / total_core_area
     
+    @subtree_cached
+    def get_stacked_chips(self):
+        # The face chips followed by the back chips as one tuple, for the sums that do not depend on the stack side.
+        return self._face_chips + self._back_chips
+
     def get_chips_len(self) -> int:
         # return len(self.chips)
-        return len(self.face_chips) + len(self.back_chips)
+        return len(self.get_stacked_chips())
 
+    @subtree_cached
     def get_stacked_die_area(self) -> float:
         # Calculates the area required by the stack of chips on this interposer/chip,
         # including separation and edge exclusion.
-        face_area = 0.0
-        for chip in self.face_chips:
-            if not chip.buried:
-                # Expand each child chip's area by the die separation distance.
-                temp_area = self.expandedArea(chip.area, self.assembly_process.die_separation/2, chip.aspect_ratio)
-                face_area += temp_area
-        back_area = 0.0
-        for chip in self.back_chips:
-            if not chip.buried:
-                # Expand each child chip's area by the die separation distance.
-                temp_area = self.expandedArea(chip.area, self.assembly_process.die_separation/2, chip.aspect_ratio)
-                back_area += temp_area
-        stacked_die_area = max(face_area, back_area)
+        # Expand each child chip's area by the die separation distance, for all unburied chips on a side at once.
+        border = self.assembly_process.die_separation/2
+        border_width = 2*border
+        side_areas = []
+        for side in (StackSide.FACE, StackSide.BACK):
+            area = self.stacked_values(side, "area")
+            aspect_ratio = self.stacked_values(side, "aspect_ratio")
+            x = np.sqrt(area*aspect_ratio)
+            y = np.sqrt(area/aspect_ratio)
+            expanded_area = np.where(area <= 0.0, 0.0, (x+border_width)*(y+border_width))
+            side_areas.append(float(expanded_area[self.stacked_values(side, "buried") == 0].sum()))
+        stacked_die_area = max(side_areas)
         # for chip in self.chips:
         #     if not chip.buried:
         #         # Expand each child chip's area by the die separation distance.
@@ -3427,12 +3625,39 @@ class Chip:
         return back_end_cost
 
     def compute_nre_design_cost(self) -> float:
-        nre_design_cost = self.compute_nre_front_end_cost() + self.compute_nre_back_end_cost()
-        return nre_design_cost
+        # Chips with the same NRE rates, area, and circuit mix share one result. The cache is keyed on the rates
+        # themselves rather than the wafer process object, so a process whose rates change is never served a stale cost.
+        wafer_process = self.wafer_process
+        return Chip.shared_nre_design_cost(wafer_process.nre_front_end_cost_per_mm2_memory,
+                                           wafer_process.nre_front_end_cost_per_mm2_logic,
+                                           wafer_process.nre_front_end_cost_per_mm2_analog,
+                                           wafer_process.nre_back_end_cost_per_mm2_memory,
+                                           wafer_process.nre_back_end_cost_per_mm2_logic,
+                                           wafer_process.nre_back_end_cost_per_mm2_analog,
+                                           self.core_area, self.fraction_memory, self.fraction_logic, self.fraction_analog)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=4096)
+    def shared_nre_design_cost(front_end_memory, front_end_logic, front_end_analog, back_end_memory, back_end_logic, back_end_analog,
+                               core_area, fraction_memory, fraction_logic, fraction_analog) -> float:
+        # Front end plus back end NRE design cost, the same sums as compute_nre_front_end_cost and compute_nre_back_end_cost.
+        front_end_cost = core_area*(front_end_memory*fraction_memory +
+                                    front_end_logic*fraction_logic +
+                                    front_end_analog*fraction_analog)
+        back_end_cost = core_area*(back_end_memory*fraction_memory +
+                                   back_end_logic*fraction_logic +
+                                   back_end_analog*fraction_analog)
+        return front_end_cost + back_end_cost
 
     def __str__(self):
         """String representation of the chip with detailed description."""
         lines = []
+        self.__describe(lines)
+        return "\n".join(lines)
+
+    def __describe(self, lines):
+        # Appends the description lines of this chip and the chips stacked on it to lines.
+        # The stacked chips append to the same list, so the description is joined once however deep the stack is.
         lines.append(f"--- Chip Description: {self.name} ---")
         lines.append(f"  Wafer Process: {self.wafer_process.name}, Assembly: {self.assembly_process.name}, Test: {self.test_process.name}")
         if self.bb_area or self.bb_cost or self.bb_quality or self.bb_power:
@@ -3457,12 +3682,12 @@ class Chip:
         if self.face_chips:
             lines.append(f"  --- Stacked Chips on Face ({len(self.face_chips)}) ---")
             for chip in self.face_chips:
-                lines.append(str(chip))
+                chip.__describe(lines)
             lines.append(f"  --- End Stack for {self.name} (Face) ---")
         if self.back_chips:
             lines.append(f"  --- Stacked Chips on Back ({len(self.back_chips)}) ---")
             for chip in self.back_chips:
-                lines.append(str(chip))
+                chip.__describe(lines)
             lines.append(f"  --- End Stack for {self.name} (Back) ---")
         # if self.chips:
         #     lines.append(f"  --- Stacked Chips ({len(self.chips)}) ---")
@@ -3470,8 +3695,6 @@ class Chip:
         #         lines.append(str(chip))
         #     lines.append(f"  --- End Stack for {self.name} ---")
         lines.append(f"--- End Description: {self.name} ---\n")
-        
-        return "\n".join(lines)
 
     def print_description(self):
         """Print chip description. Kept for backward compatibility."""
@@ -3481,28 +3704,50 @@ class Chip:
         # Calculates the new area after adding a border around an existing area.
         if area <= 0.0:
             return 0.0
+        border_width = 2*border
+        if aspect_ratio == 1.0:
+            # Square, as for the edge exclusion: both sides are sqrt(area), exactly as the general formula gives.
+            x = math.sqrt(area)
+            side = x+border_width
+            return side*side
         x = math.sqrt(area*aspect_ratio)
         y = math.sqrt(area/aspect_ratio)
-        new_area = (x+2*border)*(y+2*border)
+        new_area = (x+border_width)*(y+border_width)
         return new_area
 
+    @subtree_cached
+    def get_block_index(self):
+        # The index of this chip in the netlist block names, or None if the chip is not in the netlist.
+        if self.name in self.block_names:
+            return self.block_names.index(self.name)
+        return None
+
+    @subtree_cached
+    def get_external_block_mask(self):
+        # True for the netlist blocks that are neither this chip nor stacked on it.
+        return ~np.isin(self.block_names, self.get_chip_list())
+
+    @subtree_cached
     def get_io_area(self):
         # Calculates the total area required by the I/O cells based on the netlist.
         io_area = 0.0
-        try:
-            block_index = self.block_names.index(self.name)
-        except ValueError:
+        block_index = self.get_block_index()
+        if block_index is None:
             # This chip is not in the netlist, so it has no direct IOs.
             return 0.0
-            
-        for io_type in self.global_adjacency_matrix:
-            io = self.find_io_type(io_type, self.io_list)
-            if io:
-                # Sum connections from this chip to others (TX) and from others to this chip (RX).
-                tx_connections = np.sum(self.global_adjacency_matrix[io_type][block_index, :])
-                rx_connections = np.sum(self.global_adjacency_matrix[io_type][:, block_index])
-                io_area += tx_connections * io.tx_area + rx_connections * io.rx_area
-        return io_area
+
+        netlist = self._netlist
+        found, ios = netlist.io_table(self.io_list)
+        if found.size == 0:
+            return io_area
+        # Sum connections from this chip to others (TX) and from others to this chip (RX), for all IO types at once.
+        tx_connections = netlist.adjacency[found, block_index, :].sum(axis=-1)
+        # The column sums are only read for the IO types with an asymmetric matrix.
+        asymmetric = np.flatnonzero(~netlist.symmetric[found])
+        rx_connections = tx_connections.copy()
+        if asymmetric.size:
+            rx_connections[asymmetric] = netlist.adjacency_transposed[found[asymmetric], block_index, :].sum(axis=-1)
+        return (tx_connections * ios.tx_area + rx_connections * ios.rx_area).sum()
 
     def get_power_pads(self):
         # Calculates the number of pads required for power and ground.
@@ -3513,45 +3758,48 @@ class Chip:
         num_power_delivery_pads = math.ceil(self.total_power / power_per_pad) * 2
         return num_power_delivery_pads
 
+    # The pad counts of a chip from compute_pad_counts():
+    #   power, test, signal: The power and ground, test, and signal pads of the chip itself.
+    #   signal_with_reach_count: The signal count of each reach, as returned by get_signal_count.
+    #   pads: All pads of the chip, including the pads of the chips stacked on the side facing away from the silicon.
+    #   face, back: The pads on the face and on the back of the chip.
+    _PadCounts = collections.namedtuple("ChipPadCounts", ["power", "test", "signal", "signal_with_reach_count", "pads", "face", "back"])
+
+    @subtree_cached
+    def compute_pad_counts(self):
+        # Counts all pads of the chip in one pass over the chips stacked on it, so the pad count, the face and back pad
+        # counts, the TSV count, and the pad area do not each walk the stacked chips again.
+        num_power_pads = self.get_power_pads()
+        num_test_pads = self.test_process.num_test_ios()
+        signal_pads, signal_with_reach_count = self.get_signal_count(self.get_chip_list())
+        face_chip_pads = 0
+        for chip in self.face_chips:
+            face_chip_pads += chip.get_pad_count()
+        back_chip_pads = 0
+        for chip in self.back_chips:
+            back_chip_pads += chip.get_pad_count()
+        # The orientation code indexes the choices below (FACE_UP is 0, FACE_DOWN is 1) instead of branching.
+        # A face-up chip has its back towards the parent chip, so the pads of its back chips pass through its back pads,
+        # and its face pads are only those of its face chips. A face-down chip is the other way around.
+        orientation = self._orientation
+        num_pads = signal_pads + num_power_pads + num_test_pads
+        num_pads += (back_chip_pads, face_chip_pads)[orientation]
+        face_pad_count = (face_chip_pads, num_pads)[orientation]
+        back_pad_count = (num_pads, back_chip_pads)[orientation]
+        return Chip._PadCounts(num_power_pads, num_test_pads, signal_pads, signal_with_reach_count, num_pads,
+                               face_pad_count, back_pad_count)
+
     def get_pad_count(self):
         """
         Returns the total number of pads required for this chip (power pads + test pads + signal pads).
         """
-        num_power_pads = self.get_power_pads()
-        num_test_pads = self.test_process.num_test_ios()
-        signal_pads, _ = self.get_signal_count(self.get_chip_list())
-        num_pads = signal_pads + num_power_pads + num_test_pads
-        if self.orientation == "face-up":
-            for chip in self.back_chips:
-                num_pads += chip.get_pad_count()
-        else:
-            for chip in self.face_chips:
-                num_pads += chip.get_pad_count()
-        return num_pads
+        return self.compute_pad_counts().pads
 
     def get_face_pad_count(self):
-        face_pad_count = 0
-        if self.orientation == "face-up":
-            # Count the pads facing away from the parent chip.
-            face_pad_count = 0
-            for chip in self.face_chips:
-                face_pad_count += chip.get_pad_count()
-        else:
-            # Count the pads facing towards the parent chip.
-            face_pad_count = self.get_pad_count()
-        return face_pad_count
+        return self.compute_pad_counts().face
 
     def get_back_pad_count(self):
-        back_pad_count = 0
-        if self.orientation == "face-up":
-            # Count the pads facing towards the parent chip.
-            back_pad_count = self.get_pad_count()
-        else:
-            # Count the pads facing away from the parent chip.
-            back_pad_count = 0
-            for chip in self.back_chips:
-                back_pad_count += chip.get_pad_count()
-        return back_pad_count
+        return self.compute_pad_counts().back
 
     def get_tsv_count(self):
         # This is just an alias for get_back_pad_count
@@ -3565,124 +3813,52 @@ class Chip:
         tsv_area = self.assembly_process.tsv_area * tsv_count
         return tsv_area
 
+    @subtree_cached
     def get_pad_area(self):
-        num_power_pads = self.get_power_pads()
-        num_test_pads = self.test_process.num_test_ios()
-        signal_pads, signal_with_reach_count = self.get_signal_count(self.get_chip_list())
-        num_pads = signal_pads + num_power_pads + num_test_pads
+        pad_counts = self.compute_pad_counts()
+        signal_with_reach_count = pad_counts.signal_with_reach_count
+        num_pads = pad_counts.signal + pad_counts.power + pad_counts.test
         # print("num pads = " + str(num_pads))
 
         parent_chip = self.parent_chip
         if parent_chip is not None:
             bonding_pitch = max(parent_chip.assembly_process.bonding_pitch, self.assembly_process.bonding_pitch)
-            if self.stack_side == "back":
+            if self._stack_side == StackSide.BACK:
                 bonding_pitch = max(bonding_pitch, parent_chip.assembly_process.tsv_pitch)
-                if self.orientation == "face-up":
+                if self._orientation == Orientation.FACE_UP:
                     bonding_pitch = max(bonding_pitch, self.assembly_process.tsv_pitch)
             else:
-                if self.orientation == "face-up":
+                if self._orientation == Orientation.FACE_UP:
                     bonding_pitch = max(bonding_pitch, self.assembly_process.tsv_pitch)
         else:
             bonding_pitch = self.assembly_process.bonding_pitch
-        area_per_pad = bonding_pitch**2
+        area_per_pad = bonding_pitch*bonding_pitch
 
         under_stacked_chip_area = 0.0
-        if self.orientation == "face-up":
-            for chip in self.back_chips:
-                under_stacked_chip_area += chip.area
+        # The chips stacked on the side of the pads: the back of a face-up chip, the face of a face-down chip.
+        for chip in (self.back_chips, self.face_chips)[self._orientation]:
+            under_stacked_chip_area += chip.area
+
+        # The keys of the signal_with_reach_count dictionary are the reaches, sorted from smallest to largest.
+        reaches = sorted(signal_with_reach_count)
+        if parent_chip is not None:
+            die_separation = parent_chip.assembly_process.die_separation
         else:
-            for chip in self.face_chips:
-                under_stacked_chip_area += chip.area
-
-        # Create a list of reaches by taking the keys from the signal_with_reach_count dictionary and converting to floats.
-        reaches = [float(key) for key in signal_with_reach_count.keys()]
-        # Sort the reaches from smallest to largest.
-        reaches.sort()
-        #current_side = 0.0
-        current_x = 0.0
-        current_y = 0.0
-        current_count = 0
-        for reach in reaches:
-            # Note that half of the reach with separation value is the valid placement band.
-            if parent_chip is not None:
-                reach_with_separation = reach - parent_chip.assembly_process.die_separation
-            else:
-                reach_with_separation = reach - self.assembly_process.die_separation
-            if reach_with_separation < 0:
-                raise CalculationError("Reach is smaller than chip separation.")
-            current_count += signal_with_reach_count[str(reach)]
-            # Find the minimum boundary that would contain all the pads with the current reach.
-            required_area = current_count*area_per_pad + under_stacked_chip_area
-            if reach_with_separation < current_x and reach_with_separation < current_y: 
-                #usable_area = 2*reach_with_separation*current_side - reach_with_separation**2
-                # x*(reach_with_separation/2) is the placement band along a single edge.
-                usable_area = reach_with_separation*(current_x+current_y) - reach_with_separation**2
-            else:
-                #usable_area = current_side**2
-                usable_area = current_x*current_y
-            if usable_area <= required_area:
-                # Note that required_x and required_y are minimum. The real values are likely larger.
-                required_x = math.sqrt(required_area*self.aspect_ratio)
-                required_y = math.sqrt(required_area/self.aspect_ratio)
-                if required_x > reach_with_separation and required_y > reach_with_separation:
-                    # Work for computing the formulas below:
-                    # required_area = 2*(new_req_x - (reach_with_separation/2)) * (reach_with_separation/2) + 2*(new_req_y - (reach_with_separation/2)) * (reach_with_separation/2)
-                    # required_area = (2*new_req_x - reach_with_separation) * (reach_with_separation/2) + (2*new_req_y - reach_with_separation) * (reach_with_separation/2)
-                    # required_area = (2*new_req_x + 2*new_req_y - 2*reach_with_separation) * (reach_with_separation/2)
-                    # new_req_x = aspect_ratio*new_req_y
-                    # 2*aspect_ratio*new_req_y + 2*new_req_y = (2*required_area/reach_with_separation) + 2*reach_with_separation
-                    # new_req_y*(2*aspect_ratio + 2) = (2*required_area/reach_with_separation) + 2*reach_with_separation
-                    # new_req_y = ((2*required_area/reach_with_separation) + 2*reach_with_separation)/(2*aspect_ratio + 2)
-                    new_req_y = ((2*required_area/reach_with_separation) + 2*reach_with_separation)/(2*self.aspect_ratio + 2)
-                    new_req_x = self.aspect_ratio*new_req_y
-                else:
-                    new_req_x = required_x
-                    new_req_y = required_y
-                # Round up to the nearest multiple of bonding pitch.
-                new_req_x = math.ceil(new_req_x/bonding_pitch)*bonding_pitch
-                new_req_y = math.ceil(new_req_y/bonding_pitch)*bonding_pitch
-                if new_req_x > current_x:
-                    current_x = new_req_x
-                if new_req_y > current_y:
-                    current_y = new_req_y
-
-        # TODO: This is not strictly accurate. The aspect ratio requirement may break down when the chip becomes pad limited.
-        #       Consider updating this if the connected placement tool does not account for pad area.
-        required_area = area_per_pad * num_pads #current_x * current_y #current_side**2
-        if required_area <= current_x*current_y:
-            grid_x = math.ceil(current_x / bonding_pitch)
-            grid_y = math.ceil(current_y / bonding_pitch)
-        else:
-            # Expand shorter side until sides are the same length, then expand both.
-            if current_x < current_y:
-                # Y is larger
-                if current_y**2 <= required_area:
-                    grid_y = math.ceil(current_y / bonding_pitch)
-                    grid_x = math.ceil((required_area/current_y) / bonding_pitch)
-                else:
-                    required_side = math.sqrt(required_area)
-                    grid_x = math.ceil(required_side / bonding_pitch)
-                    grid_y = grid_x
-            elif current_y < current_x:
-                # X is larger
-                if current_x**2 <= required_area:
-                    grid_x = math.ceil(current_x / bonding_pitch)
-                    grid_y = math.ceil((required_area/current_x) / bonding_pitch)
-                else:
-                    required_side = math.sqrt(required_area)
-                    grid_x = math.ceil(required_side / bonding_pitch)
-                    grid_y = grid_x
-            else:
-                # Both are the same size
-                required_side = math.sqrt(required_area)
-                grid_x = math.ceil(required_side / bonding_pitch)
-                grid_y = grid_x
+            die_separation = self.assembly_process.die_separation
+        # The smallest reach comes first, so checking it covers every reach.
+        if reaches and reaches[0] - die_separation < 0:
+            raise CalculationError("Reach is smaller than chip separation.")
+        grid_x, grid_y = pad_grid(np.array(reaches, dtype=np.float64),
+                                  np.array([signal_with_reach_count[reach] for reach in reaches], dtype=np.float64),
+                                  area_per_pad, bonding_pitch, die_separation, self.aspect_ratio,
+                                  under_stacked_chip_area, num_pads)
 
         pad_area = grid_x * grid_y * area_per_pad
         # print("Pad area is " + str(pad_area) + ".")
 
         return pad_area
 
+    @subtree_cached
     def compute_area(self):
         # The final area of the chip is the maximum of three factors:
         # 1. The core logic/memory area plus its own I/O cells.
@@ -3698,147 +3874,100 @@ class Chip:
         chip_area = max(stacked_die_bound_area, pad_required_area, chip_io_area)
         return chip_area
         
+    @subtree_cached
     def compute_layer_aware_yield(self) -> float:
         # The intrinsic yield of the chip itself, based on its layer stackup.
         layer_yield = 1.0
         # Total area susceptible to defects is the core area plus the I/O cell area.
         defect_area = self.core_area + self.get_io_area()
-        for layer in self.stackup:
-            layer_yield *= layer.layer_yield(defect_area)
+        stackup_runs = self._stackup_runs
+        layer_yield *= float(stackup_defect_yield(stackup_runs["defect_density"], stackup_runs["critical_area_ratio"],
+                                                  stackup_runs["clustering_factor"], self._stackup_run_lengths, defect_area))
         return layer_yield
 
+    @subtree_cached
     def quality_yield(self) -> float:
         # The probability that all component chips received for assembly are actually good,
         # given that they passed their own tests.
         quality_yield = 1.0
-        for chip in self.face_chips:
-            quality_yield *= chip.self_quality
-        for chip in self.back_chips:
-            quality_yield *= chip.self_quality
+        quality_yield *= float(self.stacked_values(StackSide.FACE, "self_quality").prod())
+        quality_yield *= float(self.stacked_values(StackSide.BACK, "self_quality").prod())
         # for chip in self.chips:
         #     quality_yield *= chip.quality
         return quality_yield
 
     def get_signal_count(self,internal_block_list):
-        # print("Getting signal count")
-        signal_count = 0
-        # This is a dictionary where the key is the reach and the value is the number of signals with that reach.
+        # Counts the signals between this chip and the blocks that are not in internal_block_list, in total and by reach.
+        # Most callers pass this chip's own chip list, whose mask is cached.
+        if internal_block_list is self.get_chip_list():
+            return self.count_external_signals(self.get_external_block_mask())
+        return self.count_external_signals(~np.isin(self.block_names, internal_block_list))
+
+    def count_external_signals(self, is_external):
+        # Counts the signals between this chip and the netlist blocks where is_external is True, in total and by reach.
+        # This is a dictionary where the key is the reach as a float and the value is the number of signals with that reach.
         signal_with_reach_count = {}
 
-        block_index = None
-        internal_block_list_indices = []
-        for i in range(len(self.block_names)):
-            if self.block_names[i] == self.name:
-                block_index = i
-            if self.block_names[i] in internal_block_list:
-                internal_block_list_indices.append(i)
+        block_index = self.get_block_index()
         if block_index is None:
             #print("Warning: Chip " + self.name + " not found in block list netlist: " + str(self.block_names) + ". This can be ignored if the chip is a pass-through chip.")
             return 0, {}
-        for io_type in self.global_adjacency_matrix:
-            # TODO: Fix this when the adjacency matrix is properly implemented.
-            for io in self.io_list:
-                if io.type == io_type:
-                    break
-            if io.bidirectional:
-                bidirectional_factor = 0.5
-            else:
-                bidirectional_factor = 1.0
-            # Add all the entries in the row and column of the global adjacency matrix with the index correesponding to the name of the chip and weight with the wire_count of the IO type.
-            for j in range(len(self.global_adjacency_matrix[io_type][block_index][:])):
-                # print("Internal block list indices = " + str(internal_block_list_indices) + ".")
-                # print("Adjacency matrix:" + str(self.global_adjacency_matrix[io_type][:][:]))
-                if j not in internal_block_list_indices:
-                    # print("Adding to signal count for " + self.block_names[j] + ".")
-                    # print("io signal width = " + str(io.get_wire_count()) + ".")
-                    # print("Signal count before = " + str(signal_count) + ".")
-                    signal_count += (self.global_adjacency_matrix[io_type][block_index][j] + self.global_adjacency_matrix[io_type][j][block_index]) * io.wire_count * bidirectional_factor
-                    # print("Signal count after = " + str(signal_count) + ".")
-                    if str(io.reach) in signal_with_reach_count:
-                        signal_with_reach_count[str(io.reach)] += (self.global_adjacency_matrix[io_type][block_index][j] + self.global_adjacency_matrix[io_type][j][block_index]) * io.wire_count * bidirectional_factor
-                    else:
-                        signal_with_reach_count[str(io.reach)] = (self.global_adjacency_matrix[io_type][block_index][j] + self.global_adjacency_matrix[io_type][j][block_index]) * io.wire_count * bidirectional_factor
-            #signal_count += (sum(self.global_adjacency_matrix[io_type][block_index][:]) + sum(self.global_adjacency_matrix[io_type][:][block_index])) * io.wire_count
-        
-        # print("Signal count = " + str(signal_count) + ".")
-        # print("Signal with reach count = " + str(signal_with_reach_count) + ".")
-
-        # print()
+        netlist = self._netlist
+        if not netlist.io_types or not is_external.any():
+            return 0, {}
+        # Add all the entries in the row and column of the global adjacency matrix with the index corresponding to the
+        # name of the chip, over the external blocks and for all IO types at once.
+        connections = (netlist.adjacency[:, block_index, :] + netlist.adjacency_transposed[:, block_index, :])[:, is_external].sum(axis=-1)
+        # Weight with the wire_count of the IO type.
+        wire_weights, reaches = netlist.signal_weights(self.io_list)
+        signals = connections * wire_weights
+        for t in range(len(reaches)):
+            signal_with_reach_count[reaches[t]] = signal_with_reach_count.get(reaches[t], 0.0) + signals[t]
+        signal_count = signals.sum()
 
         return signal_count, signal_with_reach_count
 
-    # def get_signal_count(self, internal_block_list):
-    #     # Counts the number of signal wires connecting this chip to external blocks.
-    #     signal_count = 0
-    #     signal_with_reach_count = {} # This is not currently used but could be for more detailed analysis.
-
-    #     try:
-    #         block_index = self.block_names.index(self.name)
-    #     except ValueError:
-    #         return 0, {}
-
-    #     # Vectorized approach to find external block indices
-    #     num_blocks = len(self.block_names)
-    #     is_internal = np.zeros(num_blocks, dtype=bool)
-    #     internal_indices = [self.block_names.index(name) for name in internal_block_list if name in self.block_names]
-    #     is_internal[internal_indices] = True
-    #     is_external = ~is_internal
-
-    #     for io_type in self.global_adjacency_matrix:
-    #         io = self.find_io_type(io_type, self.io_list)
-    #         if io:
-    #             bidirectional_factor = 0.5 if io.bidirectional else 1.0
-    #             adj_matrix = self.global_adjacency_matrix[io_type]
-                
-    #             # Sum connections to (TX) and from (RX) all external blocks
-    #             tx_connections = np.sum(adj_matrix[block_index, is_external])
-    #             rx_connections = np.sum(adj_matrix[is_external, block_index])
-                
-    #             connections = tx_connections + rx_connections
-    #             signal_count += connections * io.wire_count * bidirectional_factor
-                
-    #     return signal_count, signal_with_reach_count
-
     def get_signal_power(self,internal_block_list) -> float:
         # Calculates the power consumed by signal I/O.
         signal_power = 0.0
-        try:
-            block_index = self.block_names.index(self.name)
-        except ValueError:
+        block_index = self.get_block_index()
+        if block_index is None:
             return 0.0
 
-        for io_type in self.global_adjacency_matrix:
-            io = self.find_io_type(io_type, self.io_list)
-            if io:
-                bidirectional_factor = 0.5 if io.bidirectional else 1.0
-                # Sum the bandwidth of all connections, element-wise weighted by utilization.
-                tx_bw = np.sum(self.global_adjacency_matrix[io_type][block_index,:] * self.average_bandwidth_utilization[io_type][block_index,:])
-                rx_bw = np.sum(self.global_adjacency_matrix[io_type][:,block_index] * self.average_bandwidth_utilization[io_type][:,block_index])
-                total_utilized_bw = (tx_bw + rx_bw) * bidirectional_factor
-                # Power = (Total Gbps) * (pJ/bit) = (Total bits/s * 1e-9) * (Joules/bit * 1e-12) -> needs conversion
-                # Power (W) = (Gbps * 1e9) * (pJ/bit * 1e-12)
-                signal_power += total_utilized_bw * io.bandwidth * io.energy_per_bit * 1e-3
-        return signal_power
-
+        netlist = self._netlist
+        found, ios = netlist.io_table(self.io_list)
+        if found.size == 0:
+            return signal_power
+        bidirectional_factor = np.where(ios.bidirectional, 0.5, 1.0)
+        # Sum the bandwidth of all connections, element-wise weighted by utilization, for all IO types at once.
+        tx_bw = netlist.utilized_bandwidth[found, block_index, :].sum(axis=-1)
+        rx_bw = netlist.utilized_bandwidth_transposed[found, block_index, :].sum(axis=-1)
+        total_utilized_bw = (tx_bw + rx_bw) * bidirectional_factor
+        # Power = (Total Gbps) * (pJ/bit) = (Total bits/s * 1e-9) * (Joules/bit * 1e-12) -> needs conversion
+        # Power (W) = (Gbps * 1e9) * (pJ/bit * 1e-12)
+        return (total_utilized_bw * ios.bandwidth * ios.energy_per_bit * 1e-3).sum()
+
+    @subtree_cached
     def get_chip_list(self):
-        # Recursively build a flat list of all chip names in the current assembly stack.
-        chip_list = [self.name]
-        for chip in self.face_chips:
-            chip_list.extend(chip.get_chip_list())
-        for chip in self.back_chips:
-            chip_list.extend(chip.get_chip_list())
-        # for chip in self.chips:
-        #     chip_list.extend(chip.get_chip_list())
-        return chip_list
-
+        # Build a flat list of all chip names in the current assembly stack, in the pre-order of get_subtree().
+        # The list is cached, so callers must not modify it.
+        return [chip.name for chip in self.get_subtree()]
+
+    def _invalidate_cache(self):
+        # The cached results of this chip and every chip it is stacked on depend on this chip.
+        chip = self
+        while chip is not None:
+            chip._cache.clear()
+            chip = chip.parent_chip
+
+    @subtree_cached
     def get_chips_signal_count(self) -> int:
         # Counts the total number of signals for all chips in the stack.
         signal_count = 0
-        internal_chip_list = self.get_chip_list()
-        for chip in self.face_chips:
-            signal_count += chip.get_signal_count(internal_chip_list)[0]
-        for chip in self.back_chips:
-            signal_count += chip.get_signal_count(internal_chip_list)[0]
+        # The blocks outside this chip's stack are the same for every chip in it, so the mask is built once.
+        is_external = self.get_external_block_mask()
+        for chip in self.get_stacked_chips():
+            signal_count += chip.count_external_signals(is_external)[0]
         # for chip in self.chips:
         #     signal_count += chip.get_signal_count(internal_chip_list)[0]
         return signal_count
@@ -3851,84 +3980,103 @@ class Chip:
         # Probability that all sub-components are good
         chip_yield *= self.quality_yield()
         # Yield of the physical assembly process
-        chip_yield *= self.assembly_process.assembly_yield(len(self.face_chips) + len(self.back_chips), self.get_chips_signal_count(), self.get_tsv_count(), self.get_stacked_die_area())
+        chip_yield *= self.assembly_process.assembly_yield(self.get_chips_len(), self.get_chips_signal_count(), self.get_tsv_count(), self.get_stacked_die_area())
         # Base yield of the wafer process
         chip_yield *= self.wafer_process.wafer_process_yield
         return chip_yield
 
+    @subtree_cached
     def get_layer_aware_cost(self):
         # Calculates the manufacturing cost of the chip's layers.
-        cost = 0
-        for layer in self.stackup:
-            cost += layer.layer_cost(self.area, self.aspect_ratio, self.wafer_process)
-        return cost
+        # Both the yielded and the perfect yield cost of the chip start from it, so it is cached.
+        # The layer parameters are taken from the stackup runs and the loop over the layers runs in stackup_layer_cost.
+        # The checks below are those of Layer.layer_cost, and the wafer and reticle terms are computed once for all layers.
+        stackup_runs = self._stackup_runs
+        area = self.area
+        if stackup_runs.shape[0] == 0 or area == 0:
+            return 0
+        if area < 0:
+            raise CalculationError("Negative area in Layer.layer_cost().")
+        litho_percent = stackup_runs["litho_percent"]
+        if (litho_percent < 0.0).any():
+            raise CalculationError("Negative litho percent in Layer.layer_cost().")
+        wafer_process = self.wafer_process
+        circle_area, used_area = Layer.compute_wafer_areas(area, self.aspect_ratio, wafer_process)
+        reticle_utilization = 1.0
+        if (litho_percent > 0.0).any():
+            reticle_utilization = Layer.reticle_utilization(area, wafer_process.reticle_x, wafer_process.reticle_y)
+        return float(stackup_layer_cost(stackup_runs["cost_per_mm2"], litho_percent, self._stackup_run_lengths, area,
+                                        circle_area, used_area, reticle_utilization))
 
     def get_mask_cost(self):
         # Calculates the NRE cost of the mask set for this chip.
-        cost = 0
-        for layer in self.stackup:
-            cost += layer.mask_cost
+        cost = self._mask_set_cost
         # Account for sharing the mask set with other designs.
         cost *= self.reticle_share
         return cost
 
+    @subtree_cached
+    def compute_self_nre_cost(self) -> float:
+        # The NRE cost of this chip alone: design, mask, and test pattern generation costs, amortized over the production quantity.
+        # Every chip it is stacked on adds it again, so it is cached.
+        return (self.nre_design_cost + self.get_mask_cost() + self.test_process.get_atpg_cost(self))/self.quantity
+
+    @subtree_cached
     def compute_nre_cost(self) -> float:
         # Computes the total Non-Recurring Engineering (NRE) cost per chip.
-        # This includes design, mask, and test pattern generation costs, amortized over the production quantity.
-        nre_cost = (self.nre_design_cost + self.get_mask_cost() + self.test_process.get_atpg_cost(self))/self.quantity
-        # Recursively add the NRE costs from sub-chips.
-        for chip in self.face_chips:
-            nre_cost += chip.compute_nre_cost()
-        for chip in self.back_chips:
-            nre_cost += chip.compute_nre_cost()
-        # for chip in self.chips:
-        #     nre_cost += chip.compute_nre_cost()
+        # The NRE costs of all sub-chips are added in the same walk.
+        nre_cost = 0.0
+        for chip in self.get_subtree():
+            nre_cost += chip.compute_self_nre_cost()
         return nre_cost
 
     def compute_self_cost(self) -> float:
         # The cost of a single, standalone chip, including manufacturing and self-test, adjusted for yield losses at this stage.
         if self.bb_cost is not None:
             return self.bb_cost
+        # If yield is zero, cost is infinite, so skip computing it.
+        if not self.self_test_yield > 0:
+            return float('inf')
         
         # Start with the raw manufacturing cost of the layers.
         cost = self.get_layer_aware_cost()
         # Add the cost of testing this individual chip.
         cost += self.test_process.compute_self_test_cost(self)
         # Adjust for yield: the cost of good chips must cover the cost of bad ones discarded during self-test.
-        if self.self_test_yield > 0:
-            cost /= self.self_test_yield
-        else:
-            return float('inf') # If yield is zero, cost is infinite.
+        cost /= self.self_test_yield
             
         return cost
 
     def compute_cost(self) -> float:
         # The final cost of the fully assembled product.
+        # If yield is zero, cost is infinite, so skip computing it.
+        if not self.chip_test_yield > 0:
+            return float('inf')
         # Start with the cost of the base chip itself.
         cost = self.self_cost
         
         # Add the cost of all the stacked chips.
-        for chip in self.face_chips:
-            cost += chip.cost
-        for chip in self.back_chips:
-            cost += chip.cost
+        if self.get_chips_len() > Chip._ARRAY_SUM_FANOUT:
+            cost = self.add_stacked_values(cost, "cost")
+        else:
+            for chip in self.get_stacked_chips():
+                cost += chip.cost
         # for chip in self.chips:
         #     cost += chip.cost
         
+        assembly_cost, assembly_test_cost = self.compute_assembly_step_costs()
         # Add the cost of the physical assembly process.
-        cost += self.assembly_process.assembly_cost(len(self.face_chips) + len(self.back_chips), self.get_stacked_die_area())
+        cost += assembly_cost
 
         # Add the cost of testing the final assembly.
-        cost += self.test_process.compute_assembly_test_cost(self)
+        cost += assembly_test_cost
         
         # Adjust for yield of the final assembly and test process.
-        if self.chip_test_yield > 0:
-            cost /= self.chip_test_yield
-        else:
-            return float('inf')
+        cost /= self.chip_test_yield
             
         return cost
     
+    @subtree_cached
     def compute_self_perfect_yield_cost(self) -> float:
         # Calculates the cost assuming 100% yield at the self-test stage.
         if self.bb_cost is not None:
@@ -3938,18 +4086,26 @@ class Chip:
         cost += self.test_process.compute_self_test_cost(self)
         return cost
 
+    @subtree_cached
     def compute_perfect_yield_cost(self) -> float:
         # Calculates the final cost assuming 100% yield at all stages.
         cost = self.compute_self_perfect_yield_cost()
-        for chip in self.face_chips:
-            cost += chip.compute_perfect_yield_cost()
-        for chip in self.back_chips:
+        for chip in self.get_stacked_chips():
             cost += chip.compute_perfect_yield_cost()
         # for chip in self.chips:
         #     cost += chip.compute_perfect_yield_cost()
-        cost += self.assembly_process.assembly_cost(len(self.face_chips) + len(self.back_chips), self.get_stacked_die_area())
-        cost += self.test_process.compute_assembly_test_cost(self)
+        assembly_cost, assembly_test_cost = self.compute_assembly_step_costs()
+        cost += assembly_cost
+        cost += assembly_test_cost
         return cost
+
+    @subtree_cached
+    def compute_assembly_step_costs(self):
+        # The cost of assembling the stacked chips onto this chip and of testing the assembly, without yield losses.
+        # compute_cost() and compute_perfect_yield_cost() both add these, so they are computed once.
+        assembly_cost = self.assembly_process.assembly_cost(self.get_chips_len(), self.get_stacked_die_area())
+        assembly_test_cost = self.test_process.compute_assembly_test_cost(self)
+        return assembly_cost, assembly_test_cost
     
     def compute_scrap_cost(self) -> float:
         # The scrap cost is the difference between the actual cost (with yield losses) and the ideal cost (with perfect yield).
@@ -3963,3 +4119,94 @@ class Chip:
         # The final, all-inclusive cost per unit.
         total_cost = self.cost + self.compute_nre_cost()
         return total_cost
+
+    def build_arena(self):
+        # Flattens this chip and everything stacked on it into a ChipArena.
+        return ChipArena(self)
+
+
+# =========================================
+# Chip Arena Class
+# =========================================
+# A ChipArena is a flat snapshot of a built Chip hierarchy for bulk analysis of large assemblies.
+# Chips are numbered breadth-first with face chips before back chips, so the children of every chip
+# occupy one contiguous index range and their values are adjacent in memory.
+# The class has the following attributes:
+#   chips: The Chip objects in index order. Index 0 is the root.
+#   parent_idx: The index of each chip's parent (-1 for the root).
+#   first_child_idx, num_children: The index range holding each chip's children.
+#   depth: The number of levels between each chip and the root.
+#   stack_side: The StackSide code of each chip (the root keeps its own value).
+#   core_area, aspect_ratio, area, power, total_power, self_cost, cost, self_quality, quality:
+#       Arrays of the corresponding Chip values, taken when the arena is built.
+# =========================================
+# The class has the following methods:
+#   __init__(root): Builds the arena from the root Chip of a hierarchy.
+#   children(index): Returns the range of indices of the chips stacked directly on a chip.
+#   stack_power(index): Returns the total power of the chips stacked directly on a chip.
+#   stack_powers(): Returns the stack power of every chip as one segment sum over parent indices.
+#   subtree_sum(values): Returns, for every chip, the sum of a per-chip array over the chip and everything stacked on it.
+#   assembly_core_area(): Returns the assembly core area of every chip.
+# =========================================
+class ChipArena:
+    __slots__ = ('chips', 'parent_idx', 'first_child_idx', 'num_children', 'depth', 'stack_side', 'core_area',
+                 'aspect_ratio', 'area', 'power', 'total_power', 'self_cost', 'cost', 'self_quality', 'quality')
+
+    def __init__(self, root) -> None:
+        chips = [root]
+        parent_idx = [-1]
+        first_child_idx = []
+        num_children = []
+        # The children of chip i are appended as one block when chip i is visited.
+        i = 0
+        while i < len(chips):
+            children = chips[i].get_stacked_chips()
+            first_child_idx.append(len(chips))
+            num_children.append(len(children))
+            chips.extend(children)
+            parent_idx.extend([i] * len(children))
+            i += 1
+
+        self.chips = chips
+        self.parent_idx = np.array(parent_idx, dtype=np.int32)
+        self.first_child_idx = np.array(first_child_idx, dtype=np.int32)
+        self.num_children = np.array(num_children, dtype=np.int32)
+        # Parents always come before their children, so each depth follows from the parent's.
+        depth = np.zeros(len(chips), dtype=np.int32)
+        for i in range(1, len(chips)):
+            depth[i] = depth[parent_idx[i]] + 1
+        self.depth = depth
+        self.stack_side = np.array([chip._stack_side for chip in chips], dtype=np.int8)
+        self.core_area = np.array([chip.core_area for chip in chips], dtype=np.float64)
+        self.aspect_ratio = np.array([chip.aspect_ratio for chip in chips], dtype=np.float64)
+        self.area = np.array([chip.area for chip in chips], dtype=np.float64)
+        self.power = np.array([chip.power for chip in chips], dtype=np.float64)
+        self.total_power = np.array([chip.total_power for chip in chips], dtype=np.float64)
+        self.self_cost = np.array([chip.self_cost for chip in chips], dtype=np.float64)
+        self.cost = np.array([chip.cost for chip in chips], dtype=np.float64)
+        self.self_quality = np.array([chip.self_quality for chip in chips], dtype=np.float64)
+        self.quality = np.array([chip.quality for chip in chips], dtype=np.float64)
+        return
+
+    def children(self, index) -> range:
+        first = int(self.first_child_idx[index])
+        return range(first, first + int(self.num_children[index]))
+
+    def stack_power(self, index) -> float:
+        first = self.first_child_idx[index]
+        return float(self.total_power[first:first + self.num_children[index]].sum())
+
+    def stack_powers(self) -> np.ndarray:
+        # The total power of the chips stacked directly on each chip, for all chips at once.
+        return np.bincount(self.parent_idx[1:], weights=self.total_power[1:], minlength=len(self.chips))
+
+    def subtree_sum(self, values) -> np.ndarray:
+        # Adds each level into the level above it, deepest first, so every chip ends up with the sum over its subtree.
+        totals = np.array(values, dtype=np.float64)
+        for level in range(int(self.depth.max()), 0, -1):
+            members = np.flatnonzero(self.depth == level)
+            np.add.at(totals, self.parent_idx[members], totals[members])
+        return totals
+
+    def assembly_core_area(self) -> np.ndarray:
+        return self.subtree_sum(self.core_area)
@@ -26,7 +26,27 @@
 import design as d
 import readDesignFromFile as readDesign
 import sys
+import os
 import time
+import hashlib
+import tempfile
+
+
+# Key for the on-disk result cache: a hash over the contents of every input file and of the model sources,
+# so any change to the design, the definitions, or the cost model itself misses the cache.
+# The chip file is the last input. If its current compiled <chip_file>.json is loaded in its place, that file is hashed instead.
+def design_cache_key(file_names):
+    key = hashlib.sha256()
+    model_dir = os.path.dirname(os.path.abspath(__file__))
+    sources = [os.path.join(model_dir, "design.py"), os.path.join(model_dir, "readDesignFromFile.py"), os.path.abspath(__file__)]
+    file_names = list(file_names)
+    chip_file = file_names[-1]
+    if not chip_file.endswith(".json") and d.current_compiled_chip_definition(chip_file) is not None:
+        file_names[-1] = chip_file + ".json"
+    for file_name in file_names + sources:
+        with open(file_name, "rb") as f:
+            key.update(hashlib.sha256(f.read()).digest())
+    return key.hexdigest()
 
 
 # Main function
@@ -34,8 +54,8 @@ def main():
     # Get start time
     start_time = time.time()
     # Read the file names as command line arguments.
-    if len(sys.argv) != 8:
-        print("Usage: python load_and_test_design.py <io_file> <layer_file> <wafer_process_file> <assembly_process_file> <test_file> <netlist_file> <chip_file>")
+    if len(sys.argv) not in [8, 9]:
+        print("Usage: python load_and_test_design.py <io_file> <layer_file> <wafer_process_file> <assembly_process_file> <test_file> <netlist_file> <chip_file> [cache_dir]")
         return 1
 
     # Read the File Names as Command Line Arguments
@@ -47,6 +67,17 @@ def main():
     netlist_file = sys.argv[6]
     chip_file = sys.argv[7]
 
+    # If a cache directory is given, reuse the result of an earlier run on identical inputs.
+    cache_file = None
+    if len(sys.argv) == 9:
+        cache_dir = sys.argv[8]
+        os.makedirs(cache_dir, exist_ok=True)
+        cache_file = os.path.join(cache_dir, design_cache_key(sys.argv[1:8]) + ".txt")
+        if os.path.isfile(cache_file):
+            with open(cache_file, "r") as f:
+                print(f.read())
+            return 0
+
     # Read the Design Library Files
     io_list = readDesign.io_definition_list_from_file(io_file)
     layer_list = readDesign.layer_definition_list_from_file(layer_file)
@@ -64,7 +95,14 @@ def main():
     #sip.print_description()
 
     #print("Cost of design = " + str(sip.get_cost()))
-    print(sip.compute_total_cost())
+    total_cost = sip.compute_total_cost()
+    print(total_cost)
+
+    if cache_file is not None:
+        # Write to a temporary file and move it into place, so an interrupted or concurrent run never leaves a partial result.
+        with tempfile.NamedTemporaryFile("w", dir=os.path.dirname(cache_file), suffix=".tmp", delete=False) as f:
+            f.write(str(total_cost))
+        os.replace(f.name, cache_file)
 
 #    for chip in sip.get_chips():
 #        print(chip.name + " " + str(chip.get_cost()))
@@ -33,6 +33,10 @@ import sys
 #       This means that you will also need to add the initial values to the class declaration in the following functions
 #       otherwise there will be a rather confusing error since the static attribute will be set True by default.
 
+# Converts a "True"/"False" attribute of a definition file to a bool, so the definition classes get a bool.
+def parse_flag(text):
+    return text.lower() == "true"
+
 # Function to read the wafer process definitions.
 def wafer_process_definition_list_from_file(filename):
     # print("Reading wafer process definitions from file: " + filename)
@@ -46,7 +50,7 @@ def wafer_process_definition_list_from_file(filename):
     for wp_def in root:
         # Create an Wafer Process object.
         wp = d.WaferProcess(name = "", wafer_diameter = 0.0, edge_exclusion = 0.0, wafer_process_yield = 0.0,
-                            dicing_distance = 0.0, reticle_x = 0.0, reticle_y = 0.0, wafer_fill_grid = "False",
+                            dicing_distance = 0.0, reticle_x = 0.0, reticle_y = 0.0, wafer_fill_grid = False,
                             nre_front_end_cost_per_mm2_memory = 0.0, nre_back_end_cost_per_mm2_memory = 0.0,
                             nre_front_end_cost_per_mm2_logic = 0.0, nre_back_end_cost_per_mm2_logic = 0.0,
                             nre_front_end_cost_per_mm2_analog = 0.0, nre_back_end_cost_per_mm2_analog = 0.0,
@@ -61,7 +65,7 @@ def wafer_process_definition_list_from_file(filename):
         wp.dicing_distance = float(attributes["dicing_distance"])
         wp.reticle_x = float(attributes["reticle_x"])
         wp.reticle_y = float(attributes["reticle_y"])
-        wp.wafer_fill_grid = attributes["wafer_fill_grid"]
+        wp.wafer_fill_grid = parse_flag(attributes["wafer_fill_grid"])
         wp.nre_front_end_cost_per_mm2_memory = float(attributes["nre_front_end_cost_per_mm2_memory"])
         wp.nre_back_end_cost_per_mm2_memory = float(attributes["nre_back_end_cost_per_mm2_memory"])
         wp.nre_front_end_cost_per_mm2_logic = float(attributes["nre_front_end_cost_per_mm2_logic"])
@@ -80,28 +84,16 @@ def io_definition_list_from_file(filename):
     # Read the XML file.
     tree = ET.parse(filename)
     root = tree.getroot()
-    # Create a list of IO objects.
-    io_list = []
-    # Iterate over the IO definitions.
+    # Collect the attributes of the IO definitions.
+    io_definitions = []
     for io_def in root:
-        # Create an IO object.
-        io = d.IO(type = "", rx_area = 0.0, tx_area = 0.0, shoreline = 0.0, bandwidth = 0.0, wire_count = 0,
-                  bidirectional = "False", energy_per_bit = 0.0, reach = 0.0, static = False)
         attributes = io_def.attrib
-        # Iterate over the IO definition attributes.
-        # Set the IO object attributes.
-        io.type = attributes["type"]
-        io.rx_area = float(attributes["rx_area"])
-        io.tx_area = float(attributes["tx_area"])
-        io.shoreline = float(attributes["shoreline"])
-        io.bandwidth = float(attributes["bandwidth"])
-        io.wire_count = int(attributes["wire_count"])
-        io.bidirectional = attributes["bidirectional"]
-        io.energy_per_bit = float(attributes["energy_per_bit"])
-        io.reach = float(attributes["reach"])
-        io.set_static()
-        # Append the IO object to the list.
-        io_list.append(io)
+        io_definitions.append(dict(type = attributes["type"], rx_area = float(attributes["rx_area"]), tx_area = float(attributes["tx_area"]),
+                                   shoreline = float(attributes["shoreline"]), bandwidth = float(attributes["bandwidth"]),
+                                   wire_count = int(attributes["wire_count"]), bidirectional = parse_flag(attributes["bidirectional"]),
+                                   energy_per_bit = float(attributes["energy_per_bit"]), reach = float(attributes["reach"])))
+    # Create the static IO objects, validating all definitions together.
+    io_list = d.IO.validate_batch(io_definitions)
     # Return the list of IO objects.
     return io_list
 
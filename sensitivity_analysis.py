@@ -5,6 +5,9 @@ import xml.etree.ElementTree as ET
 import subprocess
 import tempfile
 import shutil
+import io
+import contextlib
+import concurrent.futures
 
 # Files to analyze
 SIP_FILE = "sip.xml"
@@ -311,84 +314,37 @@ def find_elem_by_path(root, path):
     
     return elem
 
-def analyze_file(file_path, tag, name_key, referenced_names, prefix, args, base_cost, results):
-    tree = ET.parse(file_path)
-    for elem in tree.getroot():
-        if elem.tag != tag:
-            continue
-        name = elem.attrib.get(name_key, "")
-        if name not in referenced_names:
-            continue
-        for param_path, orig_val, attrib_key, path in get_numeric_params(elem, f"{prefix}:{name}"):
-            try:
-                msg_buffer = []
-                # Patch: capture stdout for messages from perturb_and_run
-                import io
-                import contextlib
-                buf = io.StringIO()
-                with contextlib.redirect_stdout(buf):
-                    perturbed_cost, direction, new_val = perturb_and_run(
-                        file_path, path, attrib_key, orig_val, PERCENT_CHANGE, args, param_path
-                    )
-                msg = buf.getvalue()
-                if msg:
-                    msg_buffer.append(msg.strip())
-                if direction == 'integer':
-                    results.append({
-                        "param": param_path,
-                        "base_value": orig_val,
-                        "sensitivity": None,
-                        "direction": 'integer',
-                        "message": f"Parameter is integer-valued and not perturbed",
-                        "extra_msgs": msg_buffer
-                    })
-                    continue
-                if direction == 'error':
-                    results.append({
-                        "param": param_path,
-                        "base_value": orig_val,
-                        "sensitivity": None,
-                        "direction": 'error',
-                        "message": f"Both increase and decrease out of bounds",
-                        "extra_msgs": msg_buffer
-                    })
-                    continue
-                if perturbed_cost is None:
-                    continue
-                rel_sens = (perturbed_cost - base_cost) / (base_cost * PERCENT_CHANGE)
-                if direction == 'decrease':
-                    rel_sens *= -1
-                results.append({
-                    "param": param_path,
-                    "base_value": orig_val,
-                    "sensitivity": rel_sens,
-                    "direction": direction,
-                    "perturbed_value": new_val,
-                    "extra_msgs": msg_buffer
-                })
-            except Exception as e:
-                results.append({
-                    "param": param_path,
-                    "base_value": orig_val,
-                    "sensitivity": None,
-                    "direction": 'error',
-                    "message": f"Exception: {e}",
-                    "extra_msgs": []
-                })
+def run_perturbation(task):
+    """Run one perturbation in a worker process and capture anything it prints."""
+    file_path, path, attrib_key, orig_val, args, param_path = task
+    buf = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(buf):
+            perturbed_cost, direction, new_val = perturb_and_run(
+                file_path, path, attrib_key, orig_val, PERCENT_CHANGE, args, param_path
+            )
+    except Exception as e:
+        return None, 'exception', None, f"Exception: {e}"
+    return perturbed_cost, direction, new_val, buf.getvalue()
 
-def analyze_chips(elem, prefix, args, base_cost, results):
-    name = elem.attrib.get("name", "")
-    for param_path, orig_val, attrib_key, path in get_numeric_params(elem, f"{prefix}:{name}"):
+def run_perturbations(tasks, base_cost, results):
+    """Evaluate all perturbations in parallel and append their results in task order."""
+    # Every perturbation writes its own temporary file and runs its own evaluation, so they are independent.
+    with concurrent.futures.ProcessPoolExecutor() as executor:
+        outcomes = list(executor.map(run_perturbation, tasks))
+    for (file_path, path, attrib_key, orig_val, args, param_path), (perturbed_cost, direction, new_val, msg) in zip(tasks, outcomes):
+        if direction == 'exception':
+            results.append({
+                "param": param_path,
+                "base_value": orig_val,
+                "sensitivity": None,
+                "direction": 'error',
+                "message": msg,
+                "extra_msgs": []
+            })
+            continue
         try:
             msg_buffer = []
-            import io
-            import contextlib
-            buf = io.StringIO()
-            with contextlib.redirect_stdout(buf):
-                perturbed_cost, direction, new_val = perturb_and_run(
-                    SIP_FILE, path, attrib_key, orig_val, PERCENT_CHANGE, args, param_path
-                )
-            msg = buf.getvalue()
             if msg:
                 msg_buffer.append(msg.strip())
             if direction == 'integer':
@@ -433,10 +389,26 @@ def analyze_chips(elem, prefix, args, base_cost, results):
                 "message": f"Exception: {e}",
                 "extra_msgs": []
             })
+
+def analyze_file(file_path, tag, name_key, referenced_names, prefix, args, tasks):
+    tree = ET.parse(file_path)
+    for elem in tree.getroot():
+        if elem.tag != tag:
+            continue
+        name = elem.attrib.get(name_key, "")
+        if name not in referenced_names:
+            continue
+        for param_path, orig_val, attrib_key, path in get_numeric_params(elem, f"{prefix}:{name}"):
+            tasks.append((file_path, path, attrib_key, orig_val, args, param_path))
+
+def analyze_chips(elem, prefix, args, tasks):
+    name = elem.attrib.get("name", "")
+    for param_path, orig_val, attrib_key, path in get_numeric_params(elem, f"{prefix}:{name}"):
+        tasks.append((SIP_FILE, path, attrib_key, orig_val, args, param_path))
     for child in elem.findall("chip"):
-        analyze_chips(child, prefix, args, base_cost, results)
+        analyze_chips(child, prefix, args, tasks)
 
-def analyze_io_file(io_file, referenced_io_types, args, base_cost, results):
+def analyze_io_file(io_file, referenced_io_types, args, tasks):
     tree = ET.parse(io_file)
     for elem in tree.getroot():
         if elem.tag != "io":
@@ -445,60 +417,7 @@ def analyze_io_file(io_file, referenced_io_types, args, base_cost, results):
         if name not in referenced_io_types:
             continue
         for param_path, orig_val, attrib_key, path in get_numeric_params(elem, f"io:{name}"):
-            try:
-                msg_buffer = []
-                import io as _io
-                import contextlib as _contextlib
-                buf = _io.StringIO()
-                with _contextlib.redirect_stdout(buf):
-                    perturbed_cost, direction, new_val = perturb_and_run(
-                        io_file, path, attrib_key, orig_val, PERCENT_CHANGE, args, param_path
-                    )
-                msg = buf.getvalue()
-                if msg:
-                    msg_buffer.append(msg.strip())
-                if direction == 'integer':
-                    results.append({
-                        "param": param_path,
-                        "base_value": orig_val,
-                        "sensitivity": None,
-                        "direction": 'integer',
-                        "message": f"Parameter is integer-valued and not perturbed",
-                        "extra_msgs": msg_buffer
-                    })
-                    continue
-                if direction == 'error':
-                    results.append({
-                        "param": param_path,
-                        "base_value": orig_val,
-                        "sensitivity": None,
-                        "direction": 'error',
-                        "message": f"Both increase and decrease out of bounds",
-                        "extra_msgs": msg_buffer
-                    })
-                    continue
-                if perturbed_cost is None:
-                    continue
-                rel_sens = (perturbed_cost - base_cost) / (base_cost * PERCENT_CHANGE)
-                if direction == 'decrease':
-                    rel_sens *= -1
-                results.append({
-                    "param": param_path,
-                    "base_value": orig_val,
-                    "sensitivity": rel_sens,
-                    "direction": direction,
-                    "perturbed_value": new_val,
-                    "extra_msgs": msg_buffer
-                })
-            except Exception as e:
-                results.append({
-                    "param": param_path,
-                    "base_value": orig_val,
-                    "sensitivity": None,
-                    "direction": 'error',
-                    "message": f"Exception: {e}",
-                    "extra_msgs": []
-                })
+            tasks.append((io_file, path, attrib_key, orig_val, args, param_path))
 
 def sort_key(r):
     s = r.get("sensitivity")
@@ -528,6 +447,7 @@ def main():
     base_cost = get_total_cost(args)
 
     results = []
+    tasks = []
 
     # Update global file constants for use in perturb_and_run
     global SIP_FILE, IO_FILE, LAYER_FILE, WAFER_FILE, ASSEMBLY_FILE, TEST_FILE, NETLIST_FILE
@@ -539,13 +459,13 @@ def main():
     TEST_FILE = test_file
     NETLIST_FILE = netlist_file
 
-    analyze_chips(sip_tree.getroot(), "chip", args, base_cost, results)
+    analyze_chips(sip_tree.getroot(), "chip", args, tasks)
 
     # Analyze referenced processes/layers
-    analyze_file(assembly_file, "assembly", "name", referenced["assembly"], "assembly", args, base_cost, results)
-    analyze_file(wafer_file, "wafer_process", "name", referenced["wafer"], "wafer_process", args, base_cost, results)
-    analyze_file(test_file, "test_process", "name", referenced["test"], "test_process", args, base_cost, results)
-    analyze_file(layer_file, "layer", "name", referenced["layer"], "layer", args, base_cost, results)
+    analyze_file(assembly_file, "assembly", "name", referenced["assembly"], "assembly", args, tasks)
+    analyze_file(wafer_file, "wafer_process", "name", referenced["wafer"], "wafer_process", args, tasks)
+    analyze_file(test_file, "test_process", "name", referenced["test"], "test_process", args, tasks)
+    analyze_file(layer_file, "layer", "name", referenced["layer"], "layer", args, tasks)
 
     # --- Analyze IO definitions for only IO types referenced in netlist.xml ---
     # 1. Parse netlist.xml to get set of referenced IO types
@@ -558,7 +478,10 @@ def main():
             referenced_io_types.add(io_type)
 
     # 2. Analyze only those IOs in io_definitions.xml
-    analyze_io_file(io_file, referenced_io_types, args, base_cost, results)
+    analyze_io_file(io_file, referenced_io_types, args, tasks)
+
+    # Run all the collected perturbations.
+    run_perturbations(tasks, base_cost, results)
 
     # Output results
     print("\n=== Sensitivity Analysis Results ===")
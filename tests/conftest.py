@@ -0,0 +1,34 @@
+import os
+
+import pytest
+
+import design as d
+import readDesignFromFile as readDesign
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def load_design(chip_file, netlist_file, static=False):
+    # Loads a design from the definition files in the repository, the same way load_and_test_design.py does.
+    path = lambda name: os.path.join(REPO_DIR, name)
+    io_list = readDesign.io_definition_list_from_file(path("io_definitions.xml"))
+    layer_list = readDesign.layer_definition_list_from_file(path("layer_definitions.xml"))
+    wafer_process_list = readDesign.wafer_process_definition_list_from_file(path("wafer_process_definitions.xml"))
+    assembly_process_list = readDesign.assembly_process_definition_list_from_file(path("assembly_process_definitions.xml"))
+    test_process_list = readDesign.test_process_definition_list_from_file(path("test_definitions.xml"))
+    adjacency_matrix, utilization, names = readDesign.global_adjacency_matrix_from_file(path(netlist_file), io_list)
+    return d.Chip(filename=path(chip_file), etree=None, parent_chip=None, wafer_process_list=wafer_process_list,
+                  assembly_process_list=assembly_process_list, test_process_list=test_process_list, layers=layer_list,
+                  ios=io_list, adjacency_matrix_definitions=adjacency_matrix, average_bandwidth_utilization=utilization,
+                  block_names=names, static=static)
+
+
+@pytest.fixture
+def sip():
+    return load_design("sip.xml", "netlist.xml")
+
+
+@pytest.fixture(params=[("sip.xml", "netlist.xml"), ("heterogeneous_testcase.xml", "heterogeneous_testcase_netlist.xml")],
+                ids=["sip", "heterogeneous"])
+def design(request):
+    return load_design(*request.param)
@@ -0,0 +1,35 @@
+import pytest
+
+
+def test_arena_matches_chip_hierarchy(design):
+    arena = design.build_arena()
+    assert arena.chips[0] is design
+    assert set(map(id, arena.chips)) == set(map(id, design.get_subtree()))
+    for index, chip in enumerate(arena.chips):
+        assert [arena.chips[child] for child in arena.children(index)] == list(chip.get_stacked_chips())
+        if index > 0:
+            assert arena.chips[arena.parent_idx[index]] is chip.parent_chip
+        assert arena.depth[index] == chip.depth
+        assert arena.area[index] == chip.area
+        assert arena.cost[index] == chip.cost
+        assert arena.quality[index] == chip.quality
+
+
+def test_arena_stack_power_matches_chip(design):
+    arena = design.build_arena()
+    for index, chip in enumerate(arena.chips):
+        assert arena.stack_power(index) == pytest.approx(chip.compute_stack_power())
+
+
+def test_arena_after_moving_a_chip_to_the_back(sip):
+    moved = sip.face_chips[-1]
+    sip.face_chips = sip.face_chips[:-1]
+    sip.back_chips = [moved]
+    arena = sip.build_arena()
+    assert [arena.chips[child] for child in arena.children(0)] == [*sip.face_chips, moved]
+
+
+def test_arena_bulk_sums_match_chip_methods(design):
+    arena = design.build_arena()
+    assert arena.stack_powers() == pytest.approx([chip.compute_stack_power() for chip in arena.chips])
+    assert arena.assembly_core_area() == pytest.approx([chip.get_assembly_core_area() for chip in arena.chips])
@@ -0,0 +1,37 @@
+import pytest
+
+import design as d
+
+
+def test_stacked_chips_cannot_be_changed_in_place(sip):
+    with pytest.raises(AttributeError):
+        sip.face_chips.append(sip.face_chips[0])
+
+
+def test_replacing_stacked_chips_updates_cached_results(sip):
+    removed = sip.face_chips[-1]
+    chip_list = sip.get_chip_list()
+    subtree = sip.get_subtree()
+    stack_power = sip.compute_stack_power()
+    assembly_core_area = sip.get_assembly_core_area()
+    assert removed.name in chip_list
+
+    sip.face_chips = sip.face_chips[:-1]
+
+    assert removed.name not in sip.get_chip_list()
+    assert len(sip.get_chip_list()) < len(chip_list)
+    assert removed not in sip.get_subtree()
+    assert len(sip.get_subtree()) < len(subtree)
+    assert sip.get_stacked_chips() == sip.face_chips + sip.back_chips
+    assert sip.stacked_values(d.StackSide.FACE, "area").shape == (len(sip.face_chips),)
+    assert sip.compute_stack_power() < stack_power
+    assert sip.get_assembly_core_area() < assembly_core_area
+
+
+def test_root_and_depth_follow_a_moved_parent(sip):
+    grandchild = next(chip for chip in sip.get_subtree() if chip.depth == 2)
+    child = grandchild.parent_chip
+    assert grandchild.root is sip
+    child.parent_chip = None
+    assert grandchild.root is child
+    assert grandchild.depth == 1
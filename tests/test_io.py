@@ -0,0 +1,28 @@
+import math
+
+import pytest
+
+import design as d
+
+
+def io_definition(**overrides):
+    definition = dict(type="test_io", rx_area=0.1, tx_area=0.1, shoreline=0.5, bandwidth=10.0, wire_count=4,
+                      bidirectional=False, energy_per_bit=0.2, reach=1.0)
+    definition.update(overrides)
+    return definition
+
+
+def test_validate_batch_builds_static_ios():
+    ios = d.IO.validate_batch([io_definition(), io_definition(type="other_io", bidirectional=True)])
+    assert [io.type for io in ios] == ["test_io", "other_io"]
+    assert all(io.static for io in ios)
+
+
+def test_validate_batch_reports_nan_and_negative_rows_together():
+    definitions = [io_definition(), io_definition(rx_area=math.nan), io_definition(reach=-1.0)]
+    with pytest.raises(d.ConfigurationError) as error:
+        d.IO.validate_batch(definitions)
+    message = str(error.value)
+    assert "IO definition 0" not in message
+    assert "IO definition 1" in message
+    assert "IO definition 2" in message
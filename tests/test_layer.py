@@ -0,0 +1,99 @@
+import math
+
+import numpy as np
+import pytest
+
+import design as d
+
+# (x_dim, y_dim, usable_wafer_diameter, dicing_distance)
+DIES = [(10.0, 10.0, 294.0, 0.1), (7.0, 13.0, 196.0, 0.0), (30.0, 12.0, 294.0, 0.2), (5.6, 30.7, 196.0, 0.5),
+        (28.1, 11.4, 100.0, 0.5), (1.3, 2.9, 294.0, 0.1)]
+
+
+def reference_grid_locations(x_dim, y_dim, usable_wafer_diameter, dicing_distance):
+    # The die placement of the grid layout, one die at a time.
+    x_dim_eff = x_dim + dicing_distance
+    y_dim_eff = y_dim + dicing_distance
+    r = usable_wafer_diameter/2
+    first_column_dist = r - math.sqrt(r**2 - (y_dim_eff/2)**2)
+    crossover_column_height = math.sqrt(r**2 - (r-first_column_dist-x_dim_eff)**2)
+    best_dies_per_wafer = 0
+    best_die_locations = []
+    left_column_height = 1
+    while left_column_height*y_dim_eff/2 < crossover_column_height:
+        die_locations = []
+        row_chord_height = (left_column_height*y_dim_eff/2) - dicing_distance/2
+        chord_length = math.sqrt(r**2 - row_chord_height**2)*2
+        num_dies_in_row = math.floor((chord_length+dicing_distance)/x_dim_eff)
+        dies_per_wafer = num_dies_in_row*left_column_height
+        for j in range(num_dies_in_row):
+            for i in range(left_column_height):
+                die_locations.append((j*x_dim_eff - chord_length/2, y_dim_eff*i - row_chord_height))
+        row_chord_height += y_dim_eff
+        end_of_rows = num_dies_in_row*x_dim_eff - chord_length/2
+        for i in range(left_column_height):
+            y = y_dim_eff*i - row_chord_height + y_dim_eff
+            if (end_of_rows + x_dim_eff)**2 + y**2 <= r**2 and (end_of_rows + x_dim_eff)**2 + (y + y_dim_eff)**2 <= r**2:
+                dies_per_wafer += 1
+                die_locations.append((end_of_rows, y))
+        starting_distance_from_left = (usable_wafer_diameter - chord_length)/2
+        while row_chord_height < usable_wafer_diameter/2:
+            chord_length = math.sqrt(r**2 - row_chord_height**2)*2
+            location_of_first_fit_candidate = (usable_wafer_diameter - chord_length)/2
+            starting_location = math.ceil((location_of_first_fit_candidate - starting_distance_from_left)/x_dim_eff)*x_dim_eff + starting_distance_from_left
+            effective_cord_length = chord_length - (starting_location - location_of_first_fit_candidate)
+            dies_per_wafer += 2*math.floor(effective_cord_length/x_dim_eff)
+            for j in range(math.floor(effective_cord_length/x_dim_eff)):
+                x = starting_location + j*x_dim_eff - usable_wafer_diameter/2
+                y = row_chord_height - y_dim_eff
+                die_locations.append((x, y))
+                die_locations.append((x, -1*y-y_dim_eff))
+            row_chord_height += y_dim_eff
+        if dies_per_wafer > best_dies_per_wafer:
+            best_dies_per_wafer = dies_per_wafer
+            best_die_locations = die_locations
+        left_column_height += 1
+    return best_die_locations
+
+
+def reference_nogrid_locations(x_dim, y_dim, usable_wafer_diameter, dicing_distance):
+    # The die placement of case 1 of the nogrid layout, one die at a time.
+    x_dim_eff = x_dim + dicing_distance
+    y_dim_eff = y_dim + dicing_distance
+    r = usable_wafer_diameter/2
+    row_chord_height = y_dim_eff/2
+    chord_length = math.sqrt(r**2 - (row_chord_height - dicing_distance/2)**2)*2 + dicing_distance
+    die_locations = [(j*x_dim_eff - chord_length/2, -1*y_dim_eff/2) for j in range(math.floor(chord_length/x_dim_eff))]
+    row_chord_height += y_dim_eff
+    while row_chord_height < r:
+        chord_length = math.sqrt(r**2 - (row_chord_height - dicing_distance/2)**2)*2 + dicing_distance
+        for j in range(math.floor(chord_length/x_dim_eff)):
+            y = row_chord_height - y_dim_eff
+            die_locations.append((j*x_dim_eff - chord_length/2, y))
+            die_locations.append((j*x_dim_eff - chord_length/2, -1*y-y_dim_eff))
+        row_chord_height += y_dim_eff
+    return die_locations
+
+
+def assert_same_locations(locations, reference):
+    reference = np.array(reference, dtype=np.float64).reshape(-1, 2)
+    assert locations.shape == reference.shape
+    np.testing.assert_allclose(locations[np.lexsort(locations.T)], reference[np.lexsort(reference.T)], rtol=0, atol=1e-9)
+
+
+@pytest.mark.parametrize("die", DIES)
+def test_grid_locations_match_the_die_by_die_placement(die):
+    count, locations = d.Layer.compute_grid_dies_per_wafer(*die, return_locations=True)
+    assert count == d.Layer.compute_grid_dies_per_wafer(*die)
+    assert_same_locations(locations, reference_grid_locations(*die))
+
+
+@pytest.mark.parametrize("die", DIES)
+def test_nogrid_locations_are_given_for_case_1_only(die):
+    count, locations = d.Layer.compute_nogrid_dies_per_wafer(*die, return_locations=True)
+    assert count == d.Layer.compute_nogrid_dies_per_wafer(*die)
+    reference = reference_nogrid_locations(*die)
+    if count > len(reference):
+        assert locations is None
+    else:
+        assert_same_locations(locations, reference)